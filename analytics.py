@@ -0,0 +1,342 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import date, timedelta
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+
+DEFAULT_ANALYTICS_FILE = 'analytics.json'
+
+# Daily aggregates older than this are dropped
+DEFAULT_RETENTION_DAYS = 365
+# Authors kept per topic and day by the heavy-hitters summaries
+DEFAULT_TOP_AUTHORS = 32
+
+# Count-min sketch of each topic's all-time author counts: with rows hashed
+# independently, an estimate exceeds the true count by at most e/WIDTH of the
+# topic's author mentions with probability 1 - e^-DEPTH
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+# Bumped whenever the sketch hashing changes; stored sketches of another
+# version are discarded
+CMS_VERSION = 2
+
+
+def split_authors(authors: str) -> List[str]:
+    """Author names of a paper's comma-separated author list."""
+    return [a.strip() for a in authors.split(",") if a.strip()]
+
+
+class CountMinSketch:
+    """Approximate item counts in fixed memory; estimates never undercount."""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH, table: Optional[List[List[int]]] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table or [[0] * width for _ in range(depth)]
+
+    def _cells(self, item: str) -> Iterator[Tuple[int, int]]:
+        # A keyed hash per row: items colliding in one row are no more likely
+        # to collide in the others
+        data = item.lower().encode('utf-8')
+        for row in range(self.depth):
+            digest = hashlib.blake2b(data, digest_size=8, salt=row.to_bytes(16, 'little')).digest()
+            yield row, int.from_bytes(digest, 'little') % self.width
+
+    def add(self, item: str, count: int = 1):
+        for row, column in self._cells(item):
+            self.table[row][column] += count
+
+    def estimate(self, item: str) -> int:
+        return min(self.table[row][column] for row, column in self._cells(item))
+
+
+class SpaceSaving:
+    """
+    Top-k heavy hitters of a stream (Space-Saving).
+
+    At most `k` items are counted. A new item replaces the least counted one
+    and inherits its count, which is remembered as the item's maximum
+    overestimation. Summaries of several streams can be merged.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_AUTHORS, counts: Optional[Dict[str, List[int]]] = None):
+        self.k = k
+        # item -> [count, error]
+        self.counts: Dict[str, List[int]] = counts or {}
+
+    def add(self, item: str, count: int = 1):
+        entry = self.counts.get(item)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counts) < self.k:
+            self.counts[item] = [count, 0]
+        else:
+            victim = min(self.counts, key=lambda i: self.counts[i][0])
+            floor = self.counts.pop(victim)[0]
+            self.counts[item] = [floor + count, floor]
+
+    @classmethod
+    def merge(cls, summaries: Iterable["SpaceSaving"], k: int = DEFAULT_TOP_AUTHORS) -> "SpaceSaving":
+        """Combine summaries by adding up counts, keeping the `k` largest."""
+        merged: Dict[str, List[int]] = {}
+        for summary in summaries:
+            for item, (count, error) in summary.counts.items():
+                entry = merged.setdefault(item, [0, 0])
+                entry[0] += count
+                entry[1] += error
+        top = sorted(merged.items(), key=lambda x: -x[1][0])[:k]
+        return cls(k, dict(top))
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        return [(item, entry[0]) for item, entry in sorted(self.counts.items(), key=lambda x: -x[1][0])[:n]]
+
+
+class Analytics:
+    """
+    Per-topic paper volume, category mix and top authors over time.
+
+    Aggregates are updated as papers are ingested: every topic keeps one
+    bucket per update day with its paper count, category counts and a
+    Space-Saving summary of its authors, plus an all-time count-min sketch
+    of author frequencies. A report over a date window only reads that
+    window's buckets, however long the history is. Papers are counted once
+    per topic even when fetched again. The state lives in a JSON file,
+    written by `save()`, or by `save_later()` at most once per
+    `save_interval` seconds so that busy servers do not rewrite it after
+    every search.
+
+    Topics typed into the web form are free text, so `limit_topics()` can
+    restrict tracking to a known set; topics without any day left in the
+    retention window are dropped with their sketches.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_ANALYTICS_FILE,
+                 retention_days: int = DEFAULT_RETENTION_DAYS, top_k: int = DEFAULT_TOP_AUTHORS,
+                 save_interval: float = 0):
+        self.path = path
+        self.retention_days = retention_days
+        self.top_k = top_k
+        self.save_interval = save_interval
+        # topic -> day -> {"papers": n, "categories": {category: n}, "authors": SpaceSaving}
+        self.days: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.sketches: Dict[str, CountMinSketch] = {}
+        # "topic\tpaper id" -> update day of the counted papers, pruned with the days
+        self.seen: Dict[str, str] = {}
+        # Topics tracked by `ingest`, all when None
+        self.tracked: Optional[frozenset] = None
+        self._mtime = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Serializes writers of the state file; `_lock` is only held while the state is copied
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self.refresh()
+
+    def refresh(self):
+        """Reload the state file if another process changed it."""
+        # Unsaved ingests would be lost; they are written over the file instead
+        if self._dirty or not self.path or not os.path.exists(self.path):
+            return
+        mtime = os.path.getmtime(self.path)
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable analytics file {self.path}: {e}")
+            return
+        with self._lock:
+            self.days = {
+                topic: {day: {"papers": bucket["papers"], "categories": bucket["categories"],
+                              "authors": SpaceSaving(self.top_k, bucket["authors"])}
+                        for day, bucket in days.items()}
+                for topic, days in data.get("days", {}).items()
+            }
+            sketches = data.get("sketches", {})
+            if sketches and data.get("sketch_version") != CMS_VERSION:
+                logging.warning(f"Discarding author sketches of {self.path} built with an older hash")
+                sketches = {}
+            self.sketches = {topic: CountMinSketch(table=table) for topic, table in sketches.items()}
+            self.seen = data.get("seen", {})
+            self._mtime = mtime
+
+    def limit_topics(self, topics: Optional[Iterable[str]]):
+        """Only ingest papers of `topics` from now on (None tracks every topic)."""
+        self.tracked = frozenset(topics) if topics is not None else None
+
+    def ingest(self, topic: str, papers: List[Dict[str, Any]]) -> int:
+        """
+        Add a topic's papers to the aggregates.
+
+        Args:
+            topic: The topic the papers were fetched for.
+            papers: Paper dictionaries, e.g. from `get_papers`.
+
+        Returns:
+            The number of papers not counted for the topic before.
+        """
+        if self.tracked is not None and topic not in self.tracked:
+            return 0
+        oldest = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        added = 0
+        with self._lock:
+            days = self.days.setdefault(topic, {})
+            sketch = self.sketches.setdefault(topic, CountMinSketch())
+            for paper in papers:
+                day = paper.get("update_date", "")[:10]
+                key = f"{topic}\t{paper['id']}"
+                if not day or day < oldest or key in self.seen:
+                    continue
+                self.seen[key] = day
+                bucket = days.get(day)
+                if bucket is None:
+                    bucket = days[day] = {"papers": 0, "categories": {}, "authors": SpaceSaving(self.top_k)}
+                bucket["papers"] += 1
+                category = paper.get("category") or "unknown"
+                bucket["categories"][category] = bucket["categories"].get(category, 0) + 1
+                for author in split_authors(paper.get("authors", "")):
+                    bucket["authors"].add(author)
+                    sketch.add(author)
+                added += 1
+            if added:
+                self._dirty = True
+        return added
+
+    def track(self, results: Iterable[Tuple[str, List[Dict[str, Any]]]],
+              save: bool = True) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Ingest (topic, papers) results as they pass through, unchanged.
+
+        Args:
+            results: (topic, papers) pairs, e.g. from `iter_fetch_papers`.
+            save: Write the state file once the results are consumed, see
+                `save_later`.
+        """
+        self.refresh()
+        try:
+            for topic, papers in results:
+                self.ingest(topic, papers)
+                yield topic, papers
+        finally:
+            if save:
+                self.save_later()
+
+    def _prune(self):
+        oldest = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        for topic, days in list(self.days.items()):
+            for day in [day for day in days if day < oldest]:
+                del days[day]
+            if not days:
+                del self.days[topic]
+        for topic in [topic for topic in self.sketches if topic not in self.days]:
+            del self.sketches[topic]
+        self.seen = {key: day for key, day in self.seen.items() if day >= oldest}
+
+    def save_later(self):
+        """Save on a background timer within `save_interval` seconds, or right away without one."""
+        if not self.save_interval:
+            self.save()
+            return
+        with self._lock:
+            if self._save_timer is not None or not self._dirty:
+                return
+            timer = self._save_timer = threading.Timer(self.save_interval, self._timed_save)
+            timer.daemon = True
+        timer.start()
+
+    def _timed_save(self):
+        with self._lock:
+            self._save_timer = None
+        try:
+            self.save()
+        except OSError as e:
+            logging.error(f"Failed to save analytics to {self.path}: {e}")
+
+    def save(self):
+        """Write the aggregates to the state file if they changed."""
+        if not self.path or not self._dirty:
+            return
+        with self._save_lock:
+            # Only the serialization blocks ingests; the file is written after
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._prune()
+                data = {
+                    "days": {
+                        topic: {day: {"papers": bucket["papers"], "categories": bucket["categories"],
+                                      "authors": bucket["authors"].counts}
+                                for day, bucket in days.items()}
+                        for topic, days in self.days.items()
+                    },
+                    "sketches": {topic: sketch.table for topic, sketch in self.sketches.items()},
+                    "sketch_version": CMS_VERSION,
+                    "seen": self.seen,
+                }
+                text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                papers = len(self.seen)
+                self._dirty = False
+            try:
+                tmp = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(tmp, self.path)
+                self._mtime = os.path.getmtime(self.path)
+            except OSError:
+                self._dirty = True
+                raise
+        logging.info(f"Saved analytics of {papers} papers to {self.path}")
+
+    def topics(self) -> List[str]:
+        with self._lock:
+            return sorted(self.days)
+
+    def author_count(self, topic: str, author: str) -> int:
+        """Estimated all-time number of a topic's papers by an author."""
+        with self._lock:
+            sketch = self.sketches.get(topic)
+            return sketch.estimate(author) if sketch else 0
+
+    def report(self, date_from: date, date_to: date, topics: Optional[List[str]] = None,
+               top_n: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize a date window per topic.
+
+        Args:
+            date_from: The first day of the window.
+            date_to: The last day of the window.
+            topics: Topics to report, all by default.
+            top_n: Number of top authors and categories per topic.
+
+        Returns:
+            A dictionary mapping topics to their "total" papers, daily
+            "series" of (day, papers) with empty days included, "categories"
+            and "authors" as (name, papers) lists, biggest first. Author
+            counts come from the heavy-hitters summaries and may be
+            overestimated; "all_time" adds the count-min estimate, never
+            below the window's count.
+        """
+        window = [(date_from + timedelta(days=i)).isoformat() for i in range((date_to - date_from).days + 1)]
+        report = {}
+        with self._lock:
+            for topic in topics if topics is not None else sorted(self.days):
+                days = self.days.get(topic, {})
+                buckets = [days[day] for day in window if day in days]
+                categories: Dict[str, int] = {}
+                for bucket in buckets:
+                    for category, count in bucket["categories"].items():
+                        categories[category] = categories.get(category, 0) + count
+                authors = SpaceSaving.merge((bucket["authors"] for bucket in buckets), k=self.top_k).top(top_n)
+                sketch = self.sketches.get(topic)
+                report[topic] = {
+                    "total": sum(bucket["papers"] for bucket in buckets),
+                    "series": [(day, days[day]["papers"] if day in days else 0) for day in window],
+                    "categories": sorted(categories.items(), key=lambda x: -x[1])[:top_n],
+                    "authors": [{"name": name, "papers": count,
+                                 "all_time": max(sketch.estimate(name), count) if sketch else count}
+                                for name, count in authors],
+                }
+        return report
@@ -1,26 +1,92 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-import yaml
+from flask import Flask, render_template, stream_template, request, jsonify, redirect, url_for
 import json
 import os
-from datetime import datetime, timedelta
-from arxiv_fetcher import fetch_papers, load_config
+import gzip
+import time
+import atexit
+import logging
+import threading
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from arxiv_fetcher import iter_fetch_papers, load_config, read_config_file, invalidate_config_cache, get_default_session, QueryCache, DEFAULT_CACHE_DIR
+from paper_store import PaperStore, DEFAULT_STORE_FILE
+from search_index import SearchIndex
+from jobs import JobManager
+from semantic import SemanticScorer, EmbeddingCache, HashingVectorizer, numpy_available
+from dedup import Deduplicator, DEFAULT_SEEN_FILE
+from summarizer import SummaryCache, DEFAULT_SUMMARY_CACHE
+from pagination import ResultPages, SORT_KEYS
+from metrics import metrics
+from analytics import Analytics, DEFAULT_ANALYTICS_FILE, DEFAULT_RETENTION_DAYS
+from snapshots import SnapshotStore, snapshot_name, SNAPSHOT_FORMATS, DEFAULT_SNAPSHOT_DIR, DEFAULT_SNAPSHOT_DAYS
 
 app = Flask(__name__)
 
 # 默认配置文件路径
 DEFAULT_CONFIG_FILE = 'config.yaml'
 
+# 本地论文库（由 `python script.py --sync` 生成），存在时优先从本地读取
+paper_store = PaperStore(DEFAULT_STORE_FILE) if os.path.exists(DEFAULT_STORE_FILE) else None
+search_index = SearchIndex(paper_store) if paper_store else None
+
+# 查询缓存，与 script.py 共用磁盘目录
+query_cache = QueryCache(path=DEFAULT_CACHE_DIR)
+
+# 论文向量缓存（需要 numpy），用于按语义相关度排序；首次语义排序时才创建，避免启动时导入 numpy
+semantic_available = numpy_available()
+embedding_cache = None
+embedding_cache_lock = threading.Lock()
+
+# 历史运行中已见过的论文（由 `python script.py --dedup` 记录），用于标记新论文
+deduplicator = Deduplicator(DEFAULT_SEEN_FILE) if os.path.exists(DEFAULT_SEEN_FILE) else None
+
+# LLM 摘要缓存（由 `python script.py --summarize` 生成），结果页面只读取已缓存的摘要
+summary_cache = SummaryCache(DEFAULT_SUMMARY_CACHE) if os.path.exists(DEFAULT_SUMMARY_CACHE) else None
+
+# 结果页面按主题分页，后续页与完整摘要由 script.js 按需请求
+result_pages = ResultPages()
+
+# 预先生成的摘要快照（由定时任务 `python script.py --snapshot` 生成），默认配置的快照即 /digest
+snapshot_store = SnapshotStore(DEFAULT_SNAPSHOT_DIR)
+DEFAULT_SNAPSHOT = snapshot_name(DEFAULT_CONFIG_FILE, DEFAULT_SNAPSHOT_DAYS)
+
+# 每次搜索获取的论文按主题增量统计（每日数量、类别分布、高频作者），/analytics 展示图表
+# 统计文件由后台定时器最多每 ANALYTICS_SAVE_SECONDS 秒写入一次，退出时写入剩余的更新
+ANALYTICS_SAVE_SECONDS = 30
+analytics = Analytics(DEFAULT_ANALYTICS_FILE, save_interval=ANALYTICS_SAVE_SECONDS)
+atexit.register(analytics.save)
+ANALYTICS_DEFAULT_DAYS = 30
+
+# 搜索各阶段耗时与论文计数，由 /metrics 导出；设置 ARXIV_METRICS=0 可关闭
+metrics.enable(os.environ.get('ARXIV_METRICS', '1') != '0')
+
+# 后台搜索任务（JSON 客户端使用），相同的进行中搜索会合并为同一个任务
+job_manager = JobManager(lambda **params: analytics.track(iter_fetch_papers(store=paper_store, cache=query_cache, **params)))
+
 # arXiv类别列表
 ARXIV_CATEGORIES = [
     'cs.AI', 'cs.CL', 'cs.CV', 'cs.DL', 'cs.IR', 'cs.LG', 'cs.MA', 'cs.NE',
     'stat.ML', 'cs.HC', 'cs.SI', 'cs.CY', 'cs.RO'
 ]
 
+def limit_tracked_topics():
+    """主题来自表单的自由输入：/metrics 只按已配置的主题区分（其余记为 "other"），统计也只记录已配置的主题，避免序列与 analytics.json 无限增长"""
+    topics = list(load_default_config()['keywords'])
+    metrics.limit_label('topic', topics)
+    analytics.limit_topics(topics)
+
+def get_embedding_cache():
+    """返回论文向量缓存，第一次调用时创建"""
+    global embedding_cache
+    with embedding_cache_lock:
+        if embedding_cache is None and semantic_available:
+            embedding_cache = EmbeddingCache(HashingVectorizer())
+        return embedding_cache
+
 def load_default_config():
-    """加载默认配置"""
+    """加载默认配置（解析结果按文件修改时间缓存，文件改动后自动重新读取）"""
     if os.path.exists(DEFAULT_CONFIG_FILE):
-        with open(DEFAULT_CONFIG_FILE, 'r') as f:
-            return yaml.safe_load(f)
+        return read_config_file(DEFAULT_CONFIG_FILE)
     return {
         "keywords": {
             "Large Language Models": {
@@ -34,6 +100,8 @@ def load_default_config():
         }
     }
 
+limit_tracked_topics()
+
 @app.route('/')
 def index():
     """主页"""
@@ -41,18 +109,141 @@ def index():
     return render_template('index.html', 
                           categories=ARXIV_CATEGORIES,
                           keywords=config['keywords'],
+                          offline_available=search_index is not None,
+                          semantic_available=semantic_available,
+                          dedup_available=deduplicator is not None,
+                          digest_available=snapshot_store.latest(DEFAULT_SNAPSHOT) is not None,
                           today=datetime.now().strftime('%Y-%m-%d'),
                           week_ago=(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'))
 
+@app.route('/digest')
+def digest():
+    """默认配置最近 7 天的摘要快照"""
+    return snapshot(DEFAULT_SNAPSHOT)
+
+@app.route('/snapshots/<name>')
+@app.route('/snapshots/<name>.<fmt>')
+def snapshot(name, fmt='html'):
+    """直接返回磁盘上最新的 gzip 快照，支持 ETag / Last-Modified 条件请求"""
+    artifact = snapshot_store.read(name, fmt) if fmt in SNAPSHOT_FORMATS else None
+    if artifact is None:
+        return jsonify({"status": "error", "message": f"No snapshot {name}, run `python script.py --snapshot` first"}), 404
+    response = app.response_class(mimetype='application/json' if fmt == 'json' else 'text/html')
+    # 客户端支持 gzip 时原样发送压缩文件
+    if 'gzip' in request.accept_encodings:
+        response.set_data(artifact['data'])
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(gzip.decompress(artifact['data']))
+    response.vary.add('Accept-Encoding')
+    response.set_etag(artifact['etag'], weak=True)
+    response.last_modified = datetime.fromtimestamp(artifact['built'], tz=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@lru_cache(maxsize=32)
+def get_scorer(keywords):
+    """返回一组主题关键词（((topic, (filters...)), ...)）的评分器，主题向量只计算一次"""
+    return SemanticScorer(dict(keywords), cache=get_embedding_cache())
+
+def rank_results(keywords, results):
+    """按论文与主题关键词的语义相似度对每个主题的结果排序（每个主题只与自身主题向量相乘，向量缓存在请求结束时写入一次）"""
+    if not semantic_available:
+        raise ValueError("Semantic ranking requires numpy, run `pip install numpy`.")
+    scorer = get_scorer(tuple((topic, tuple(filters)) for topic, filters in keywords.items()))
+    def rank():
+        try:
+            for topic, papers in results:
+                yield topic, scorer.rank(topic, papers, save=False)
+        finally:
+            scorer.cache.flush()
+    return rank()
+
+def mark_results(results, new_only=False):
+    """标记论文为 new / revised / seen；只看新论文时同一论文只保留在第一个主题下"""
+    if deduplicator is None:
+        if new_only:
+            raise ValueError("No seen-papers file found, run `python script.py --dedup` first.")
+        return results
+    deduplicator.refresh()
+    return deduplicator.mark(results, new_only=new_only, collapse_topics=new_only, remember=False)
+
+def attach_summaries(results):
+    """为每个主题的论文附上已缓存的 LLM 摘要"""
+    if summary_cache is None:
+        return results
+    def attach(topic, papers):
+        summaries = summary_cache.get_many([p['id'] for p in papers])
+        return topic, [{**p, 'summary': summaries[p['id']]} if p['id'] in summaries else p for p in papers]
+    return (attach(topic, papers) for topic, papers in results)
+
+class RenderTimer:
+    """记录结果页面的模板渲染耗时，不含等待论文抓取的时间"""
+
+    def __init__(self):
+        self.waiting = 0.0
+        self.total = 0.0
+
+    def results(self, results):
+        """包装结果迭代器，累计模板等待上游结果的时间"""
+        results = iter(results)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(results)
+            except StopIteration:
+                return
+            finally:
+                self.waiting += time.perf_counter() - start
+            yield item
+
+    def stream(self, chunks):
+        """包装流式模板，结束时记录渲染耗时"""
+        chunks = iter(chunks)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    self.total += time.perf_counter() - start
+                yield chunk
+        finally:
+            self.observe()
+
+    def observe(self):
+        metrics.observe("render", max(self.total - self.waiting, 0.0), page="results")
+
+class StreamErrors:
+    """捕获流式渲染期间上游抛出的异常：响应已经开始，只能在结果页面末尾显示错误"""
+
+    def __init__(self):
+        self.message = None
+
+    def guard(self, results):
+        try:
+            yield from results
+        except Exception as e:
+            logging.error(f"Search failed while streaming results: {e}")
+            self.message = str(e)
+
 @app.route('/search', methods=['POST'])
 def search():
     """处理搜索请求"""
+    # JSON 客户端（Accept: application/json 或 ?async=1）得到后台任务 id，而不是结果页面
+    wants_job = (request.args.get('async') == '1' or
+                 request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json')
     try:
         # 获取表单数据
         date_from = request.form.get('date_from')
         date_to = request.form.get('date_to')
         max_results = int(request.form.get('max_results', 50))
         categories = request.form.getlist('categories')
+        offline = request.form.get('offline') == 'on'
+        semantic = request.form.get('semantic') == 'on'
+        new_only = request.form.get('new_only') == 'on'
         
         # 处理关键词
         keywords = {}
@@ -66,31 +257,175 @@ def search():
                     if filters:
                         keywords[topic_name] = filters
         
+        # 提交后台任务
+        if wants_job:
+            job = job_manager.submit({
+                "keywords_dict": keywords,
+                "max_results": max_results,
+                "date_from": date_from,
+                "date_to": date_to,
+                "categories": categories if categories else None
+            })
+            return jsonify({
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": url_for('job_status', job_id=job.id),
+                "results_url": url_for('job_results', job_id=job.id)
+            }), 202
+        
         # 获取论文
-        results = fetch_papers(
+        if offline:
+            # 仅在本地全文索引中检索，不访问 arXiv
+            if search_index is None:
+                raise ValueError("No local paper store found, run `python script.py --sync` first.")
+            results = search_index.search_topics(
+                keywords,
+                max_results=max_results,
+                date_from=datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None,
+                date_to=datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None,
+                categories=categories if categories else None
+            ).items()
+            results = analytics.track(results)
+            results = mark_results(results, new_only)
+            if semantic:
+                results = rank_results(keywords, results)
+            results = attach_summaries(results)
+            result_set = result_pages.create()
+            metrics.inc("searches", mode="offline")
+            timer = RenderTimer()
+            start = time.perf_counter()
+            html = render_template('results.html', 
+                                  results=timer.results(result_set.paginate(results)),
+                                  result_id=result_set.id,
+                                  date_from=date_from,
+                                  date_to=date_to,
+                                  categories=categories,
+                                  max_results=max_results,
+                                  offline=offline,
+                                  semantic=semantic)
+            timer.total = time.perf_counter() - start
+            timer.observe()
+            return html
+        
+        # 流式渲染结果页面：每个主题获取完成后立即发送
+        # （日期等参数在此处即时校验，出错时仍可返回带错误信息的首页）
+        results = iter_fetch_papers(
             keywords_dict=keywords,
             max_results=max_results,
             date_from=date_from,
             date_to=date_to,
-            categories=categories if categories else None
+            categories=categories if categories else None,
+            store=paper_store,
+            cache=query_cache
         )
-        
-        # 渲染结果页面
-        return render_template('results.html', 
-                              results=results,
-                              date_from=date_from,
-                              date_to=date_to,
-                              categories=categories,
-                              max_results=max_results)
+        results = analytics.track(results)
+        results = mark_results(results, new_only)
+        if semantic:
+            results = rank_results(keywords, results)
+        results = attach_summaries(results)
+        result_set = result_pages.create()
+        metrics.inc("searches", mode="live")
+        timer = RenderTimer()
+        errors = StreamErrors()
+        response = app.response_class(timer.stream(stream_template('results.html', 
+                                                      results=timer.results(errors.guard(result_set.paginate(results))),
+                                                      result_id=result_set.id,
+                                                      streaming=True,
+                                                      stream_errors=errors,
+                                                      date_from=date_from,
+                                                      date_to=date_to,
+                                                      categories=categories,
+                                                      max_results=max_results,
+                                                      offline=offline,
+                                                      semantic=semantic)))
+        # 禁止反向代理缓冲，保证分块及时到达浏览器
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
     
     except Exception as e:
+        if wants_job:
+            return jsonify({"status": "error", "message": str(e)}), 400
         return render_template('index.html', 
                               error=str(e),
                               categories=ARXIV_CATEGORIES,
                               keywords=load_default_config()['keywords'],
+                              offline_available=search_index is not None,
+                              semantic_available=semantic_available,
+                              dedup_available=deduplicator is not None,
                               today=datetime.now().strftime('%Y-%m-%d'),
                               week_ago=(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'))
 
+@app.route('/analytics')
+@app.route('/analytics.<fmt>')
+def analytics_view(fmt='html'):
+    """所选时间窗口内各主题的论文数量趋势、类别分布与高频作者（只读取预先聚合的每日统计）"""
+    try:
+        date_to = datetime.strptime(request.args['date_to'], '%Y-%m-%d').date() if request.args.get('date_to') else datetime.now().date()
+        if request.args.get('date_from'):
+            date_from = datetime.strptime(request.args['date_from'], '%Y-%m-%d').date()
+        else:
+            date_from = date_to - timedelta(days=request.args.get('days', ANALYTICS_DEFAULT_DAYS, type=int) - 1)
+    except ValueError:
+        return jsonify({"status": "error", "message": "Dates must be in YYYY-MM-DD format"}), 400
+    # 窗口不超过统计保留的天数
+    date_from = max(date_from, date_to - timedelta(days=DEFAULT_RETENTION_DAYS))
+    if date_from > date_to:
+        return jsonify({"status": "error", "message": "date_from is after date_to"}), 400
+    analytics.refresh()
+    topics = request.args.getlist('topic') or None
+    report = analytics.report(date_from, date_to, topics=topics)
+    if fmt == 'json':
+        return jsonify({"date_from": str(date_from), "date_to": str(date_to), "topics": report})
+    if fmt != 'html':
+        return jsonify({"status": "error", "message": f"Unknown format: {fmt}"}), 404
+    return render_template('analytics.html',
+                          report=report,
+                          all_topics=analytics.topics(),
+                          selected_topics=topics or [],
+                          date_from=str(date_from),
+                          date_to=str(date_to))
+
+@app.route('/results/<result_id>/page')
+def result_page(result_id):
+    """获取某个主题的一页结果（无限滚动），附带渲染好的论文卡片"""
+    result_set = result_pages.get(result_id)
+    if result_set is None:
+        return jsonify({"status": "error", "message": "Results expired, please search again"}), 404
+    sort = request.args.get('sort', 'score')
+    if sort not in SORT_KEYS:
+        return jsonify({"status": "error", "message": f"Unknown sort: {sort}"}), 400
+    page = result_set.page(request.args.get('topic', ''), page=request.args.get('page', 1, type=int), sort=sort)
+    if page is None:
+        return jsonify({"status": "error", "message": "Unknown topic"}), 404
+    with metrics.span("render", page="cards"):
+        page["html"] = render_template('_paper_cards.html', papers=page["papers"])
+    return jsonify(page)
+
+@app.route('/results/<result_id>/abstract')
+def result_abstract(result_id):
+    """展开卡片时加载论文的完整摘要"""
+    result_set = result_pages.get(result_id)
+    paper = result_set.paper(request.args.get('id', '')) if result_set else None
+    if paper is None:
+        return jsonify({"status": "error", "message": "Unknown paper"}), 404
+    return jsonify({"id": paper['id'], "abstract": paper.get('abstract', '')})
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """查询后台任务状态及各主题进度"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    """获取后台任务的部分或最终结果"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job"}), 404
+    return jsonify(job.to_dict(include_results=True))
+
 @app.route('/save_config', methods=['POST'])
 def save_config():
     """保存配置到文件"""
@@ -108,14 +443,42 @@ def save_config():
                         keywords[topic_name] = {"filters": filters}
         
         # 保存到配置文件
+        import yaml
         config = {"keywords": keywords}
         with open(DEFAULT_CONFIG_FILE, 'w') as f:
             yaml.dump(config, f, default_flow_style=False)
+        invalidate_config_cache(DEFAULT_CONFIG_FILE)
+        limit_tracked_topics()
         
         return jsonify({"status": "success", "message": "Configuration saved successfully"})
     
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
+@app.route('/cache_stats')
+def cache_stats():
+    """查询缓存命中统计"""
+    return jsonify({**query_cache.stats(), "http": get_default_session().http_stats.to_dict()})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus 格式的搜索阶段耗时、论文计数与缓存/HTTP 统计"""
+    http_stats = get_default_session().http_stats.to_dict()
+    cache = query_cache.stats()
+    counters = {
+        "http_requests": http_stats["requests"],
+        "http_bytes": http_stats["bytes"],
+        "http_unsized_responses": http_stats["unsized_responses"],
+        "query_cache_hits": cache["hits"],
+        "query_cache_misses": cache["misses"],
+    }
+    return app.response_class(metrics.render(counters, {"query_cache_entries": cache["entries"]}), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
+    # 日志格式与 script.py 一致；作为模块导入时不修改日志配置
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%m/%d/%Y %H:%M:%S',
+    )
     app.run(debug=True)
\ No newline at end of file
@@ -1,20 +1,75 @@
+import os
 import re
+import math
 import json
-import arxiv
+import time
+import queue
+import random
+import hashlib
 import logging
-import yaml
+import threading
 import datetime
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from urllib.parse import urlencode
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from atom_parser import parse_feed
+from batching import pack_batches, estimate_tokens
+from metrics import metrics
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict, Any, Iterator, Tuple
 from datetime import date, timedelta
 
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%m/%d/%Y %H:%M:%S',
-)
+# The arxiv library (with feedparser), requests and yaml are imported on first use:
+# they dominate the import time of the CLI and the web app, and many runs
+# (--help, offline searches, cached pages) never talk to arXiv
+if TYPE_CHECKING:
+    import arxiv
+    import requests
 
 arxiv_url = "http://arxiv.org/"
 
+# Query endpoint; point ARXIV_API_URL at a local stub server to test offline
+DEFAULT_API_URL = os.environ.get('ARXIV_API_URL', 'https://export.arxiv.org/api/query')
+
+# HTTP retries on throttling/unavailable responses back off 2, 4, 8... seconds
+HTTP_RETRIES = 4
+HTTP_BACKOFF_FACTOR = 2.0
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# (connect, read) timeout in seconds of every HTTP request
+HTTP_TIMEOUT = (10, 60)
+
+# Times a page that came back empty is re-requested
+FEED_EMPTY_PAGE_RETRIES = 3
+
+# arXiv's API terms ask for no more than one request every three seconds
+ARXIV_DELAY_SECONDS = 3.0
+DEFAULT_MAX_WORKERS = 4
+
+# Cached query results expire after an hour; the cache holds this many queries
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_DIR = '.arxiv_cache'
+
+# Keep merged keyword queries well below arXiv's URL length limits
+MAX_QUERY_LENGTH = 500
+
+# Results per API page, and how many days before date_from a paper may have
+# been submitted and still be kept because it was updated inside the window
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_DATE_SLACK_DAYS = 0
+
+# "Found paper" lines are DEBUG output logged for this fraction of papers,
+# see `set_paper_log_sample`
+PAPER_LOG_SAMPLE_RATE = float(os.environ.get('ARXIV_PAPER_LOG_SAMPLE', '0'))
+paper_logger = logging.getLogger("arxiv_fetcher.papers")
+if PAPER_LOG_SAMPLE_RATE > 0:
+    paper_logger.setLevel(logging.DEBUG)
+
+# Open bounds used when only one side of a date window is given
+ARXIV_FIRST_DATE = date(1991, 1, 1)
+ARXIV_LAST_DATE = date(9999, 12, 31)
+
 def parse_single_filter(filter_str: str) -> str:
     """Parse a single filter string."""
     if not filter_str:
@@ -30,19 +85,130 @@ def parse_filter_list(filters: list) -> str:
     OR = " OR "
     return OR.join([parse_single_filter(f) for f in filters])
 
+def format_query_date(day: date, end_of_day: bool = False) -> str:
+    """Format a date as an arXiv query timestamp (YYYYMMDDHHMM, GMT)."""
+    return day.strftime('%Y%m%d') + ("2359" if end_of_day else "0000")
+
+def build_query(filter_query: str, date_from: Optional[date] = None, date_to: Optional[date] = None,
+                categories: Optional[List[str]] = None) -> str:
+    """
+    Combine a keyword expression with date and category clauses.
+    
+    The date window becomes a `submittedDate:[... TO ...]` range and the
+    categories become OR-ed `cat:` clauses, so arXiv only returns matching
+    records instead of the newest papers overall.
+    
+    Args:
+        filter_query: Keyword expression as produced by `parse_filter_list`.
+        date_from: The start date (inclusive).
+        date_to: The end date (inclusive).
+        categories: List of arXiv categories.
+        
+    Returns:
+        The arXiv search query string.
+    """
+    clauses = []
+    if filter_query:
+        clauses.append(f"({filter_query})")
+    if date_from or date_to:
+        start = format_query_date(date_from or ARXIV_FIRST_DATE)
+        end = format_query_date(date_to or ARXIV_LAST_DATE, end_of_day=True)
+        clauses.append(f"submittedDate:[{start} TO {end}]")
+    if categories:
+        clauses.append("(" + " OR ".join(f"cat:{c}" for c in categories) + ")")
+    return " AND ".join(clauses)
+
+def compile_filter(filter_str: str) -> re.Pattern:
+    """Compile a filter term into a case-insensitive whole-word pattern."""
+    words = [re.escape(w) for w in re.split(r"[\s\-]+", filter_str.strip()) if w]
+    # Lookarounds rather than \b, which needs a word character at the term's
+    # edges and so never matches terms like "C++", "C#" or ".NET"
+    return re.compile(r"(?<!\w)" + r"[\s\-]+".join(words) + r"(?!\w)", re.IGNORECASE)
+
+def classify_paper(paper: Dict[str, Any], topic_patterns: Dict[str, List[re.Pattern]]) -> List[str]:
+    """Return the topics whose filter terms occur in the paper's title or abstract."""
+    text = f"{paper['title']} {paper['abstract']}"
+    return [topic for topic, patterns in topic_patterns.items()
+            if any(pattern.search(text) for pattern in patterns)]
+
+def chunk_filters(filters: List[str], max_length: int = MAX_QUERY_LENGTH) -> List[List[str]]:
+    """Split filter terms into chunks whose OR query stays within max_length."""
+    chunks = []
+    current = []
+    for f in filters:
+        if current and len(parse_filter_list(current + [f])) > max_length:
+            chunks.append(current)
+            current = []
+        current.append(f)
+    if current:
+        chunks.append(current)
+    return chunks
+
+@lru_cache(maxsize=1024)
+def filter_query(filters: Tuple[str, ...]) -> str:
+    """Memoized `parse_filter_list` of a tuple of filter terms."""
+    return parse_filter_list(list(filters))
+
 def process_keywords(keywords_dict: dict) -> dict:
     """Process keywords dictionary."""
     keywords = {}
     for k, v in keywords_dict.items():
-        keywords[k] = parse_filter_list(v)
+        keywords[k] = filter_query(tuple(v))
     return keywords
 
+# Parsed config files by absolute path: ((mtime_ns, size), config)
+_config_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+_config_cache_lock = threading.Lock()
+
+def read_config_file(config_file: str) -> Any:
+    """
+    Parse a YAML config file, reusing the last parse until the file changes.
+    
+    The file is only re-read when its modification time or size differs
+    from the cached parse, so callers can look a config up per request.
+    
+    Args:
+        config_file: Path to the YAML file.
+        
+    Returns:
+        The parsed YAML. It is shared between callers and must not be
+        modified.
+        
+    Raises:
+        OSError: If the file cannot be read.
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    path = os.path.abspath(config_file)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _config_cache_lock:
+        cached = _config_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    import yaml
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    with _config_cache_lock:
+        _config_cache[path] = (signature, config)
+    return config
+
+def invalidate_config_cache(config_file: str):
+    """
+    Drop the cached parse of a config file, e.g. after rewriting it.
+    
+    A rewrite of the same size within the file system's timestamp
+    granularity keeps the (mtime, size) signature, so writers must call
+    this rather than rely on `read_config_file` noticing the change.
+    """
+    with _config_cache_lock:
+        _config_cache.pop(os.path.abspath(config_file), None)
+
 def load_config(config_file: str = None, config_dict: dict = None) -> dict:
     """Load configuration from a YAML file or dictionary."""
     try:
         if config_file:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = read_config_file(config_file)
         elif config_dict:
             config = config_dict
         else:
@@ -57,9 +223,307 @@ def load_config(config_file: str = None, config_dict: dict = None) -> dict:
         logging.error(f"Failed to load configuration: {e}")
         return {}
 
+def set_paper_log_sample(rate: float):
+    """Log a random `rate` fraction (0 to 1) of fetched papers at DEBUG level; 0 disables it."""
+    global PAPER_LOG_SAMPLE_RATE
+    PAPER_LOG_SAMPLE_RATE = rate
+    paper_logger.setLevel(logging.DEBUG if rate > 0 else logging.NOTSET)
+
+def log_found_paper(update_date, title: str, first_author: str, category: str):
+    if PAPER_LOG_SAMPLE_RATE and random.random() < PAPER_LOG_SAMPLE_RATE:
+        paper_logger.debug(f"Found paper: {update_date} - {title} - {first_author} - {category}")
+
+class RateLimiter:
+    """Thread-safe limiter that spaces out requests by a minimum interval."""
+    def __init__(self, delay_seconds: float = ARXIV_DELAY_SECONDS):
+        self.delay_seconds = delay_seconds
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.delay_seconds
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# Shared by every fetcher in the process so concurrent topics (and concurrent
+# Flask requests) stay within arXiv's politeness delay as a whole.
+default_rate_limiter = RateLimiter()
+
+class HttpStats:
+    """
+    Thread-safe counters of HTTP requests, bytes on the wire and latency.
+    
+    `bytes` is the body size as sent, i.e. compressed, taken from each
+    response's Content-Length. The hook runs before the body is read, so
+    responses without that header (chunked transfers) are counted in
+    `unsized` instead of being read early to measure them.
+    """
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.unsized = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, response: "requests.Response", *args, **kwargs):
+        """Response hook; counts the body size on the wire when it is declared."""
+        size = response.headers.get('Content-Length')
+        with self._lock:
+            self.requests += 1
+            if size and size.isdigit():
+                self.bytes += int(size)
+            else:
+                self.unsized += 1
+            self.seconds += response.elapsed.total_seconds()
+        metrics.observe("request", response.elapsed.total_seconds())
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes": self.bytes,
+                "unsized_responses": self.unsized,
+                "avg_latency": self.seconds / self.requests if self.requests else 0.0,
+            }
+
+def create_session(pool_size: int = 10) -> "requests.Session":
+    """
+    Create a pooled keep-alive HTTP session for the arXiv API.
+    
+    Responses are requested gzip-compressed, and throttling or unavailable
+    responses (e.g. 503) are retried with exponential backoff, honoring
+    Retry-After. Requests made without a timeout, such as the arxiv
+    library's, get `HTTP_TIMEOUT`. Traffic is counted in the session's
+    `http_stats`.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class TimeoutHTTPAdapter(HTTPAdapter):
+        def send(self, request, timeout=None, **kwargs):
+            return super().send(request, timeout=HTTP_TIMEOUT if timeout is None else timeout, **kwargs)
+
+    session = requests.Session()
+    session.http_stats = HttpStats()
+    session.hooks["response"].append(session.http_stats.record)
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = TimeoutHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+def get_default_session() -> "requests.Session":
+    """Return the process-wide session shared by fetchers and Flask requests."""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
+
+# Defined by `rate_limited_client_class()`, since subclassing arxiv.Client
+# imports the arxiv library
+RateLimitedClient = None
+
+def rate_limited_client_class() -> type:
+    """Return `RateLimitedClient`, defining it on first use."""
+    global RateLimitedClient
+    if RateLimitedClient is None:
+        import arxiv
+
+        class RateLimitedClient(arxiv.Client):
+            """
+            arXiv API client that paces every page request through a RateLimiter.
+            
+            Failed requests are retried by the session (see `create_session`)
+            only; the client itself just re-requests pages that came back
+            empty, like the fast feed parser does.
+            """
+            def __init__(self, rate_limiter: RateLimiter, page_size: int = DEFAULT_PAGE_SIZE,
+                         session: Optional["requests.Session"] = None, api_url: str = DEFAULT_API_URL):
+                # Library retries on top of the session's would multiply the attempts per page
+                super().__init__(page_size=page_size, delay_seconds=0, num_retries=0)
+                self.rate_limiter = rate_limiter
+                self.query_url_format = api_url + "?{}"
+                # The library's own session would send requests without a timeout
+                self._session = session if session is not None else get_default_session()
+
+            def _parse_feed(self, url, first_page=True, _try_index=0):
+                for attempt in range(FEED_EMPTY_PAGE_RETRIES + 1):
+                    with metrics.span("rate_limit"):
+                        self.rate_limiter.wait()
+                    try:
+                        # Request and feedparser parsing of one page
+                        with metrics.span("page"):
+                            return super()._parse_feed(url, first_page=first_page, _try_index=attempt)
+                    except arxiv.UnexpectedEmptyPageError:
+                        if attempt == FEED_EMPTY_PAGE_RETRIES:
+                            raise
+                        logging.warning(f"Empty page from arXiv, retrying ({attempt + 1}/{FEED_EMPTY_PAGE_RETRIES})")
+
+    return RateLimitedClient
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups: case, whitespace and OR-term order."""
+    query = " ".join(query.split())
+    if "(" not in query and " AND " not in query:
+        terms = {t.strip().lower() for t in query.split(" OR ") if t.strip()}
+        return " OR ".join(sorted(terms))
+    return query.lower()
+
+class QueryCache:
+    """
+    TTL cache of `get_papers` results with size-bounded LRU eviction.
+    
+    Entries live in memory and, when `path` is given, also as JSON files in
+    that directory so that separate processes (app.py and script.py) share
+    them. Hit and miss counts are kept for `stats`.
+    """
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_SIZE,
+                 path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def make_key(query: str, date_from: Optional[date], date_to: Optional[date],
+                 categories: Optional[List[str]], max_results: int, date_slack_days: int = 0) -> str:
+        """Build the cache key of a search."""
+        key = json.dumps([
+            normalize_query(query),
+            str(date_from) if date_from else None,
+            str(date_to) if date_to else None,
+            sorted(categories) if categories else None,
+            max_results,
+            date_slack_days
+        ])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached papers for a key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        entry = self._read_file(key, now) if self.path else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, entry)
+            return entry[1]
+
+    def set(self, key: str, papers: List[Dict[str, Any]]):
+        """Cache the papers for a key."""
+        entry = (time.time(), papers)
+        with self._lock:
+            self._store(key, entry)
+        if self.path:
+            self._write_file(key, entry)
+
+    def _store(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_file(self, key: str, now: float) -> Optional[tuple]:
+        file = self._file(key)
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if now - data["created"] > self.ttl:
+                os.remove(file)
+                return None
+            # Touch the file so on-disk eviction is least-recently-used as well
+            os.utime(file)
+            return data["created"], data["papers"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_file(self, key: str, entry: tuple):
+        file = self._file(key)
+        try:
+            tmp = f"{file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"created": entry[0], "papers": entry[1]}, f, ensure_ascii=False)
+            os.replace(tmp, file)
+
+            files = [os.path.join(self.path, n) for n in os.listdir(self.path) if n.endswith(".json")]
+            if len(files) > self.max_entries:
+                files.sort(key=lambda n: os.path.getmtime(n))
+                for old in files[:len(files) - self.max_entries]:
+                    os.remove(old)
+        except OSError as e:
+            logging.warning(f"Failed to write cache entry {file}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and the hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
+
 class ArxivPaperFetcher:
-    def __init__(self, arxiv_url: str = arxiv_url):
+    def __init__(self, arxiv_url: str = arxiv_url, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[QueryCache] = None, date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                 session: Optional["requests.Session"] = None, api_url: str = DEFAULT_API_URL,
+                 page_size: int = DEFAULT_PAGE_SIZE, fast_parser: bool = False):
         self.arxiv_url = arxiv_url
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.cache = cache
+        self.date_slack_days = date_slack_days
+        self._session = session
+        self.api_url = api_url
+        self.page_size = page_size
+        self.fast_parser = fast_parser
+        self.pages_skipped = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """The fetcher's HTTP session, the process-wide one unless given."""
+        return self._session or get_default_session()
+
+    def make_client(self) -> "arxiv.Client":
+        """Create an API client on the fetcher's pooled session."""
+        return rate_limited_client_class()(self.rate_limiter, page_size=self.page_size,
+                                 session=self.session, api_url=self.api_url)
 
     @staticmethod
     def get_authors(authors, first_author=False):
@@ -69,14 +533,36 @@ class ArxivPaperFetcher:
         return ", ".join(str(author) for author in authors)
     
     def get_paper_key(self, paper_id: str) -> str:
-        """Remove the version number from the paper ID."""
-        return paper_id.split("v")[0]
+        """Remove the version number from the paper ID (e.g. solv-int/9901001v2)."""
+        return re.sub(r"v\d+$", "", paper_id)
+
+    def get_paper_version(self, paper_id: str) -> int:
+        """Get the version number from the paper ID, defaulting to 1."""
+        match = re.search(r"v(\d+)$", paper_id)
+        return int(match.group(1)) if match else 1
     
     def format_paper_info(self, paper_key: str, update_time: date, paper_title: str, 
                           paper_first_author: str, paper_authors: str, paper_url: str, 
                           comments: Optional[str], category: str,
-                          paper_summary: str) -> Dict[str, Any]:
-        """Format the paper information into a structured dictionary."""
+                          paper_summary: str, version: int = 1) -> Dict[str, Any]:
+        """
+        Format the paper information into a structured dictionary.
+        
+        Args:
+            paper_key: The paper key (arXiv ID without version).
+            update_time: The update time of the paper.
+            paper_title: The title of the paper.
+            paper_first_author: The first author of the paper.
+            paper_authors: All authors of the paper.
+            paper_url: The URL of the paper.
+            comments: Additional comments.
+            category: The primary category of the paper.
+            paper_summary: The abstract of the paper.
+            version: The arXiv version of the paper.
+            
+        Returns:
+            A dictionary containing the paper information.
+        """
         paper_info = {
             "id": paper_key,
             "title": paper_title,
@@ -86,87 +572,505 @@ class ArxivPaperFetcher:
             "authors": paper_authors,
             "category": category,
             "abstract": paper_summary,
-            "comments": comments if comments else ""
+            "comments": comments if comments else "",
+            "version": version
         }
         
         return paper_info
     
     def get_papers(self, topic: str, query: str, max_results: int = 50, 
                   date_from: Optional[date] = None, date_to: Optional[date] = None,
-                  categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Get papers from arXiv that match the criteria."""
-        papers = []
+                  categories: Optional[List[str]] = None,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get papers from arXiv that match the criteria.
+        
+        Collects `iter_papers`; see there for the arguments.
+        
+        Returns:
+            A list of paper information dictionaries. The result is cached
+            only when the fetch did not time out.
+        """
+        with metrics.span("topic", topic=topic):
+            return list(self.iter_papers(
+                topic, query, max_results=max_results, date_from=date_from,
+                date_to=date_to, categories=categories, timeout=timeout
+            ))
+    
+    def iter_papers(self, topic: str, query: str, max_results: int = 50, 
+                    date_from: Optional[date] = None, date_to: Optional[date] = None,
+                    categories: Optional[List[str]] = None,
+                    timeout: Optional[float] = None,
+                    populate_cache: bool = True, start: int = 0,
+                    offsets: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Yield papers from arXiv that match the criteria as each page arrives.
+        
+        The date window and categories are compiled into the search query
+        (see `build_query`), so `max_results` counts matching papers. The
+        local checks below only drop papers revised after `date_to` or
+        cross-listed from a category outside `categories`.
+        
+        Papers submitted up to `date_slack_days` before `date_from` are
+        requested as well and kept if they were updated inside the window.
+        Results arrive newest submission first, so paging stops at the first
+        paper submitted before that; the pages this saves are added to
+        `pages_skipped`.
+        
+        With `fast_parser` the feed is parsed by `atom_parser.parse_feed`
+        straight into compact records instead of arxiv.Result objects.
+        
+        Args:
+            topic: The topic of the papers.
+            query: The keyword query for the papers.
+            max_results: The maximum number of results.
+            date_from: The start date for filtering papers (inclusive).
+            date_to: The end date for filtering papers (inclusive).
+            categories: List of arXiv categories to filter by.
+            timeout: Seconds after which to stop paging and return what has
+                been collected so far. Checked between results.
+            populate_cache: Store the result in the query cache. Without it
+                no paper is kept after being yielded; the cache is still read.
+            start: Index of the first arXiv result to request, e.g. to resume
+                an interrupted fetch. Results fetched from an offset are not
+                cached; a cached full result is served from its beginning.
+            offsets: Yield (offset, paper) pairs instead, where a fetch
+                restarted at `offset` gets the paper again (its own result
+                index, or the start of its feed page with `fast_parser`).
+            
+        Yields:
+            Paper information dictionaries. The result is cached only when
+            the generator runs to completion without timing out.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = QueryCache.make_key(query, date_from, date_to, categories, max_results,
+                                            self.date_slack_days)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logging.info(f"Cache hit for topic '{topic}'")
+                for paper in cached:
+                    yield (0, dict(paper)) if offsets else dict(paper)
+                return
+            if not populate_cache or start:
+                cache_key = None
+
+        import arxiv
+
+        # Papers are only held on to when they are going to be cached
+        papers = [] if cache_key else None
+        count = 0
+        submitted_from = date_from - timedelta(days=self.date_slack_days) if date_from else None
         search_engine = arxiv.Search(
-            query=query,
+            query=build_query(query, submitted_from, date_to, categories),
             max_results=max_results,
             sort_by=arxiv.SortCriterion.SubmittedDate
         )
+        source = self._iter_feed_papers if self.fast_parser else self._iter_result_papers
+        deadline = time.monotonic() + timeout if timeout else None
+        timed_out = False
 
-        for result in search_engine.results():
-            update_time = result.updated.date()
-            
-            # Apply date filter if specified
-            if date_from and update_time < date_from:
-                continue
-            if date_to and update_time > date_to:
-                continue
+        for offset, paper_info in source(topic, search_engine, submitted_from, date_from, date_to, categories, start):
+            count += 1
+            if papers is not None:
+                papers.append(paper_info)
+            yield (offset, paper_info) if offsets else paper_info
+            if deadline and time.monotonic() > deadline:
+                logging.warning(f"Timed out fetching topic '{topic}' after {timeout}s, "
+                                f"returning {count} papers")
+                timed_out = True
+                break
+        
+        # Partial results from a timed-out fetch are not cached
+        if cache_key and not timed_out:
+            self.cache.set(cache_key, [dict(paper) for paper in papers])
+    
+    def _skip_remaining_pages(self, topic: str, max_results: int, consumed: int, published: date):
+        """Account for the pages not requested after stopping at `published`."""
+        skipped = (math.ceil(max_results / self.page_size)
+                   - math.ceil(consumed / self.page_size))
+        with self._stats_lock:
+            self.pages_skipped += skipped
+        logging.info(f"Stopped paging topic '{topic}' at a paper submitted on "
+                     f"{published}, skipping up to {skipped} pages")
+
+    def _iter_result_papers(self, topic: str, search_engine: "arxiv.Search", submitted_from: Optional[date],
+                            date_from: Optional[date], date_to: Optional[date],
+                            categories: Optional[List[str]], start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (result index, paper) pairs of matching papers parsed by the arxiv library."""
+        client = self.make_client()
+        consumed = 0
+        kept = 0
+        authors_seconds = 0.0
+        timed = metrics.enabled
+
+        try:
+            for result in client.results(search_engine, offset=start):
+                consumed += 1
+
+                # Every later result was submitted even earlier, stop paging
+                if submitted_from and result.published.date() < submitted_from:
+                    self._skip_remaining_pages(topic, search_engine.max_results, start + consumed,
+                                               result.published.date())
+                    return
+
+                update_time = result.updated.date()
                 
-            # Apply category filter if specified
-            primary_category = result.primary_category
-            if categories and primary_category not in categories:
-                continue
+                # Apply date filter if specified
+                if date_from and update_time < date_from:
+                    continue
+                if date_to and update_time > date_to:
+                    continue
+                    
+                # Apply category filter if specified
+                primary_category = result.primary_category
+                if categories and primary_category not in categories:
+                    continue
+                    
+                paper_id = result.get_short_id()
+                paper_title = result.title
+                paper_summary = result.summary.replace("\n", " ")
                 
-            paper_id = result.get_short_id()
-            paper_title = result.title
-            paper_summary = result.summary.replace("\n", " ")
-            
-            # Convert author objects to strings
-            paper_first_author = self.get_authors(result.authors, first_author=True)
-            paper_authors = self.get_authors(result.authors)
-            
-            comments = result.comment
+                # Convert author objects to strings
+                if timed:
+                    start = time.perf_counter()
+                paper_first_author = self.get_authors(result.authors, first_author=True)
+                paper_authors = self.get_authors(result.authors)
+                if timed:
+                    authors_seconds += time.perf_counter() - start
+                
+                comments = result.comment
+                
+                log_found_paper(update_time, paper_title, paper_first_author, primary_category)
+
+                paper_key = self.get_paper_key(paper_id)
+                paper_url = f"{self.arxiv_url}abs/{paper_key}"
+
+                try:
+                    paper_info = self.format_paper_info(
+                        paper_key, update_time, paper_title, paper_first_author, 
+                        paper_authors, paper_url, comments, primary_category, paper_summary,
+                        version=self.get_paper_version(paper_id)
+                    )
+                except Exception as e:
+                    logging.error(f"Error processing paper {paper_key}: {e}")
+                    continue
+
+                kept += 1
+                yield start + consumed - 1, paper_info
+        finally:
+            if timed:
+                metrics.observe("authors", authors_seconds, topic=topic)
+            metrics.inc("papers_fetched", consumed, topic=topic)
+            metrics.inc("papers_filtered", consumed - kept, topic=topic)
+            metrics.inc("papers_kept", kept, topic=topic)
+
+    def query_url(self, search_engine: "arxiv.Search", start: int, page_size: int) -> str:
+        """The API URL of one page of results, newest submission first."""
+        return self.api_url + "?" + urlencode({
+            "search_query": search_engine.query,
+            "start": start,
+            "max_results": page_size,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        })
+
+    def _iter_feed_papers(self, topic: str, search_engine: "arxiv.Search", submitted_from: Optional[date],
+                          date_from: Optional[date], date_to: Optional[date],
+                          categories: Optional[List[str]], start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (page offset, paper) pairs of matching papers parsed page by page with `atom_parser`."""
+        max_results = search_engine.max_results
+
+        while start < max_results:
+            url = self.query_url(search_engine, start, min(self.page_size, max_results - start))
+            for attempt in range(FEED_EMPTY_PAGE_RETRIES + 1):
+                with metrics.span("rate_limit"):
+                    self.rate_limiter.wait()
+                response = self.session.get(url, timeout=HTTP_TIMEOUT)
+                response.raise_for_status()
+                with metrics.span("parse"):
+                    page = parse_feed(
+                        response.content,
+                        arxiv_url=self.arxiv_url,
+                        submitted_from=submitted_from.isoformat() if submitted_from else None,
+                        date_from=date_from.isoformat() if date_from else None,
+                        date_to=date_to.isoformat() if date_to else None,
+                        categories=categories
+                    )
+                # arXiv occasionally answers with a spurious empty page
+                if page.entries or start >= page.total_results:
+                    break
+                logging.warning(f"Empty page for topic '{topic}' at {start}, retrying")
+
+            metrics.inc("papers_fetched", page.entries, topic=topic)
+            metrics.inc("papers_filtered", page.entries - len(page.papers), topic=topic)
+            metrics.inc("papers_kept", len(page.papers), topic=topic)
+            for paper in page.papers:
+                log_found_paper(paper.update_date, paper.title, paper.first_author, paper.category)
+                yield start, paper.to_dict()
+
+            start += page.entries
+            if page.stopped:
+                self._skip_remaining_pages(topic, max_results, start, page.last_published)
+                return
+            if not page.entries or start >= page.total_results:
+                return
+
+    def batch_papers(self, papers: List[Dict[str, Any]], batch_size: int = 5,
+                     max_tokens: Optional[int] = None,
+                     count_tokens: Optional[Callable[[str], int]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Split papers into batches for processing by LLM.
+        
+        Args:
+            papers: List of paper information dictionaries.
+            batch_size: The size of each batch.
+            max_tokens: Token budget of a batch. When given, papers are
+                bin-packed into as few batches as fit the budget instead of
+                being split by count, see `batching.pack_batches`.
+            count_tokens: Function counting the tokens of a text. Defaults to
+                a character-based estimate.
             
-            logging.info(f"Found paper: {update_time} - {paper_title} - {paper_first_author} - {primary_category}")
+        Returns:
+            A list of batches, where each batch is a list of paper dictionaries.
+        """
+        if max_tokens:
+            return pack_batches(papers, max_tokens, count_tokens=count_tokens or estimate_tokens)
+        return [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
 
-            paper_key = self.get_paper_key(paper_id)
-            paper_url = f"{self.arxiv_url}abs/{paper_key}"
+def iter_topics(fetcher: ArxivPaperFetcher, queries: Dict[str, str],
+                max_workers: int = DEFAULT_MAX_WORKERS, topic_timeout: Optional[float] = None,
+                failed: Optional[set] = None, **search_kwargs) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Fetch several topic queries concurrently, yielding each as it completes.
+    
+    Every topic runs on a bounded thread pool; page requests from all workers
+    share the fetcher's rate limiter, so the wall-clock time approaches that
+    of the slowest topic instead of the sum over topics.
+    
+    Args:
+        fetcher: The paper fetcher used by every worker.
+        queries: Dictionary mapping topics to arXiv query strings.
+        max_workers: Maximum number of topics fetched at the same time.
+        topic_timeout: Per-topic timeout in seconds, see `get_papers`.
+        failed: Set the topics whose fetch raised are added to.
+        **search_kwargs: Extra arguments passed on to `get_papers`.
+        
+    Yields:
+        (topic, papers) tuples in completion order. Topics that failed yield
+        an empty list.
+    """
+    if not queries:
+        return
 
+    workers = max(1, min(max_workers, len(queries)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arxiv-topic")
+    try:
+        futures = {}
+        for topic, query in queries.items():
+            logging.info(f"Fetching papers for topic: {topic} with query: {query}")
+            future = executor.submit(
+                fetcher.get_papers, topic=topic, query=query,
+                timeout=topic_timeout, **search_kwargs
+            )
+            futures[future] = topic
+
+        for future in as_completed(futures):
+            topic = futures[future]
             try:
-                paper_info = self.format_paper_info(
-                    paper_key, update_time, paper_title, paper_first_author, 
-                    paper_authors, paper_url, comments, primary_category, paper_summary
-                )
-                
-                papers.append(paper_info)
-                
+                yield topic, future.result()
             except Exception as e:
-                logging.error(f"Error processing paper {paper_key}: {e}")
+                logging.error(f"Failed to fetch papers for topic '{topic}': {e}")
+                if failed is not None:
+                    failed.add(topic)
+                yield topic, []
+    finally:
+        # Don't keep a disconnected consumer waiting on queued topics
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_topic_papers(fetcher: ArxivPaperFetcher, queries: Dict[str, str],
+                      max_workers: int = DEFAULT_MAX_WORKERS, topic_timeout: Optional[float] = None,
+                      buffer_size: int = 1000, starts: Optional[Dict[str, int]] = None,
+                      offsets: bool = False, **search_kwargs) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Fetch several topic queries concurrently, yielding every paper as it is parsed.
+    
+    Unlike `iter_topics` nothing is collected per topic: workers hand papers
+    over through a bounded queue, so memory stays flat however many results
+    the topics return. The query cache is read but not filled, since that
+    would hold every topic's papers until the topic ends.
+    
+    Args:
+        fetcher: The paper fetcher used by every worker.
+        queries: Dictionary mapping topics to arXiv query strings.
+        max_workers: Maximum number of topics fetched at the same time.
+        topic_timeout: Per-topic timeout in seconds, see `iter_papers`.
+        buffer_size: Maximum number of papers waiting to be consumed.
+        starts: Dictionary mapping topics to the arXiv result index their
+            fetch starts at, see `iter_papers`.
+        offsets: Yield (topic, paper, offset) tuples with each paper's
+            restart offset, see `iter_papers`.
+        **search_kwargs: Extra arguments passed on to `iter_papers`.
         
-        return papers
+    Yields:
+        (topic, paper) tuples in arrival order.
+    """
+    if not queries:
+        return
+
+    done = object()
+    stop = threading.Event()
+    papers = queue.Queue(maxsize=buffer_size)
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                papers.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(topic: str, query: str):
+        try:
+            for offset, paper in fetcher.iter_papers(topic, query, timeout=topic_timeout,
+                                                     populate_cache=False, start=(starts or {}).get(topic, 0),
+                                                     offsets=True, **search_kwargs):
+                if not put((topic, paper, offset)):
+                    return
+        except Exception as e:
+            logging.error(f"Failed to fetch papers for topic '{topic}': {e}")
+        finally:
+            put((topic, done, None))
+
+    workers = max(1, min(max_workers, len(queries)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arxiv-stream")
+    try:
+        for topic, query in queries.items():
+            logging.info(f"Fetching papers for topic: {topic} with query: {query}")
+            executor.submit(worker, topic, query)
+
+        remaining = len(queries)
+        while remaining:
+            topic, paper, offset = papers.get()
+            if paper is done:
+                remaining -= 1
+                continue
+            yield (topic, paper, offset) if offsets else (topic, paper)
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_topics(fetcher: ArxivPaperFetcher, queries: Dict[str, str],
+                 max_workers: int = DEFAULT_MAX_WORKERS, topic_timeout: Optional[float] = None,
+                 failed: Optional[set] = None, **search_kwargs) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch several topic queries concurrently, see `iter_topics`.
     
-    def batch_papers(self, papers: List[Dict[str, Any]], batch_size: int = 5) -> List[List[Dict[str, Any]]]:
-        """Split papers into batches."""
-        return [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+    Returns:
+        A dictionary mapping topics to lists of paper dictionaries, in the
+        order of `queries`. Topics that failed map to an empty list and are
+        added to `failed` when given.
+    """
+    fetched = dict(iter_topics(fetcher, queries, max_workers=max_workers,
+                               topic_timeout=topic_timeout, failed=failed, **search_kwargs))
+    return {topic: fetched[topic] for topic in queries}
 
-def fetch_papers(keywords_dict: Dict[str, List[str]], max_results: int = 50, 
-                date_from: Optional[str] = None, date_to: Optional[str] = None,
-                categories: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+def fetch_merged(fetcher: ArxivPaperFetcher, keywords_dict: Dict[str, List[str]],
+                 max_results: int = 50, max_workers: int = DEFAULT_MAX_WORKERS,
+                 topic_timeout: Optional[float] = None,
+                 **search_kwargs) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Fetch papers based on keywords dictionary.
+    Fetch the union of all topics' filters once and classify papers locally.
+    
+    The distinct filter terms of every topic are OR-ed into as few queries as
+    the query length limit allows, each paper is kept once by its versionless
+    id, and topics are assigned by matching the filter terms against the title
+    and abstract. Papers that overlap several topics are downloaded only once.
     
     Args:
+        fetcher: The paper fetcher.
         keywords_dict: Dictionary mapping topics to lists of filter terms.
-        max_results: Maximum number of results per topic.
-        date_from: Start date in 'YYYY-MM-DD' format.
-        date_to: End date in 'YYYY-MM-DD' format.
-        categories: List of arXiv categories to filter by.
+        max_results: Maximum number of results per topic. Each merged query
+            asks for this many results per topic.
+        max_workers: Maximum number of merged queries fetched concurrently.
+        topic_timeout: Per-query timeout in seconds.
+        **search_kwargs: Extra arguments passed on to `get_papers`.
         
     Returns:
-        A dictionary mapping topics to lists of paper dictionaries.
+        A dictionary mapping topics to lists of paper dictionaries, in the
+        same shape as `fetch_topics`.
     """
-    # Process keywords
-    processed_keywords = process_keywords(keywords_dict)
+    topic_patterns = {topic: [compile_filter(f) for f in filters if f.strip()]
+                      for topic, filters in keywords_dict.items()}
+
+    # Distinct terms across topics, compared case-insensitively
+    distinct = {}
+    for filters in keywords_dict.values():
+        for f in filters:
+            if f.strip():
+                distinct.setdefault(f.strip().lower(), f.strip())
+    terms = list(distinct.values())
+
+    queries = {f"merged query {i}": parse_filter_list(chunk)
+               for i, chunk in enumerate(chunk_filters(terms), start=1)}
+    fetched = fetch_topics(
+        fetcher,
+        queries,
+        max_workers=max_workers,
+        topic_timeout=topic_timeout,
+        max_results=max_results * len(keywords_dict),
+        **search_kwargs
+    )
+
+    # Deduplicate by versionless id and assign topics locally
+    seen = set()
+    result = {topic: [] for topic in keywords_dict}
+    unmatched = 0
+    for papers in fetched.values():
+        for paper in papers:
+            if paper["id"] in seen:
+                continue
+            seen.add(paper["id"])
+            topics = classify_paper(paper, topic_patterns)
+            if not topics:
+                unmatched += 1
+            for topic in topics:
+                result[topic].append(paper)
+
+    for topic, papers in result.items():
+        papers.sort(key=lambda x: x["update_date"], reverse=True)
+        del papers[max_results:]
+
+    logging.info(f"Merged {len(queries)} queries into {len(seen)} distinct papers "
+                 f"({unmatched} without a local topic match)")
+    return result
+
+def iter_fetch_papers(keywords_dict: Dict[str, List[str]], max_results: int = 50, 
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      categories: Optional[List[str]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                      delay_seconds: Optional[float] = None,
+                      topic_timeout: Optional[float] = None,
+                      merged: bool = False, store=None,
+                      cache: Optional[QueryCache] = None,
+                      date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                      page_size: int = DEFAULT_PAGE_SIZE,
+                      fast_parser: bool = False) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Fetch papers based on keywords dictionary, yielding topics as they complete.
+    
+    Takes the same arguments as `fetch_papers`. Topics served from the store
+    come first, live topics follow in completion order (all at once in
+    merged mode).
+    
+    The dates are parsed right away, so a malformed date raises ValueError
+    from this call rather than from the first `next()` on the result, which
+    a streamed response would only reach after it has started.
     
+    Returns:
+        An iterator of (topic, papers) tuples with papers sorted by date,
+        most recent first.
+    """
     # Parse date strings to date objects if provided
     from_date = None
     to_date = None
@@ -176,28 +1080,128 @@ def fetch_papers(keywords_dict: Dict[str, List[str]], max_results: int = 50,
         to_date = datetime.datetime.strptime(date_to, '%Y-%m-%d').date()
     
     # Initialize paper fetcher
-    fetcher = ArxivPaperFetcher()
+    rate_limiter = RateLimiter(delay_seconds) if delay_seconds is not None else None
+    fetcher = ArxivPaperFetcher(rate_limiter=rate_limiter, cache=cache,
+                                date_slack_days=date_slack_days, page_size=page_size,
+                                fast_parser=fast_parser)
+    return _iter_fetch_papers(fetcher, keywords_dict, from_date, to_date, max_results=max_results,
+                              categories=categories, max_workers=max_workers,
+                              topic_timeout=topic_timeout, merged=merged, store=store)
+
+def _iter_fetch_papers(fetcher: ArxivPaperFetcher, keywords_dict: Dict[str, List[str]],
+                       from_date: Optional[date], to_date: Optional[date], max_results: int,
+                       categories: Optional[List[str]], max_workers: int, topic_timeout: Optional[float],
+                       merged: bool, store) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """The generator behind `iter_fetch_papers`."""
+    # Serve topics from the local store when it covers the date window
+    remaining = dict(keywords_dict)
+    if store is not None:
+        for topic, query in process_keywords(keywords_dict).items():
+            if store.covers(query, from_date, to_date):
+                logging.info(f"Serving topic '{topic}' from the local store")
+                yield topic, store.get_papers(
+                    query, max_results=max_results, date_from=from_date,
+                    date_to=to_date, categories=categories
+                )
+                del remaining[topic]
     
-    # Fetch papers for each topic
-    result = {}
-    for topic, query in processed_keywords.items():
-        logging.info(f"Fetching papers for topic: {topic} with query: {query}")
-        papers = fetcher.get_papers(
-            topic=topic,
-            query=query,
+    # Fetch papers for the remaining topics concurrently
+    if not remaining:
+        return
+    if merged:
+        live = fetch_merged(
+            fetcher,
+            remaining,
+            max_results=max_results,
+            max_workers=max_workers,
+            topic_timeout=topic_timeout,
+            date_from=from_date,
+            date_to=to_date,
+            categories=categories
+        ).items()
+    else:
+        live = iter_topics(
+            fetcher,
+            process_keywords(remaining),
+            max_workers=max_workers,
+            topic_timeout=topic_timeout,
             max_results=max_results,
             date_from=from_date,
             date_to=to_date,
             categories=categories
         )
+    
+    for topic, papers in live:
+        if store is not None:
+            store.add_papers(papers, query=None if merged else parse_filter_list(remaining[topic]))
+        # Sort papers by date (most recent first)
+        with metrics.span("sort"):
+            papers.sort(key=lambda x: x["update_date"], reverse=True)
+        yield topic, papers
+
+def fetch_papers(keywords_dict: Dict[str, List[str]], max_results: int = 50, 
+                date_from: Optional[str] = None, date_to: Optional[str] = None,
+                categories: Optional[List[str]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                delay_seconds: Optional[float] = None,
+                topic_timeout: Optional[float] = None,
+                merged: bool = False, store=None,
+                cache: Optional[QueryCache] = None,
+                date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                page_size: int = DEFAULT_PAGE_SIZE,
+                fast_parser: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch papers based on keywords dictionary.
+    
+    Args:
+        keywords_dict: Dictionary mapping topics to lists of filter terms.
+        max_results: Maximum number of results per topic.
+        date_from: Start date in 'YYYY-MM-DD' format.
+        date_to: End date in 'YYYY-MM-DD' format.
+        categories: List of arXiv categories to filter by.
+        max_workers: Maximum number of topics fetched concurrently.
+        delay_seconds: Minimum delay between arXiv requests. Defaults to the
+            process-wide limiter honoring arXiv's politeness delay.
+        topic_timeout: Per-topic timeout in seconds.
+        merged: Fetch the union of all topics' filters once and classify
+            papers into topics locally, see `fetch_merged`.
+        store: Optional `paper_store.PaperStore`. Topics whose query has been
+            synced over the whole date window are served from it; papers
+            fetched live are added to it.
+        cache: Optional query cache consulted before every arXiv query.
+        date_slack_days: Also keep papers submitted up to this many days
+            before date_from if they were updated inside the window.
+        page_size: Number of results requested per arXiv API page.
+        fast_parser: Parse feeds with the streaming `atom_parser` instead of
+            the arxiv library.
         
+    Returns:
+        A dictionary mapping topics to lists of paper dictionaries.
+    """
+
+    fetched = dict(iter_fetch_papers(
+        keywords_dict,
+        max_results=max_results,
+        date_from=date_from,
+        date_to=date_to,
+        categories=categories,
+        max_workers=max_workers,
+        delay_seconds=delay_seconds,
+        topic_timeout=topic_timeout,
+        merged=merged,
+        store=store,
+        cache=cache,
+        date_slack_days=date_slack_days,
+        page_size=page_size,
+        fast_parser=fast_parser
+    ))
+    
+    result = {}
+    for topic in keywords_dict:
+        papers = fetched.get(topic)
         if papers:
-            # Sort papers by date (most recent first)
-            papers.sort(key=lambda x: x["update_date"], reverse=True)
             result[topic] = papers
-            
             logging.info(f"Found {len(papers)} papers for topic '{topic}'")
         else:
             logging.info(f"No papers found for topic '{topic}'")
     
-    return result
\ No newline at end of file
+    return result
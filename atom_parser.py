@@ -0,0 +1,102 @@
+import io
+import re
+from typing import List, Optional
+
+from paper_record import Paper
+
+try:
+    from lxml import etree
+except ImportError:  # The standard library parser is slower but equivalent
+    import xml.etree.ElementTree as etree
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+ENTRY = ATOM + "entry"
+TOTAL_RESULTS = OPENSEARCH + "totalResults"
+
+ID_PATTERN = re.compile(r"abs/(.+?)(?:v(\d+))?$")
+
+
+class FeedPage:
+    """Papers parsed from one page of an arXiv API Atom feed."""
+
+    def __init__(self):
+        self.papers: List[Paper] = []
+        self.entries = 0
+        self.total_results = 0
+        self.stopped = False
+        self.last_published = None
+
+
+def _text(elem, tag: str) -> str:
+    return elem.findtext(tag) or ""
+
+
+def parse_feed(data: bytes, arxiv_url: str = "http://arxiv.org/",
+               submitted_from: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               categories: Optional[List[str]] = None) -> FeedPage:
+    """
+    Parse an arXiv API Atom feed straight into compact paper records.
+
+    The feed is read incrementally and every entry is released once handled.
+    Dates and the primary category are checked before anything else of an
+    entry is extracted, so filtered entries cost almost nothing. Dates are
+    compared as ISO 'YYYY-MM-DD' strings.
+
+    Args:
+        data: The raw feed.
+        arxiv_url: Base URL of the paper links.
+        submitted_from: Stop at the first entry submitted before this date;
+            the feed is sorted newest submission first.
+        date_from: Skip entries last updated before this date.
+        date_to: Skip entries last updated after this date.
+        categories: Skip entries whose primary category is not listed.
+
+    Returns:
+        The parsed page. `entries` counts every entry read, including
+        filtered ones, and `stopped` is set when `submitted_from` was hit.
+    """
+    page = FeedPage()
+    categories = set(categories) if categories else None
+    for _, elem in etree.iterparse(io.BytesIO(data), events=("end",)):
+        tag = elem.tag
+        if tag == TOTAL_RESULTS:
+            page.total_results = int(elem.text or 0)
+            continue
+        if tag != ENTRY:
+            continue
+
+        page.entries += 1
+        published = _text(elem, ATOM + "published")[:10]
+        if submitted_from and published < submitted_from:
+            page.stopped = True
+            page.last_published = published
+            break
+
+        update_date = _text(elem, ATOM + "updated")[:10]
+        primary = elem.find(ARXIV + "primary_category")
+        category = primary.get("term", "") if primary is not None else ""
+        if ((date_from and update_date < date_from) or (date_to and update_date > date_to)
+                or (categories and category not in categories)):
+            elem.clear()
+            continue
+
+        match = ID_PATTERN.search(_text(elem, ATOM + "id"))
+        if match:
+            paper_id, version = match.group(1), int(match.group(2) or 1)
+            page.papers.append(Paper(
+                id=paper_id,
+                version=version,
+                title=" ".join(_text(elem, ATOM + "title").split()),
+                url=f"{arxiv_url}abs/{paper_id}",
+                update_date=update_date,
+                authors=tuple(name.text or "" for name in elem.iterfind(f"{ATOM}author/{ATOM}name")),
+                category=category,
+                abstract=_text(elem, ATOM + "summary").strip().replace("\n", " "),
+                comments=_text(elem, ARXIV + "comment"),
+            ))
+        elem.clear()
+    return page
@@ -0,0 +1,90 @@
+import logging
+from typing import Callable, List, Optional, Dict, Any
+
+# Rough English average for LLM tokenizers when no tokenizer is installed
+CHARS_PER_TOKEN = 4
+
+# Prompt overhead per paper (field labels, separators, id)
+PAPER_OVERHEAD_TOKENS = 20
+
+TOKENIZERS = ["chars", "tiktoken"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast character-based token estimate."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def get_token_counter(name: str = "chars") -> Callable[[str], int]:
+    """
+    Return a function counting the tokens of a text.
+
+    Args:
+        name: "chars" for the character-based estimate, or "tiktoken" (or
+            "tiktoken:<encoding>") for an exact count, which requires
+            tiktoken and falls back to the estimate without it.
+    """
+    if name.startswith("tiktoken"):
+        encoding_name = name.partition(":")[2] or "cl100k_base"
+        try:
+            import tiktoken
+        except ImportError:
+            logging.warning("tiktoken is not installed, estimating tokens from characters")
+            return estimate_tokens
+        encoding = tiktoken.get_encoding(encoding_name)
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    if name != "chars":
+        raise ValueError(f"Unknown tokenizer: {name}")
+    return estimate_tokens
+
+
+def paper_tokens(paper: Dict[str, Any], count_tokens: Callable[[str], int] = estimate_tokens) -> int:
+    """Tokens a paper takes up in an LLM prompt."""
+    text = f"{paper.get('title', '')}\n{paper.get('abstract', '')}\n{paper.get('comments') or ''}"
+    return count_tokens(text) + PAPER_OVERHEAD_TOKENS
+
+
+def pack_batches(papers: List[Dict[str, Any]], max_tokens: int,
+                 count_tokens: Callable[[str], int] = estimate_tokens,
+                 max_papers: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Bin-pack papers into as few batches as possible under a token budget.
+
+    Uses first-fit decreasing: papers are placed largest first into the
+    first batch with room left. A paper larger than the budget gets a batch
+    of its own.
+
+    Args:
+        papers: List of paper information dictionaries.
+        max_tokens: Token budget of a batch.
+        count_tokens: Function counting the tokens of a text.
+        max_papers: Optional maximum number of papers per batch.
+
+    Returns:
+        A list of batches, where each batch is a list of paper dictionaries.
+    """
+    sized = sorted(((paper_tokens(p, count_tokens), p) for p in papers), key=lambda x: -x[0])
+    batches = []
+    loads = []
+    for tokens, paper in sized:
+        if tokens > max_tokens:
+            logging.warning(f"Paper {paper.get('id')} needs {tokens} tokens, over the batch budget of {max_tokens}")
+        for i, load in enumerate(loads):
+            if load + tokens <= max_tokens and (not max_papers or len(batches[i]) < max_papers):
+                batches[i].append(paper)
+                loads[i] += tokens
+                break
+        else:
+            batches.append([paper])
+            loads.append(tokens)
+    return batches
+
+
+def batch_utilization(batches: List[List[Dict[str, Any]]], max_tokens: int,
+                      count_tokens: Callable[[str], int] = estimate_tokens) -> List[Dict[str, Any]]:
+    """Summarize the papers, tokens and budget utilization of every batch."""
+    summary = []
+    for batch in batches:
+        tokens = sum(paper_tokens(p, count_tokens) for p in batch)
+        summary.append({"papers": len(batch), "tokens": tokens, "utilization": tokens / max_tokens})
+    return summary
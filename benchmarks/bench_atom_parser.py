@@ -0,0 +1,97 @@
+"""
+Compare the arxiv library's feed parsing with the streaming `atom_parser`.
+
+Usage:
+    python benchmarks/bench_atom_parser.py [feed.xml ...] [--repeat N]
+
+Without feed files a synthetic 1000-entry feed is used. Record real feeds
+with e.g. `curl -o feed.xml "https://export.arxiv.org/api/query?search_query=cat:cs.CL&max_results=1000"`.
+"""
+import os
+import sys
+import time
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arxiv
+import feedparser
+
+from arxiv_fetcher import ArxivPaperFetcher
+from atom_parser import parse_feed, etree
+
+
+def synthetic_feed(entries: int = 1000) -> bytes:
+    """Build an arXiv-like Atom feed with `entries` entries."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">',
+        f"<opensearch:totalResults>{entries}</opensearch:totalResults>",
+    ]
+    start = datetime.datetime(2025, 3, 14)
+    for i in range(entries):
+        ts = (start - datetime.timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        authors = "".join(f"<author><name>Author {i}-{j}</name></author>" for j in range(6))
+        parts.append(
+            f"<entry><id>http://arxiv.org/abs/2503.{i:05d}v{1 + i % 3}</id>"
+            f"<updated>{ts}</updated><published>{ts}</published>"
+            f"<title>Paper {i} on large language\n  model agents</title>"
+            f"<summary>{'We study fine-tuning of language models. ' * 25}\n</summary>{authors}"
+            f"<arxiv:comment>12 pages, 4 figures</arxiv:comment>"
+            f'<link href="http://arxiv.org/abs/2503.{i:05d}v1" rel="alternate" type="text/html"/>'
+            f'<arxiv:primary_category term="{["cs.CL", "cs.LG", "cs.CV"][i % 3]}"/>'
+            f'<category term="cs.CL"/></entry>'
+        )
+    parts.append("</feed>")
+    return "".join(parts).encode("utf-8")
+
+
+def library_path(data: bytes, fetcher: ArxivPaperFetcher, categories):
+    """Parse the way `ArxivPaperFetcher` does without `fast_parser`."""
+    papers = []
+    for entry in feedparser.parse(data).entries:
+        result = arxiv.Result._from_feed_entry(entry)
+        if categories and result.primary_category not in categories:
+            continue
+        paper_id = result.get_short_id()
+        paper_key = fetcher.get_paper_key(paper_id)
+        papers.append(fetcher.format_paper_info(
+            paper_key, result.updated.date(), result.title,
+            fetcher.get_authors(result.authors, first_author=True),
+            fetcher.get_authors(result.authors), f"{fetcher.arxiv_url}abs/{paper_key}",
+            result.comment, result.primary_category, result.summary.replace("\n", " "),
+            version=fetcher.get_paper_version(paper_id)
+        ))
+    return papers
+
+
+def fast_path(data: bytes, fetcher: ArxivPaperFetcher, categories):
+    return [paper.to_dict() for paper in parse_feed(data, fetcher.arxiv_url, categories=categories).papers]
+
+
+def bench(name, fn, feeds, repeat, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(len(fn(data, *args)) for data in feeds)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<24} {count:>7} papers  {best * 1000:>9.1f} ms  {count / best:>10.0f} papers/s")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark arXiv feed parsing")
+    parser.add_argument('feeds', nargs='*', help='Recorded Atom feed files')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per parser, the best is reported')
+    args = parser.parse_args()
+
+    feeds = [open(path, 'rb').read() for path in args.feeds] or [synthetic_feed()]
+    fetcher = ArxivPaperFetcher()
+    print(f"{len(feeds)} feeds, {sum(map(len, feeds)) // 1024} KB, parser backend {etree.__name__}")
+    for label, categories in (("all entries", None), ("category filter", ["cs.CL"])):
+        print(f"-- {label}")
+        slow = bench("arxiv library", library_path, feeds, args.repeat, fetcher, categories)
+        fast = bench("atom_parser", fast_path, feeds, args.repeat, fetcher, categories)
+        print(f"speedup {slow / fast:.1f}x")
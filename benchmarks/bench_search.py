@@ -0,0 +1,232 @@
+"""
+End-to-end search benchmarks against the local arXiv stub.
+
+Usage:
+    python benchmarks/bench_search.py [--sizes 100 1000 10000] [--latency S]
+                                      [--paths cli cli-fast flask] [--save-baseline | --check]
+
+For every corpus size the stub serves that many papers (built from the
+recorded feeds in benchmarks/fixtures/) to every topic, and each search path
+fetches all of them:
+
+    cli       script.fetch_papers_by_config with the arxiv library parser
+    cli-fast  the same with the streaming `atom_parser`
+    flask     POST /search through the Flask test client, fully streamed
+
+Reported are the search latency (and time to first byte for flask), papers
+parsed per second, peak traced memory and API calls per topic, plus
+`format_paper_info` and `batch_papers` throughput. `--save-baseline` stores
+the numbers in benchmarks/baseline.json; `--check` compares a run against
+it and exits with status 1 if a throughput dropped by more than
+`--tolerance`. Large corpora (e.g. `--sizes 100000`) take tens of minutes
+with the arxiv library parser.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import datetime
+import tracemalloc
+
+import yaml
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from stub_arxiv import StubArxivServer, load_fixture_entries, build_corpus
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+PATHS = ["cli", "cli-fast", "flask"]
+DEFAULT_SIZES = [100, 1000, 10000]
+
+# Metrics where lower numbers are regressions
+THROUGHPUT_METRICS = ["papers_per_sec", "format_per_sec", "batch_per_sec"]
+
+TOPICS = {
+    "LLM Agents": ["LLM Agent", "Multi-agent"],
+    "Fine-tuning": ["LoRA", "QLoRA", "Instruction Tuning"],
+    "Graph Learning": ["Graph Neural Networks"],
+}
+
+
+def search_window():
+    today = datetime.date.today()
+    return (today - datetime.timedelta(days=7)).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+
+def run_cli(size: int, fast_parser: bool, config_file: str):
+    import script
+    date_from, date_to = search_window()
+    results = script.fetch_papers_by_config(
+        config_file, max_results=size, date_from=date_from, date_to=date_to,
+        max_workers=len(TOPICS), delay_seconds=0, cache=None, fast_parser=fast_parser
+    )
+    return sum(len(batch) for batches in results.values() for batch in batches), None
+
+
+def run_flask(size: int, client):
+    date_from, date_to = search_window()
+    form = {"max_results": str(size), "date_from": date_from, "date_to": date_to}
+    for i, (topic, filters) in enumerate(TOPICS.items()):
+        form[f"topic_{i}"] = topic
+        form[f"filters_{i}"] = ", ".join(filters)
+    start = time.perf_counter()
+    response = client.post('/search', data=form, buffered=False)
+    first_byte = None
+    length = 0
+    for chunk in response.response:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        length += len(chunk)
+    response.close()
+    if response.status_code != 200:
+        raise RuntimeError(f"/search answered {response.status_code}")
+    return length, first_byte
+
+
+def bench_functions(papers, repeat: int = 5):
+    """Best-of-`repeat` throughput of `format_paper_info` and `batch_papers` on a topic's papers."""
+    from arxiv_fetcher import ArxivPaperFetcher
+    fetcher = ArxivPaperFetcher()
+    update_time = datetime.date.today()
+    format_seconds = batch_seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for paper in papers:
+            fetcher.format_paper_info(paper["id"], update_time, paper["title"], paper["first_author"],
+                                      paper["authors"], paper["url"], paper["comments"], paper["category"],
+                                      paper["abstract"], version=paper.get("version", 1))
+        format_seconds = min(format_seconds, time.perf_counter() - start)
+        start = time.perf_counter()
+        fetcher.batch_papers(papers, batch_size=5)
+        batch_seconds = min(batch_seconds, time.perf_counter() - start)
+    return {
+        "format_per_sec": round(len(papers) / max(format_seconds, 1e-9)),
+        "batch_per_sec": round(len(papers) / max(batch_seconds, 1e-9)),
+    }
+
+
+def measure(stub: StubArxivServer, fn, memory: bool):
+    """Run a search, returning its metrics; with `memory` rerun it traced."""
+    stub.reset_stats()
+    start = time.perf_counter()
+    output, first_byte = fn()
+    seconds = time.perf_counter() - start
+    metrics = {
+        "seconds": round(seconds, 3),
+        "output": output,
+        "papers_per_sec": round(stub.entries_served / seconds),
+        "api_calls_per_topic": round(sum(stub.requests.values()) / max(len(stub.requests), 1), 1),
+    }
+    if first_byte is not None:
+        metrics["first_byte_seconds"] = round(first_byte, 3)
+    if memory:
+        tracemalloc.start()
+        fn()
+        metrics["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+    return metrics
+
+
+def compare(results, baseline, tolerance: float) -> list:
+    """List the throughput metrics that dropped by more than `tolerance`."""
+    regressions = []
+    for key, metrics in results.items():
+        for metric in THROUGHPUT_METRICS:
+            old = baseline.get("results", {}).get(key, {}).get(metric)
+            new = metrics.get(metric)
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append(f"{key} {metric}: {new} < {old} (-{1 - new / old:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the search paths against a local arXiv stub")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Corpus sizes (papers per topic)')
+    parser.add_argument('--paths', nargs='+', choices=PATHS, default=PATHS, help='Search paths to benchmark')
+    parser.add_argument('--latency', type=float, default=0.01, help='Stub latency per API request in seconds')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced rerun measuring peak memory')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Store the results in {BASELINE_FILE}')
+    parser.add_argument('--check', action='store_true', help='Fail if throughput regressed against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative throughput drop for --check')
+    parser.add_argument('--output', type=str, help='Also write the results to this JSON file')
+    parser.add_argument('--metrics', action='store_true', help='Run with stage timing and counters enabled (see metrics.py)')
+    args = parser.parse_args()
+
+    stub = StubArxivServer(latency=args.latency).start()
+    os.environ["ARXIV_API_URL"] = stub.url
+    # app.py enables instrumentation by default
+    os.environ["ARXIV_METRICS"] = "1" if args.metrics else "0"
+    # app.py and script.py create their caches and stores in the working
+    # directory, so run in a scratch one
+    os.chdir(tempfile.mkdtemp(prefix="bench_search_"))
+    config_file = os.path.abspath("bench_config.yaml")
+    with open(config_file, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"keywords": {topic: {"filters": filters} for topic, filters in TOPICS.items()}}, f)
+
+    import arxiv_fetcher
+    import app as web
+    arxiv_fetcher.default_rate_limiter.delay_seconds = 0
+    web.query_cache = None
+    client = web.app.test_client()
+    # Per-paper log lines would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    templates = load_fixture_entries()
+    results = {}
+    print(f"{'path':<9} {'papers':>7} {'seconds':>8} {'papers/s':>9} {'calls/topic':>11} {'peak MB':>8}")
+    for size in args.sizes:
+        stub.corpus = build_corpus(templates, size)
+        for path in args.paths:
+            if path == "flask":
+                fn = lambda: run_flask(size, client)
+            else:
+                fn = lambda: run_cli(size, path == "cli-fast", config_file)
+            metrics = measure(stub, fn, memory=not args.no_memory)
+            results[f"{path}/{size}"] = metrics
+            print(f"{path:<9} {size:>7} {metrics['seconds']:>8.2f} {metrics['papers_per_sec']:>9} "
+                  f"{metrics['api_calls_per_topic']:>11} {metrics.get('peak_mb', '-'):>8}"
+                  + (f"  first byte {metrics['first_byte_seconds']:.2f}s" if "first_byte_seconds" in metrics else ""))
+        papers = next(iter(arxiv_fetcher.fetch_papers(
+            {"All": ["LLM"]}, max_results=size, date_from=search_window()[0], delay_seconds=0, fast_parser=True
+        ).values()), [])
+        results[f"functions/{size}"] = bench_functions(papers)
+        print(f"{'functions':<9} {len(papers):>7}  format_paper_info {results[f'functions/{size}']['format_per_sec']}/s, "
+              f"batch_papers {results[f'functions/{size}']['batch_per_sec']}/s")
+    stub.stop()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "topics": len(TOPICS),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {BASELINE_FILE}")
+    if args.check:
+        if not os.path.exists(BASELINE_FILE):
+            parser.error(f"No baseline at {BASELINE_FILE}, run with --save-baseline first")
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment", {}).get("latency") != args.latency:
+            print(f"Warning: baseline was recorded with latency {baseline['environment'].get('latency')}")
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No throughput regressions against the baseline")
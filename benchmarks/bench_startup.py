@@ -0,0 +1,146 @@
+"""
+Cold start and per-request overhead benchmarks.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 7] [--requests 2000] [--save-baseline | --check]
+
+Reported are, best of `--repeat` fresh interpreters:
+
+    import script / app / arxiv_fetcher   cumulative import time (python -X importtime)
+    script.py --help                      wall time of the whole command
+
+and, in process, the average time of a `GET /` through the Flask test client
+and of `app.load_default_config()`. The heavy third-party modules still
+loaded by a plain `import script` and `import app` are listed, since they
+should only be imported once a feature needs them. `--save-baseline` stores
+the numbers in benchmarks/startup_baseline.json; `--check` fails if a time
+grew by more than `--tolerance`.
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "startup_baseline.json")
+
+MODULES = ["script", "app", "arxiv_fetcher"]
+HEAVY_MODULES = ["arxiv", "feedparser", "requests", "yaml", "numpy", "pyarrow", "jinja2"]
+
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$")
+
+
+def run_python(args, cwd: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": REPO_DIR}
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def import_ms(module: str, cwd: str) -> float:
+    """Cumulative import time of a top-level module in a fresh interpreter."""
+    result = run_python(["-X", "importtime", "-c", f"import {module}"], cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def command_ms(args, cwd: str) -> float:
+    start = time.perf_counter()
+    result = run_python(args, cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr}")
+    return (time.perf_counter() - start) * 1000
+
+
+def loaded_heavy_modules(module: str, cwd: str) -> list:
+    result = run_python(["-c", f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"], cwd)
+    return result.stdout.split()
+
+
+def request_overhead(requests: int) -> dict:
+    """Average ms of `GET /` and of `load_default_config()` in this process."""
+    import app as web
+    client = web.app.test_client()
+    client.get('/')
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/')
+    index = (time.perf_counter() - start) * 1000 / requests
+    start = time.perf_counter()
+    for _ in range(requests):
+        web.load_default_config()
+    config = (time.perf_counter() - start) * 1000 / requests
+    return {"index_ms": round(index, 4), "load_config_ms": round(config, 4)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark import time and per-request overhead")
+    parser.add_argument('--repeat', type=int, default=7, help='Fresh interpreters per measurement (best is kept)')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests timed for the per-request overhead')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Store the results in {BASELINE_FILE}')
+    parser.add_argument('--check', action='store_true', help='Fail if a time grew against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative growth for --check')
+    parser.add_argument('--output', type=str, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    # app.py creates its caches in the working directory; give it the repo's config
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    if os.path.exists(os.path.join(REPO_DIR, "config.yaml")):
+        shutil.copy(os.path.join(REPO_DIR, "config.yaml"), workdir)
+    os.chdir(workdir)
+
+    results = {}
+    for module in MODULES:
+        results[f"import {module}"] = round(min(import_ms(module, workdir) for _ in range(args.repeat)), 1)
+    results["script.py --help"] = round(min(command_ms([os.path.join(REPO_DIR, "script.py"), "--help"], workdir)
+                                            for _ in range(args.repeat)), 1)
+    results["python -c pass"] = round(min(command_ms(["-c", "pass"], workdir) for _ in range(args.repeat)), 1)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    overhead = request_overhead(args.requests)
+    results["GET /"] = overhead["index_ms"]
+    results["load_default_config"] = overhead["load_config_ms"]
+
+    for name, ms in results.items():
+        print(f"{name:<22} {ms:>9.3f} ms")
+    for module in ("script", "app"):
+        print(f"heavy modules after import {module}: {' '.join(loaded_heavy_modules(module, workdir)) or '-'}")
+
+    report = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {BASELINE_FILE}")
+    if args.check:
+        if not os.path.exists(BASELINE_FILE):
+            parser.error(f"No baseline at {BASELINE_FILE}, run with --save-baseline first")
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = [f"{name}: {ms} ms > {baseline[name]} ms (+{ms / baseline[name] - 1:.0%})"
+                       for name, ms in results.items()
+                       if baseline.get(name) and name != "python -c pass" and ms > baseline[name] * (1 + args.tolerance)]
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No startup regressions against the baseline")
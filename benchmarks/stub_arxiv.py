@@ -0,0 +1,181 @@
+"""
+Local stub of the arXiv query API that replays recorded Atom entries.
+
+Usage:
+    python benchmarks/stub_arxiv.py [--size N] [--latency S] [--port P] [fixture.xml ...]
+    python benchmarks/stub_arxiv.py --record fixtures/cs_cl.xml --query cat:cs.CL
+
+The entries of the fixture feeds are repeated with fresh ids and submission
+dates spread over the last days until the corpus holds N papers; every query
+is answered with pages of that corpus, newest first. Point the fetcher at it
+with `ARXIV_API_URL=http://127.0.0.1:<port>/api/query`.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import datetime
+import threading
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ENTRY_PATTERN = re.compile(rb"<entry>.*?</entry>", re.DOTALL)
+ID_PATTERN = re.compile(rb"(arxiv\.org/(?:abs|pdf)/)[^<\"]+?(v\d+)")
+DATE_PATTERN = re.compile(rb"<(published|updated)>[^<]*</(?:published|updated)>")
+
+FEED_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+    '  <title type="html">ArXiv Query: stub</title>\n'
+    '  <opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{total}</opensearch:totalResults>\n'
+    '  <opensearch:startIndex xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{start}</opensearch:startIndex>\n'
+    '  <opensearch:itemsPerPage xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{per_page}</opensearch:itemsPerPage>\n'
+)
+
+
+def load_fixture_entries(paths: Optional[List[str]] = None) -> List[bytes]:
+    """Read the <entry> elements of recorded feeds (default: fixtures/*.xml)."""
+    entries = []
+    for path in paths or sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.xml"))):
+        with open(path, "rb") as f:
+            entries.extend(ENTRY_PATTERN.findall(f.read()))
+    if not entries:
+        raise ValueError("No <entry> elements found in the fixture feeds")
+    return entries
+
+
+def build_corpus(templates: List[bytes], size: int, days: int = 6,
+                 newest: Optional[datetime.datetime] = None) -> List[bytes]:
+    """
+    Repeat fixture entries into `size` entries with unique ids, submitted
+    newest first over the `days` days before `newest` (default: now).
+    """
+    newest = newest or datetime.datetime.utcnow().replace(microsecond=0)
+    step = datetime.timedelta(days=days) / max(size, 1)
+    corpus = []
+    for i in range(size):
+        stamp = (newest - step * i).strftime("%Y-%m-%dT%H:%M:%SZ").encode()
+        paper_id = f"{2501 + i // 100000}.{i % 100000:05d}".encode()
+        entry = ID_PATTERN.sub(lambda m: m.group(1) + paper_id + m.group(2), templates[i % len(templates)])
+        entry = DATE_PATTERN.sub(lambda m: b"<%s>%s</%s>" % (m.group(1), stamp, m.group(1)), entry)
+        corpus.append(entry)
+    return corpus
+
+
+class StubArxivServer:
+    """
+    Threaded HTTP server answering arXiv API queries from an in-memory corpus.
+
+    Counts requests per search query and entries served, and waits
+    `latency` seconds before every answer to mimic the network.
+    """
+
+    def __init__(self, corpus: Optional[List[bytes]] = None, latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.corpus = corpus or []
+        self.latency = latency
+        self.requests = Counter()
+        self.entries_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests.clear()
+            self.entries_served = 0
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                start = int(params.get("start", ["0"])[0])
+                per_page = int(params.get("max_results", ["10"])[0])
+                entries = stub.corpus[start:start + per_page]
+                with stub._lock:
+                    stub.requests[params.get("search_query", [""])[0]] += 1
+                    stub.entries_served += len(entries)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                header = FEED_HEADER.format(total=len(stub.corpus), start=start, per_page=per_page)
+                body = header.encode() + b"\n".join(entries) + b"\n</feed>\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubArxivServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record(output_file: str, query: str, max_results: int = 100,
+           api_url: str = "https://export.arxiv.org/api/query"):
+    """Save a live arXiv API response as a fixture feed."""
+    import requests
+    response = requests.get(api_url, params={"search_query": query, "max_results": max_results,
+                                             "sortBy": "submittedDate", "sortOrder": "descending"},
+                            timeout=(10, 60))
+    response.raise_for_status()
+    with open(output_file, "wb") as f:
+        f.write(response.content)
+    print(f"Recorded {len(ENTRY_PATTERN.findall(response.content))} entries to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded arXiv feeds locally")
+    parser.add_argument('fixtures', nargs='*', help='Recorded Atom feed files (default: benchmarks/fixtures/*.xml)')
+    parser.add_argument('--size', type=int, default=1000, help='Number of papers in the corpus')
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds to wait before every answer')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--record', type=str, help='Record a live response to this file instead of serving')
+    parser.add_argument('--query', type=str, default='cat:cs.CL', help='Search query to record')
+    parser.add_argument('--max_results', type=int, default=100, help='Entries to record')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.query, args.max_results)
+        sys.exit(0)
+
+    server = StubArxivServer(build_corpus(load_fixture_entries(args.fixtures), args.size),
+                             latency=args.latency, port=args.port)
+    print(f"Serving {args.size} papers at {server.url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,177 @@
+import os
+import re
+import json
+import zlib
+import random
+import logging
+import threading
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+
+DEFAULT_SEEN_FILE = 'seen_papers.json'
+
+NEW = "new"
+REVISED = "revised"
+SEEN = "seen"
+
+# MinHash signature of NUM_PERM values split into LSH bands of BAND_ROWS rows;
+# titles estimated at least TITLE_SIMILARITY similar are near-duplicates
+NUM_PERM = 32
+BAND_ROWS = 4
+TITLE_SIMILARITY = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERM)]
+
+
+def title_shingles(title: str) -> List[str]:
+    """Word bigrams of a title, ignoring case and punctuation."""
+    words = re.findall(r"[a-z0-9]+", title.lower())
+    return [f"{a} {b}" for a, b in zip(words, words[1:])] or words or [""]
+
+
+def title_signature(title: str) -> List[int]:
+    """MinHash signature of a title's word bigrams."""
+    shingles = {zlib.crc32(s.encode('utf-8')) for s in title_shingles(title)}
+    return [min((a * s + b) % _MERSENNE_PRIME for s in shingles) for a, b in _PERMUTATIONS]
+
+
+def signature_bands(signature: List[int]) -> List[str]:
+    return [f"{i}:" + ",".join(map(str, signature[i:i + BAND_ROWS]))
+            for i in range(0, len(signature), BAND_ROWS)]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class Deduplicator:
+    """
+    Remembers the papers of earlier runs to mark papers new, revised or seen.
+
+    Papers are known by arXiv id (with their latest version) and by a MinHash
+    signature of their title, so a paper re-submitted under another id with
+    a near-identical title is recognized too. The state lives in a JSON file
+    and only changes on `save()`, so a failed run can be repeated.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_SEEN_FILE):
+        self.path = path
+        self.versions: Dict[str, int] = {}
+        self.signatures: Dict[str, List[int]] = {}
+        self._buckets: Dict[str, List[str]] = {}
+        self._pending: List[Dict[str, Any]] = []
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Reload the state file if it changed on disk."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        mtime = os.path.getmtime(self.path)
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable seen-papers file {self.path}: {e}")
+            return
+        with self._lock:
+            self.versions = data.get("versions", {})
+            self.signatures = data.get("signatures", {})
+            self._buckets = {}
+            for paper_id, signature in self.signatures.items():
+                self._index(paper_id, signature)
+            self._mtime = mtime
+
+    def _index(self, paper_id: str, signature: List[int]):
+        for band in signature_bands(signature):
+            self._buckets.setdefault(band, []).append(paper_id)
+
+    def find_duplicate(self, paper_id: str, signature: List[int]) -> Optional[str]:
+        """Return the id of a known paper with a near-identical title."""
+        candidates = {other for band in signature_bands(signature) for other in self._buckets.get(band, ())}
+        candidates.discard(paper_id)
+        for other in candidates:
+            if similarity(signature, self.signatures[other]) >= TITLE_SIMILARITY:
+                return other
+        return None
+
+    def status(self, paper: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Classify a paper against the remembered papers.
+
+        Returns:
+            (status, duplicate_of) where status is "new", "revised" or
+            "seen", and duplicate_of is the id of the known paper whose
+            title it nearly duplicates, if any.
+        """
+        with self._lock:
+            known = self.versions.get(paper["id"])
+            if known is not None:
+                return (REVISED if paper.get("version", 1) > known else SEEN), None
+            duplicate = self.find_duplicate(paper["id"], title_signature(paper["title"]))
+            return (SEEN, duplicate) if duplicate else (NEW, None)
+
+    def add(self, paper: Dict[str, Any]):
+        """Remember a paper; it is written to the state file on `save()`."""
+        with self._lock:
+            paper_id = paper["id"]
+            self.versions[paper_id] = max(self.versions.get(paper_id, 0), paper.get("version", 1))
+            if paper_id not in self.signatures:
+                signature = title_signature(paper["title"])
+                self.signatures[paper_id] = signature
+                self._index(paper_id, signature)
+
+    def mark(self, results: Iterable[Tuple[str, List[Dict[str, Any]]]], new_only: bool = False,
+             collapse_topics: bool = True, remember: bool = True) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Add a "status" to every paper of a run's (topic, papers) results.
+
+        Args:
+            results: (topic, papers) pairs, e.g. from `iter_fetch_papers`.
+            new_only: Keep only papers never seen before.
+            collapse_topics: Keep a paper (or a near-duplicate of it) only
+                under the first topic that returned it in this run.
+            remember: Remember the run's papers for `save()`.
+
+        Yields:
+            (topic, papers) tuples with marked papers, possibly empty.
+        """
+        run = Deduplicator(path=None)
+        for topic, papers in results:
+            marked = []
+            for paper in papers:
+                if collapse_topics and run.status(paper)[0] != NEW:
+                    continue
+                run.add(paper)
+                status, duplicate = self.status(paper)
+                if new_only and status != NEW:
+                    continue
+                paper = {**paper, "status": status}
+                if duplicate:
+                    paper["duplicate_of"] = duplicate
+                marked.append(paper)
+            if remember:
+                self._pending.extend(papers)
+            yield topic, marked
+
+    def save(self):
+        """Remember the papers marked so far and write the state file."""
+        for paper in self._pending:
+            self.add(paper)
+        self._pending.clear()
+        if not self.path:
+            return
+        with self._lock:
+            data = {"versions": self.versions, "signatures": self.signatures}
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        logging.info(f"Remembered {len(self.versions)} papers in {self.path}")
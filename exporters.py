@@ -0,0 +1,289 @@
+import os
+import json
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from paper_record import PaperCollection
+
+EXPORT_FORMATS = ["json", "jsonl", "parquet", "arrow"]
+
+# The streaming writer fsyncs after this many papers
+DEFAULT_CHECKPOINT_EVERY = 100
+# Appended to a streaming output's name for its checkpoint file
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+
+def record_to_row(paper, topics) -> Dict[str, Any]:
+    """Flatten a paper record and its topic names into one output row."""
+    return {
+        "id": paper.id,
+        "version": paper.version,
+        "title": paper.title,
+        "url": paper.url,
+        "update_date": paper.update_date,
+        "authors": list(paper.authors),
+        "category": paper.category,
+        "abstract": paper.abstract,
+        "comments": paper.comments,
+        "topics": topics,
+    }
+
+
+def write_jsonl(collection: PaperCollection, output_file: str):
+    """
+    Write one compact JSON line per distinct paper.
+
+    Each line carries the names of the topics the paper belongs to, so a paper
+    matched by several topics is written once.
+    """
+    membership = collection.topics_of()
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for paper in collection:
+            row = record_to_row(paper, membership.get(paper.id, []))
+            f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+            f.write("\n")
+
+
+def to_arrow_table(collection: PaperCollection):
+    """Build a columnar Arrow table with dictionary-encoded categories."""
+    # pyarrow (optional) is only imported when a columnar format is written
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Parquet/Arrow output requires pyarrow, run `pip install pyarrow`")
+    membership = collection.topics_of()
+    papers = list(collection)
+    return pa.table({
+        "id": pa.array([p.id for p in papers], pa.string()),
+        "version": pa.array([p.version for p in papers], pa.int16()),
+        "title": pa.array([p.title for p in papers], pa.string()),
+        "url": pa.array([p.url for p in papers], pa.string()),
+        "update_date": pa.array([p.update_date for p in papers], pa.string()).dictionary_encode(),
+        "authors": pa.array([list(p.authors) for p in papers], pa.list_(pa.string())),
+        "category": pa.array([p.category for p in papers], pa.string()).dictionary_encode(),
+        "abstract": pa.array([p.abstract for p in papers], pa.string()),
+        "comments": pa.array([p.comments for p in papers], pa.string()),
+        "topics": pa.array([membership.get(p.id, []) for p in papers], pa.list_(pa.string())),
+    })
+
+
+def write_parquet(collection: PaperCollection, output_file: str):
+    """Write the collection as a compressed Parquet file."""
+    table = to_arrow_table(collection)
+    import pyarrow.parquet as pq
+    pq.write_table(table, output_file, compression="zstd")
+
+
+def write_arrow(collection: PaperCollection, output_file: str):
+    """Write the collection as an Arrow IPC (Feather v2) file."""
+    table = to_arrow_table(collection)
+    import pyarrow.feather as feather
+    feather.write_feather(table, output_file, compression="zstd")
+
+
+def export_collection(collection: PaperCollection, output_file: str, output_format: str):
+    """
+    Write a paper collection in one of the columnar or compact formats.
+
+    Args:
+        collection: The papers and their topic membership.
+        output_file: The output file path.
+        output_format: One of "jsonl", "parquet" or "arrow".
+    """
+    writers = {"jsonl": write_jsonl, "parquet": write_parquet, "arrow": write_arrow}
+    if output_format not in writers:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    writers[output_format](collection, output_file)
+    logging.info(f"Wrote {len(collection)} distinct papers to {output_file} ({output_format})")
+
+
+class StreamProgress:
+    """
+    How far an interrupted streaming output got, per topic.
+
+    Only a count, the last paper id and the arXiv result offset to restart
+    from are kept per topic, so resuming takes the same memory however
+    large the output is.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.last_id: Dict[str, str] = {}
+        self.offsets: Dict[str, int] = {}
+        self.valid_size = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"size": self.valid_size,
+                "topics": {topic: {"count": count, "last_id": self.last_id.get(topic),
+                                   "offset": self.offsets.get(topic, 0)}
+                           for topic, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamProgress":
+        progress = cls()
+        progress.valid_size = data["size"]
+        for topic, state in data["topics"].items():
+            progress.counts[topic] = state["count"]
+            if state.get("last_id"):
+                progress.last_id[topic] = state["last_id"]
+            progress.offsets[topic] = state.get("offset", 0)
+        return progress
+
+
+def checkpoint_file(output_file: str) -> str:
+    """The file next to a streaming output recording its last checkpoint."""
+    return output_file + CHECKPOINT_SUFFIX
+
+
+def load_stream_progress(output_file: str) -> StreamProgress:
+    """
+    Read how far a streaming JSONL output got, to resume it.
+
+    The checkpoint file written with every fsync is used when present;
+    records after its `size` were not fsynced and are dropped. Without one
+    (e.g. a crash before the first checkpoint) the output itself is scanned,
+    ignoring a trailing partial line, and every topic restarts at offset 0.
+    """
+    progress = StreamProgress()
+    if not os.path.exists(output_file):
+        return progress
+    try:
+        with open(checkpoint_file(output_file), 'r', encoding='utf-8') as f:
+            progress = StreamProgress.from_dict(json.load(f))
+        progress.valid_size = min(progress.valid_size, os.path.getsize(output_file))
+        return progress
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Ignoring unreadable checkpoint of {output_file}: {e}")
+        progress = StreamProgress()
+    with open(output_file, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                row = json.loads(line)
+            except ValueError:
+                break
+            topic = row["topic"]
+            progress.counts[topic] = progress.counts.get(topic, 0) + 1
+            progress.last_id[topic] = row["id"]
+            progress.valid_size += len(line)
+    return progress
+
+
+def _id_order(paper_id: str) -> Optional[Tuple[int, int, int]]:
+    """(year, month, number) of an arXiv id such as 2405.01234 or hep-th/9901001."""
+    digits = paper_id.rsplit("/", 1)[-1].replace(".", "")
+    if len(digits) < 5 or not digits.isdigit():
+        return None
+    year = int(digits[:2])
+    return (1900 + year if year >= 91 else 2000 + year, int(digits[2:4]), int(digits[4:]))
+
+
+class JsonlStreamWriter:
+    """
+    Append papers to a JSONL file as soon as they are fetched.
+
+    Every line is one paper tagged with its topic and batch index. The file is
+    fsynced every `checkpoint_every` papers and on close, and each fsync
+    records the file size and every topic's last paper id and arXiv restart
+    offset in `<output>.checkpoint`. An interrupted run loses at most one
+    checkpoint interval: `resume=True` cuts the file back to the checkpoint
+    and `resume_points()` tells the fetch where to restart each topic.
+
+    Results arrive newest submission first, so the papers a restarted fetch
+    repeats are the ones up to the topic's last written id (newer papers,
+    e.g. from a restart at the start of a feed page); they are skipped.
+    """
+
+    def __init__(self, output_file: str, batch_size: int = 5,
+                 checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY, resume: bool = False):
+        self.output_file = output_file
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.progress = load_stream_progress(output_file) if resume else StreamProgress()
+        self.counts = self.progress.counts
+        # Topics still replaying papers written before the interruption
+        self._skipping = dict(self.progress.last_id)
+        self._pending = 0
+
+        if resume and os.path.exists(output_file):
+            self._file = open(output_file, 'r+', encoding='utf-8')
+            self._file.truncate(self.progress.valid_size)
+            self._file.seek(self.progress.valid_size)
+            logging.info(f"Resuming {output_file} after {sum(self.counts.values())} papers")
+            for topic, paper_id in self.progress.last_id.items():
+                logging.info(f"Topic '{topic}': {self.counts[topic]} papers written, last id {paper_id}, "
+                             f"restarting at result {self.progress.offsets.get(topic, 0)}")
+        else:
+            self._file = open(output_file, 'w', encoding='utf-8')
+            if os.path.exists(checkpoint_file(output_file)):
+                os.remove(checkpoint_file(output_file))
+
+    def resume_points(self) -> Dict[str, int]:
+        """Dictionary mapping topics to the arXiv result index their fetch restarts at."""
+        return dict(self.progress.offsets)
+
+    def _already_written(self, topic: str, paper_id: str) -> bool:
+        last_id = self._skipping.get(topic)
+        if last_id is None:
+            return False
+        if paper_id == last_id:
+            del self._skipping[topic]
+            return True
+        order, last_order = _id_order(paper_id), _id_order(last_id)
+        if order is not None and last_order is not None and order > last_order:
+            return True
+        # The first paper older than the last one written: everything from here on is new
+        del self._skipping[topic]
+        return False
+
+    def write(self, topic: str, paper: Dict[str, Any], offset: Optional[int] = None) -> bool:
+        """
+        Append a paper unless a resumed run already wrote it for the topic.
+
+        Args:
+            topic: The topic the paper was fetched for.
+            paper: The paper dictionary.
+            offset: The arXiv result index a fetch of the topic can restart
+                from to get this paper again, recorded with the checkpoint.
+
+        Returns:
+            True if the paper was written.
+        """
+        if self._already_written(topic, paper["id"]):
+            return False
+        index = self.counts.get(topic, 0)
+        self.counts[topic] = index + 1
+        self.progress.last_id[topic] = paper["id"]
+        if offset is not None:
+            self.progress.offsets[topic] = offset
+        row = {"topic": topic, "batch": index // self.batch_size, **paper}
+        self._file.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+        self._file.write("\n")
+        self._pending += 1
+        if self._pending >= self.checkpoint_every:
+            self.checkpoint()
+        return True
+
+    def checkpoint(self):
+        """Flush and fsync everything written so far, then record the checkpoint."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.progress.valid_size = self._file.tell()
+        tmp = f"{checkpoint_file(self.output_file)}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.progress.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, checkpoint_file(self.output_file))
+        self._pending = 0
+
+    def close(self):
+        self.checkpoint()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
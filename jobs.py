@@ -0,0 +1,143 @@
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Dict, Any, Tuple
+
+# Background searches run on this many workers; finished jobs are kept for
+# polling this many seconds
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_TTL = 600
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class SearchJob:
+    """A background search with per-topic progress and partial results."""
+
+    def __init__(self, key: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.params = params
+        self.status = QUEUED
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.topics = {topic: QUEUED for topic in params.get("keywords_dict", {})}
+        self.results = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        """Return the job state as a JSON-serializable dictionary."""
+        with self._lock:
+            info = {
+                "job_id": self.id,
+                "status": self.status,
+                "error": self.error,
+                "created": self.created,
+                "finished": self.finished,
+                "topics": {
+                    topic: {"status": status, "papers": len(self.results.get(topic, []))}
+                    for topic, status in self.topics.items()
+                },
+            }
+            if include_results:
+                info["results"] = {topic: list(papers) for topic, papers in self.results.items()}
+            return info
+
+
+class JobManager:
+    """
+    Runs searches on a background worker pool.
+
+    A submitted search that is identical to one still queued or running is
+    attached to that job instead of starting another fetch.
+    """
+
+    def __init__(self, search_fn: Callable[..., Iterator[Tuple[str, List[Dict[str, Any]]]]],
+                 max_workers: int = DEFAULT_JOB_WORKERS, ttl: float = DEFAULT_JOB_TTL):
+        self.search_fn = search_fn
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-job")
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Build the coalescing key of a search."""
+        return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def submit(self, params: Dict[str, Any]) -> SearchJob:
+        """
+        Enqueue a search, or join an identical one already in flight.
+
+        Args:
+            params: Keyword arguments for the search function, including
+                "keywords_dict".
+
+        Returns:
+            The job running the search.
+        """
+        key = self.make_key(params)
+        with self._lock:
+            self._expire()
+            job = self._in_flight.get(key)
+            if job is not None and job.in_flight:
+                logging.info(f"Coalescing search onto in-flight job {job.id}")
+                return job
+
+            job = SearchJob(key, params)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[SearchJob]:
+        """Return a job by id, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: SearchJob):
+        with job._lock:
+            job.status = RUNNING
+            job.topics = {topic: RUNNING for topic in job.topics}
+        try:
+            for topic, papers in self.search_fn(**job.params):
+                with job._lock:
+                    job.results[topic] = papers
+                    job.topics[topic] = DONE
+            with job._lock:
+                job.status = DONE
+        except Exception as e:
+            logging.error(f"Search job {job.id} failed: {e}")
+            with job._lock:
+                job.status = FAILED
+                job.error = str(e)
+        finally:
+            with job._lock:
+                job.finished = time.time()
+                # Topics that yielded nothing (e.g. no matches) are finished too
+                for topic, status in job.topics.items():
+                    if status == RUNNING:
+                        job.topics[topic] = DONE if job.status == DONE else FAILED
+            with self._lock:
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+
+    def _expire(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
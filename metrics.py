@@ -0,0 +1,185 @@
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Optional, Tuple
+
+# Upper bounds (seconds) of the span duration histogram buckets
+SPAN_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "arxiv_"
+
+# Value recorded for a limited label outside its allowed values
+OTHER_LABEL_VALUE = "other"
+
+span_logger = logging.getLogger("metrics.spans")
+
+_NULL_SPAN = nullcontext()
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """
+    In-process timing spans and counters, exported in the Prometheus text format.
+
+    Nothing is recorded until `enable()` is called: `span()` then returns a
+    shared no-op context manager and `inc()`/`observe()` return right away,
+    so instrumented hot paths cost one attribute check.
+
+    Labels fed from user input (e.g. topics typed into the web form) should
+    be bounded with `limit_label()`, or every distinct value becomes a new
+    series.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._counters: Dict[Tuple[str, tuple], float] = {}
+        # (stage, labels) -> [bucket counts..., count, sum]
+        self._spans: Dict[Tuple[str, tuple], list] = {}
+        # label -> allowed values, see `limit_label`
+        self._label_values: Dict[str, frozenset] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def limit_label(self, label: str, values: Iterable[str]):
+        """Record values of `label` outside `values` as "other" from now on."""
+        self._label_values = {**self._label_values, label: frozenset(values)}
+
+    def _label_key(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        limits = self._label_values
+        if limits:
+            labels = {k: v if k not in limits or v in limits[k] else OTHER_LABEL_VALUE
+                      for k, v in labels.items()}
+        return _label_key(labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter, e.g. `inc("papers_fetched", 100)`."""
+        if not self.enabled or not value:
+            return
+        key = (name, self._label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float, **labels):
+        """Record the duration of a stage that was timed elsewhere."""
+        if not self.enabled:
+            return
+        key = (stage, self._label_key(labels))
+        index = bisect.bisect_left(SPAN_BUCKETS, seconds)
+        with self._lock:
+            series = self._spans.get(key)
+            if series is None:
+                series = self._spans[key] = [0] * (len(SPAN_BUCKETS) + 2)
+            if index < len(SPAN_BUCKETS):
+                series[index] += 1
+            series[-2] += 1
+            series[-1] += seconds
+        if span_logger.isEnabledFor(logging.DEBUG):
+            span_logger.debug(f"span stage={stage} seconds={seconds:.4f} "
+                              + " ".join(f"{k}={v}" for k, v in labels.items()))
+
+    def span(self, stage: str, **labels):
+        """
+        Time a block as one span of `stage`, e.g. `with metrics.span("parse"):`.
+
+        Returns a no-op context manager while metrics are disabled.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(stage, labels)
+
+    @contextmanager
+    def _span(self, stage: str, labels: Dict[str, str]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return the counters and span totals as a JSON-serializable dictionary."""
+        with self._lock:
+            counters = {name + _format_labels(key): value for (name, key), value in self._counters.items()}
+            spans = {stage + _format_labels(key): {"count": series[-2], "seconds": round(series[-1], 6)}
+                     for (stage, key), series in self._spans.items()}
+        return {"counters": counters, "spans": spans}
+
+    def render(self, counters: Optional[Dict[str, float]] = None,
+               gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            counters: Extra totals kept elsewhere (e.g. HTTP requests), by name.
+            gauges: Extra point-in-time values to export, by name.
+        """
+        lines = []
+        with self._lock:
+            own = dict(self._counters)
+            spans = sorted((key, list(series)) for key, series in self._spans.items())
+
+        for name, value in (counters or {}).items():
+            own[(name, ())] = own.get((name, ()), 0) + value
+        seen = set()
+        for (name, key), value in sorted(own.items()):
+            metric = f"{METRIC_PREFIX}{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(key)} {value:g}")
+
+        if spans:
+            metric = f"{METRIC_PREFIX}stage_seconds"
+            lines.append(f"# HELP {metric} Time spent per stage of a search.")
+            lines.append(f"# TYPE {metric} histogram")
+            for (stage, key), series in spans:
+                labels = (("stage", stage),) + key
+                cumulative = 0
+                for bound, count in zip(SPAN_BUCKETS, series):
+                    cumulative += count
+                    le = f'le="{bound:g}"'
+                    lines.append(f"{metric}_bucket{_format_labels(labels, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{metric}_bucket{_format_labels(labels, le)} {series[-2]}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {series[-1]:.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {series[-2]}")
+
+        for name, value in sorted((gauges or {}).items()):
+            metric = f"{METRIC_PREFIX}{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One line per stage with its span count and total time, slowest first."""
+        data = self.snapshot()
+        lines = [f"{stage}: {info['count']} spans, {info['seconds']:.3f}s"
+                 for stage, info in sorted(data["spans"].items(), key=lambda x: -x[1]["seconds"])]
+        lines += [f"{name}: {value:g}" for name, value in sorted(data["counters"].items())]
+        return "\n".join(lines)
+
+
+# Shared by the fetcher, script.py and app.py
+metrics = Metrics()
@@ -0,0 +1,261 @@
+import io
+import os
+import re
+import json
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Iterator, Tuple
+from datetime import date, timedelta
+
+from arxiv_fetcher import (
+    RateLimiter, default_rate_limiter, get_default_session, compile_filter, classify_paper,
+    parse_filter_list, arxiv_url, HTTP_TIMEOUT
+)
+from atom_parser import etree
+from paper_record import Paper
+from paper_store import PaperStore
+
+if TYPE_CHECKING:
+    import requests
+
+# OAI-PMH endpoint; point ARXIV_OAI_URL at a local stub server to test offline
+DEFAULT_OAI_URL = os.environ.get('ARXIV_OAI_URL', 'https://oaipmh.arxiv.org/oai')
+
+DEFAULT_OAI_SET = 'cs'
+DEFAULT_SLICE_DAYS = 30
+DEFAULT_BACKFILL_WORKERS = 2
+DEFAULT_CHECKPOINT_FILE = 'backfill_checkpoint.json'
+
+OAI = "{http://www.openarchives.org/OAI/2.0/}"
+RAW = "{http://arxiv.org/OAI/arXivRaw/}"
+
+AUTHOR_SEPARATOR = re.compile(r",\s*|\s+and\s+")
+
+
+def parse_records(data: bytes, categories: Optional[List[str]] = None) -> Tuple[List[Paper], Optional[str], int]:
+    """
+    Parse one ListRecords response in the arXivRaw format.
+
+    Args:
+        data: The raw OAI-PMH response.
+        categories: Skip records whose primary category is not listed.
+
+    Returns:
+        (papers, resumption token, records read). The token is None on the
+        last page.
+
+    Raises:
+        ValueError: If the repository answered with an OAI-PMH error other
+            than `noRecordsMatch`.
+    """
+    papers = []
+    token = None
+    records = 0
+    categories = set(categories) if categories else None
+    for _, elem in etree.iterparse(io.BytesIO(data), events=("end",)):
+        tag = elem.tag
+        if tag == OAI + "error":
+            if elem.get("code") == "noRecordsMatch":
+                break
+            raise ValueError(f"OAI-PMH error {elem.get('code')}: {elem.text}")
+        if tag == OAI + "resumptionToken":
+            token = (elem.text or "").strip() or None
+            continue
+        if tag != OAI + "record":
+            continue
+
+        records += 1
+        raw = elem.find(f"{OAI}metadata/{RAW}arXivRaw")
+        # Deleted records carry a header only
+        if raw is None:
+            elem.clear()
+            continue
+        category = (raw.findtext(RAW + "categories") or "").split(" ")[0]
+        if categories and category not in categories:
+            elem.clear()
+            continue
+
+        versions = raw.findall(RAW + "version")
+        latest = parsedate_to_datetime(versions[-1].findtext(RAW + "date")).date() if versions else None
+        paper_id = raw.findtext(RAW + "id")
+        authors = " ".join((raw.findtext(RAW + "authors") or "").split())
+        papers.append(Paper(
+            id=paper_id,
+            version=max(len(versions), 1),
+            title=" ".join((raw.findtext(RAW + "title") or "").split()),
+            url=f"{arxiv_url}abs/{paper_id}",
+            update_date=latest.isoformat() if latest else "",
+            authors=tuple(a for a in AUTHOR_SEPARATOR.split(authors) if a),
+            category=category,
+            abstract=" ".join((raw.findtext(RAW + "abstract") or "").split()),
+            comments=" ".join((raw.findtext(RAW + "comments") or "").split()),
+        ))
+        elem.clear()
+    return papers, token, records
+
+
+class HarvestCheckpoint:
+    """
+    Progress of a backfill, kept in a JSON file.
+
+    Every date slice records the resumption token of its next page, or that
+    it is done, so an interrupted harvest continues where it stopped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.slices: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.slices = json.load(f).get("slices", {})
+
+    @staticmethod
+    def slice_key(date_from: date, date_to: date) -> str:
+        return f"{date_from.isoformat()}..{date_to.isoformat()}"
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.slices.get(key, {}))
+
+    def update(self, key: str, **state):
+        """Update a slice's state and write the checkpoint file atomically."""
+        with self._lock:
+            self.slices.setdefault(key, {}).update(state)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({"slices": self.slices}, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+def date_slices(date_from: date, date_to: date, slice_days: int = DEFAULT_SLICE_DAYS) -> List[Tuple[date, date]]:
+    """Split [date_from, date_to] into consecutive inclusive slices."""
+    slices = []
+    start = date_from
+    while start <= date_to:
+        end = min(start + timedelta(days=slice_days - 1), date_to)
+        slices.append((start, end))
+        start = end + timedelta(days=1)
+    return slices
+
+
+class OaiHarvester:
+    """
+    Harvest arXiv metadata by date range and set through OAI-PMH.
+
+    Requests go through the shared pooled session and rate limiter, so 503
+    flow-control answers are retried honoring Retry-After.
+    """
+
+    def __init__(self, oai_url: str = DEFAULT_OAI_URL, set_spec: str = DEFAULT_OAI_SET,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 session: Optional["requests.Session"] = None):
+        self.oai_url = oai_url
+        self.set_spec = set_spec
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.session = session or get_default_session()
+
+    def iter_pages(self, date_from: date, date_to: date, token: Optional[str] = None,
+                   categories: Optional[List[str]] = None) -> Iterator[Tuple[List[Paper], Optional[str]]]:
+        """
+        Yield the pages of records whose datestamp lies in [date_from, date_to].
+
+        Args:
+            date_from: First datestamp (inclusive).
+            date_to: Last datestamp (inclusive).
+            token: Resumption token to continue an interrupted harvest from.
+            categories: Skip records whose primary category is not listed.
+
+        Yields:
+            (papers, resumption token of the next page) tuples; the token is
+            None on the last page.
+        """
+        while True:
+            if token:
+                params = {"verb": "ListRecords", "resumptionToken": token}
+            else:
+                params = {"verb": "ListRecords", "metadataPrefix": "arXivRaw",
+                          "from": date_from.isoformat(), "until": date_to.isoformat()}
+                if self.set_spec:
+                    params["set"] = self.set_spec
+            self.rate_limiter.wait()
+            response = self.session.get(self.oai_url, params=params, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            papers, token, _ = parse_records(response.content, categories=categories)
+            yield papers, token
+            if not token:
+                return
+
+
+def backfill(store: PaperStore, keywords_dict: Dict[str, List[str]], date_from: date, date_to: date,
+             harvester: Optional[OaiHarvester] = None, categories: Optional[List[str]] = None,
+             slice_days: int = DEFAULT_SLICE_DAYS, max_workers: int = DEFAULT_BACKFILL_WORKERS,
+             checkpoint_file: str = DEFAULT_CHECKPOINT_FILE) -> Dict[str, int]:
+    """
+    Bulk-harvest a date range into the paper store.
+
+    The range is split into date slices harvested concurrently. Every
+    harvested paper is classified into topics locally (see `classify_paper`)
+    and papers matching at least one topic are added to the store, linked to
+    the topics' queries. Progress is checkpointed after every page, so
+    rerunning the same backfill resumes it.
+
+    Args:
+        store: The paper store.
+        keywords_dict: Dictionary mapping topics to lists of filter terms.
+        date_from: First OAI-PMH datestamp to harvest (inclusive).
+        date_to: Last OAI-PMH datestamp to harvest (inclusive).
+        harvester: The OAI-PMH harvester. Defaults to the `cs` set.
+        categories: List of primary arXiv categories to keep.
+        slice_days: Number of days harvested by one worker request chain.
+        max_workers: Maximum number of slices harvested concurrently.
+        checkpoint_file: Path of the JSON checkpoint file.
+
+    Returns:
+        A dictionary mapping topics to the number of papers stored.
+    """
+    harvester = harvester or OaiHarvester()
+    checkpoint = HarvestCheckpoint(checkpoint_file)
+    topic_patterns = {topic: [compile_filter(f) for f in filters if f.strip()]
+                      for topic, filters in keywords_dict.items()}
+    queries = {topic: parse_filter_list(filters) for topic, filters in keywords_dict.items()}
+    counts = {topic: 0 for topic in keywords_dict}
+    counts_lock = threading.Lock()
+
+    def harvest_slice(start: date, end: date) -> int:
+        key = HarvestCheckpoint.slice_key(start, end)
+        state = checkpoint.get(key)
+        if state.get("done"):
+            logging.info(f"Slice {key} already harvested")
+            return 0
+        harvested = state.get("papers", 0)
+        for papers, token in harvester.iter_pages(start, end, token=state.get("token"),
+                                                  categories=categories):
+            by_topic = {}
+            for paper in papers:
+                record = paper.to_dict()
+                for topic in classify_paper(record, topic_patterns):
+                    by_topic.setdefault(topic, []).append(record)
+            for topic, matched in by_topic.items():
+                store.add_papers(matched, query=queries[topic])
+            with counts_lock:
+                for topic, matched in by_topic.items():
+                    counts[topic] += len(matched)
+            harvested += len(papers)
+            checkpoint.update(key, token=token, papers=harvested, done=token is None)
+            logging.info(f"Slice {key}: {harvested} records harvested")
+        return harvested
+
+    slices = date_slices(date_from, date_to, slice_days)
+    logging.info(f"Backfilling {date_from} to {date_to} in {len(slices)} slices")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(harvest_slice, start, end): (start, end) for start, end in slices}
+        for future in as_completed(futures):
+            start, end = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error harvesting slice {start} to {end}: {e}")
+    return counts
@@ -0,0 +1,133 @@
+import time
+import uuid
+import threading
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
+
+# Cards rendered per topic page; result sets are kept for paging this many
+# seconds, and at most this many at once
+DEFAULT_RESULTS_PER_PAGE = 20
+DEFAULT_RESULTS_TTL = 1800
+DEFAULT_MAX_RESULT_SETS = 64
+
+# Characters of the abstract sent with a card; the rest is loaded on expand
+ABSTRACT_PREVIEW_CHARS = 300
+
+SORT_KEYS = ("score", "date")
+
+
+def paper_preview(paper: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a paper without its full abstract, keeping a short preview."""
+    preview = {k: v for k, v in paper.items() if k != "abstract"}
+    abstract = paper.get("abstract", "")
+    if len(abstract) > ABSTRACT_PREVIEW_CHARS:
+        preview["abstract_preview"] = abstract[:ABSTRACT_PREVIEW_CHARS].rsplit(" ", 1)[0] + "…"
+        preview["abstract_truncated"] = True
+    else:
+        preview["abstract_preview"] = abstract
+        preview["abstract_truncated"] = False
+    return preview
+
+
+class ResultSet:
+    """The papers of one search, served page by page per topic."""
+
+    def __init__(self, per_page: int = DEFAULT_RESULTS_PER_PAGE):
+        self.id = uuid.uuid4().hex
+        self.per_page = per_page
+        self.created = time.time()
+        self.topics: Dict[str, List[Dict[str, Any]]] = {}
+        self._papers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, topic: str, papers: List[Dict[str, Any]]):
+        with self._lock:
+            self.topics[topic] = papers
+            for paper in papers:
+                self._papers.setdefault(paper["id"], paper)
+
+    def page(self, topic: str, page: int = 1, sort: str = "score",
+             per_page: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return one page of a topic's papers as previews.
+
+        Args:
+            topic: The topic.
+            page: The 1-based page number.
+            sort: "score" keeps the search order (relevance when ranked),
+                "date" orders by update date, newest first.
+            per_page: Papers per page, defaults to the set's page size.
+
+        Returns:
+            A dictionary with the page's "papers" and the paging state, or
+            None if the topic is unknown.
+        """
+        with self._lock:
+            papers = self.topics.get(topic)
+        if papers is None:
+            return None
+        if sort == "date":
+            papers = sorted(papers, key=lambda p: p.get("update_date", ""), reverse=True)
+        per_page = per_page or self.per_page
+        page = max(page, 1)
+        start = (page - 1) * per_page
+        return {
+            "topic": topic,
+            "page": page,
+            "per_page": per_page,
+            "sort": sort,
+            "total": len(papers),
+            "has_more": start + per_page < len(papers),
+            "papers": [paper_preview(p) for p in papers[start:start + per_page]],
+        }
+
+    def paper(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._papers.get(paper_id)
+
+    def paginate(self, results: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Keep each topic's papers as they arrive and yield its first page.
+
+        Args:
+            results: (topic, papers) pairs, e.g. from `iter_fetch_papers`.
+
+        Yields:
+            (topic, first page) tuples, see `page`.
+        """
+        for topic, papers in results:
+            self.add(topic, papers)
+            yield topic, self.page(topic)
+
+
+class ResultPages:
+    """Recent result sets of the web app, expired after a time to live."""
+
+    def __init__(self, ttl: float = DEFAULT_RESULTS_TTL, max_sets: int = DEFAULT_MAX_RESULT_SETS):
+        self.ttl = ttl
+        self.max_sets = max_sets
+        self._sets: Dict[str, ResultSet] = {}
+        self._lock = threading.Lock()
+
+    def create(self, per_page: int = DEFAULT_RESULTS_PER_PAGE) -> ResultSet:
+        """Start a result set for a new search."""
+        result_set = ResultSet(per_page)
+        with self._lock:
+            self._expire()
+            self._sets[result_set.id] = result_set
+        return result_set
+
+    def get(self, result_id: str) -> Optional[ResultSet]:
+        """Return a result set by id, or None if unknown or expired."""
+        with self._lock:
+            self._expire()
+            return self._sets.get(result_id)
+
+    def _expire(self):
+        now = time.time()
+        expired = [result_id for result_id, result_set in self._sets.items()
+                   if now - result_set.created > self.ttl]
+        for result_id in expired:
+            del self._sets[result_id]
+        # Dicts keep insertion order, so the oldest sets go first
+        while len(self._sets) > self.max_sets:
+            del self._sets[next(iter(self._sets))]
@@ -0,0 +1,100 @@
+import sys
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Iterator
+
+
+@dataclass(slots=True)
+class Paper:
+    """
+    Compact paper record.
+
+    Authors are kept as a tuple instead of a joined string, and the category
+    and date strings are interned since they repeat across thousands of
+    papers.
+    """
+    id: str
+    version: int
+    title: str
+    url: str
+    update_date: str
+    authors: Tuple[str, ...]
+    category: str
+    abstract: str
+    comments: str = ""
+
+    def __post_init__(self):
+        self.category = sys.intern(self.category)
+        self.update_date = sys.intern(self.update_date)
+
+    @property
+    def first_author(self) -> str:
+        return self.authors[0] if self.authors else ""
+
+    @classmethod
+    def from_dict(cls, paper: Dict[str, Any]) -> "Paper":
+        """Build a record from a `format_paper_info` dictionary."""
+        authors = paper.get("authors") or ()
+        if isinstance(authors, str):
+            authors = tuple(a.strip() for a in authors.split(", ") if a.strip())
+        return cls(
+            id=paper["id"],
+            version=paper.get("version", 1),
+            title=paper["title"],
+            url=paper["url"],
+            update_date=paper["update_date"],
+            authors=tuple(authors),
+            category=paper.get("category", ""),
+            abstract=paper.get("abstract", ""),
+            comments=paper.get("comments") or "",
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record in the `format_paper_info` dictionary layout."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "url": self.url,
+            "update_date": self.update_date,
+            "first_author": self.first_author,
+            "authors": ", ".join(self.authors),
+            "category": self.category,
+            "abstract": self.abstract,
+            "comments": self.comments,
+            "version": self.version,
+        }
+
+
+class PaperCollection:
+    """
+    Papers stored once by id, with topic membership kept as id references.
+
+    A paper matched by several topics is held a single time; each topic only
+    keeps the ordered list of its paper ids.
+    """
+
+    def __init__(self):
+        self.papers: Dict[str, Paper] = {}
+        self.topics: Dict[str, List[str]] = {}
+
+    def add_topic(self, topic: str, papers: List[Dict[str, Any]]):
+        """Add a topic's papers, keeping the newest version of each paper."""
+        ids = self.topics.setdefault(topic, [])
+        for paper in papers:
+            known = self.papers.get(paper["id"])
+            if known is None or known.version < paper.get("version", 1):
+                self.papers[paper["id"]] = Paper.from_dict(paper)
+            ids.append(paper["id"])
+
+    def topics_of(self) -> Dict[str, List[str]]:
+        """Return a mapping from paper id to the topics it belongs to."""
+        membership = {}
+        for topic, ids in self.topics.items():
+            for paper_id in ids:
+                membership.setdefault(paper_id, []).append(topic)
+        return membership
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def __iter__(self) -> Iterator[Paper]:
+        return iter(self.papers.values())
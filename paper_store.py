@@ -0,0 +1,232 @@
+import sqlite3
+import logging
+from contextlib import closing
+from typing import List, Optional, Dict, Any
+from datetime import date, timedelta
+
+from arxiv_fetcher import ArxivPaperFetcher, fetch_topics, DEFAULT_MAX_WORKERS
+
+DEFAULT_STORE_FILE = 'papers.db'
+
+# How far back the first sync of a query reaches, and how many papers a
+# single sync may pull per query
+DEFAULT_SYNC_DAYS = 7
+DEFAULT_SYNC_MAX_RESULTS = 1000
+
+PAPER_FIELDS = ["id", "version", "title", "url", "update_date", "first_author",
+                "authors", "category", "abstract", "comments"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    update_date TEXT NOT NULL,
+    first_author TEXT,
+    authors TEXT,
+    category TEXT,
+    abstract TEXT,
+    comments TEXT,
+    PRIMARY KEY (id, version)
+);
+CREATE INDEX IF NOT EXISTS papers_update_date ON papers (update_date);
+CREATE TABLE IF NOT EXISTS query_papers (
+    query TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (query, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    query TEXT PRIMARY KEY,
+    synced_from TEXT NOT NULL,
+    synced_to TEXT NOT NULL
+);
+"""
+
+
+class PaperStore:
+    """
+    SQLite store of fetched papers keyed by arXiv id and version.
+
+    Papers are linked to the query strings that returned them, and every
+    synced query records the date window it fully covers, so searches inside
+    that window can be answered without contacting arXiv.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_FILE):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps the store safe to use
+        # from Flask request threads and fetch workers alike.
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # Let INSERT OR REPLACE fire delete triggers (used by search_index)
+        conn.execute("PRAGMA recursive_triggers = ON")
+        return conn
+
+    def add_papers(self, papers: List[Dict[str, Any]], query: Optional[str] = None) -> int:
+        """
+        Insert or update papers, optionally linking them to a query.
+
+        Args:
+            papers: List of paper information dictionaries.
+            query: The query string that returned the papers.
+
+        Returns:
+            The number of papers written.
+        """
+        rows = [tuple(p.get(f, 1 if f == "version" else "") for f in PAPER_FIELDS) for p in papers]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO papers ({', '.join(PAPER_FIELDS)}) "
+                f"VALUES ({', '.join('?' * len(PAPER_FIELDS))})",
+                rows
+            )
+            if query is not None:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO query_papers (query, id) VALUES (?, ?)",
+                    [(query, p["id"]) for p in papers]
+                )
+        return len(rows)
+
+    def get_sync_state(self, query: str) -> Optional[Dict[str, date]]:
+        """Return the date window fully synced for a query, if any."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT synced_from, synced_to FROM sync_state WHERE query = ?", (query,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "synced_from": date.fromisoformat(row["synced_from"]),
+            "synced_to": date.fromisoformat(row["synced_to"]),
+        }
+
+    def set_sync_state(self, query: str, synced_from: date, synced_to: date):
+        """Record the date window fully synced for a query."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (query, synced_from, synced_to) VALUES (?, ?, ?)",
+                (query, synced_from.isoformat(), synced_to.isoformat())
+            )
+
+    def covers(self, query: str, date_from: Optional[date], date_to: Optional[date]) -> bool:
+        """Check whether a query's synced window contains [date_from, date_to]."""
+        state = self.get_sync_state(query)
+        if not state or not date_from or not date_to:
+            return False
+        return state["synced_from"] <= date_from and date_to <= state["synced_to"]
+
+    def get_papers(self, query: str, max_results: int = 50,
+                   date_from: Optional[date] = None, date_to: Optional[date] = None,
+                   categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored papers for a query, newest first, latest version only.
+
+        Args:
+            query: The query string the papers were synced for.
+            max_results: The maximum number of results.
+            date_from: The start date for filtering papers (inclusive).
+            date_to: The end date for filtering papers (inclusive).
+            categories: List of arXiv categories to filter by.
+
+        Returns:
+            A list of paper information dictionaries.
+        """
+        sql = [
+            "SELECT p.* FROM papers p JOIN query_papers q ON q.id = p.id",
+            "WHERE q.query = ?",
+            "AND p.version = (SELECT MAX(version) FROM papers WHERE id = p.id)",
+        ]
+        params = [query]
+        if date_from:
+            sql.append("AND p.update_date >= ?")
+            params.append(date_from.isoformat())
+        if date_to:
+            sql.append("AND p.update_date <= ?")
+            params.append(date_to.isoformat())
+        if categories:
+            sql.append(f"AND p.category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        sql.append("ORDER BY p.update_date DESC, p.id DESC LIMIT ?")
+        params.append(max_results)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(" ".join(sql), params).fetchall()
+        return [dict(row) for row in rows]
+
+
+def sync_store(store: PaperStore, queries: Dict[str, str], fetcher: Optional[ArxivPaperFetcher] = None,
+               date_to: Optional[date] = None, days: int = DEFAULT_SYNC_DAYS,
+               max_results: int = DEFAULT_SYNC_MAX_RESULTS,
+               max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, int]:
+    """
+    Incrementally sync the store with arXiv.
+
+    Each query is fetched only from the last synced date onwards (or `days`
+    back on its first sync). When a sync hits `max_results` the covered window
+    only reaches back to the day after the oldest paper actually received.
+
+    Args:
+        store: The paper store.
+        queries: Dictionary mapping topics to arXiv query strings.
+        fetcher: The paper fetcher. Defaults to a new ArxivPaperFetcher.
+        date_to: Last date to sync (inclusive). Defaults to today.
+        days: Number of days fetched on a query's first sync.
+        max_results: Maximum number of papers fetched per query.
+        max_workers: Maximum number of queries fetched concurrently.
+
+    Returns:
+        A dictionary mapping topics to the number of papers synced. Topics
+        whose fetch failed are left out and keep their previous sync state.
+    """
+    fetcher = fetcher or ArxivPaperFetcher()
+    date_to = date_to or date.today()
+
+    # Group topics by their sync start so each group is one concurrent fetch.
+    # The last synced day is fetched again since it may have been partial.
+    groups = {}
+    for topic, query in queries.items():
+        state = store.get_sync_state(query)
+        start = state["synced_to"] if state else date_to - timedelta(days=days)
+        groups.setdefault(start, {})[topic] = query
+
+    counts = {}
+    for start, group in groups.items():
+        logging.info(f"Syncing {len(group)} topics from {start} to {date_to}")
+        failed = set()
+        fetched = fetch_topics(
+            fetcher,
+            group,
+            max_workers=max_workers,
+            failed=failed,
+            max_results=max_results,
+            date_from=start,
+            date_to=date_to
+        )
+        for topic, papers in fetched.items():
+            if topic in failed:
+                # Recording the window would hide the gap from every later sync
+                logging.error(f"Not recording sync state of topic '{topic}' since its fetch failed")
+                continue
+            query = group[topic]
+            store.add_papers(papers, query=query)
+            counts[topic] = len(papers)
+
+            state = store.get_sync_state(query)
+            if len(papers) >= max_results:
+                oldest = min(date.fromisoformat(p["update_date"]) for p in papers)
+                synced_from = oldest + timedelta(days=1)
+                logging.warning(f"Sync of topic '{topic}' hit max_results={max_results}; "
+                                f"coverage starts at {synced_from}")
+            elif state:
+                synced_from = state["synced_from"]
+            else:
+                synced_from = start
+            store.set_sync_state(query, synced_from, date_to)
+            logging.info(f"Synced {len(papers)} papers for topic '{topic}'")
+
+    return counts
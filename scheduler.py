@@ -0,0 +1,173 @@
+import os
+import glob
+import json
+import logging
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import List, Optional, Dict, Any, Tuple
+
+from arxiv_fetcher import (
+    ArxivPaperFetcher, RateLimiter, QueryCache, fetch_merged, normalize_query, parse_filter_list, read_config_file,
+    DEFAULT_MAX_WORKERS, DEFAULT_DATE_SLACK_DAYS, DEFAULT_PAGE_SIZE
+)
+
+DEFAULT_PROFILES_OUTPUT = 'profile_results'
+# Threads writing per-profile outputs while the next group is fetched
+DEFAULT_PROFILE_WORKERS = 4
+
+
+def load_profiles(profile_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load every `*.yaml`/`*.yml` profile in a directory.
+
+    A profile is a `config.yaml` (topics under "keywords") that may also set
+    its own "days", "max_results", "categories" and "batch_size".
+
+    Returns:
+        A dictionary mapping profile names (the file names without
+        extension) to profiles. Unreadable profiles are left out.
+    """
+    profiles = {}
+    files = sorted(glob.glob(os.path.join(profile_dir, "*.yaml")) + glob.glob(os.path.join(profile_dir, "*.yml")))
+    for file in files:
+        name = os.path.splitext(os.path.basename(file))[0]
+        try:
+            profile = read_config_file(file)
+            if not profile or not profile.get('keywords'):
+                raise ValueError("no keywords")
+            profiles[name] = profile
+        except Exception as e:
+            logging.error(f"Skipping profile {file}: {e}")
+    return profiles
+
+
+def topic_key(filters: List[str]) -> str:
+    """Key shared by topics with the same filter terms, whatever their order or case."""
+    return normalize_query(parse_filter_list(sorted({f.strip() for f in filters if f.strip()}, key=str.lower)))
+
+
+def profile_window(profile: Dict[str, Any], date_from: str, date_to: str,
+                   categories: Optional[List[str]] = None) -> Tuple[str, str, Tuple[str, ...]]:
+    """
+    Date window and categories a profile is fetched with.
+
+    A profile's "days" counts back from `date_to`; without it the profile
+    uses `date_from`. Its "categories" replace `categories`.
+    """
+    if profile.get('days'):
+        end = datetime.datetime.strptime(date_to, '%Y-%m-%d').date()
+        date_from = (end - timedelta(days=int(profile['days']))).strftime('%Y-%m-%d')
+    return date_from, date_to, tuple(sorted(profile.get('categories') or categories or []))
+
+
+def _write_profile(fetcher: ArxivPaperFetcher, name: str, topics: Dict[str, List[Dict[str, Any]]],
+                   output_file: str, batch_size: int) -> Tuple[str, Dict[str, int]]:
+    """Batch one profile's papers and write them like `script.py --output`."""
+    results = {topic: fetcher.batch_papers(papers, batch_size) for topic, papers in topics.items() if papers}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return name, {topic: len(papers) for topic, papers in topics.items()}
+
+
+def run_profiles(profiles: Dict[str, Dict[str, Any]], output_dir: str = DEFAULT_PROFILES_OUTPUT,
+                 max_results: int = 50, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                 categories: Optional[List[str]] = None, batch_size: int = 5,
+                 max_workers: int = DEFAULT_MAX_WORKERS, profile_workers: int = DEFAULT_PROFILE_WORKERS,
+                 delay_seconds: Optional[float] = None, topic_timeout: Optional[float] = None,
+                 cache: Optional[QueryCache] = None,
+                 date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 fast_parser: bool = False) -> Dict[str, str]:
+    """
+    Fetch the papers of many profiles at once and write one output per profile.
+
+    Profiles are grouped by date window and categories. For each group the
+    topics of all profiles are deduplicated by their filter terms, and the
+    distinct terms are fetched once with merged queries (see `fetch_merged`),
+    so the number of arXiv requests follows the distinct terms rather than
+    the number of profiles. Each profile then gets its own topics' papers,
+    cut to its "max_results", batched and written to
+    `<output_dir>/<profile>.json`. The writes run on a small thread pool so
+    that disk I/O overlaps with the arXiv requests of the next group; the
+    work per profile is too light to be worth sending to other processes.
+
+    Args:
+        profiles: Dictionary mapping profile names to profiles, see
+            `load_profiles`.
+        output_dir: Directory of the per-profile JSON outputs.
+        max_results: Maximum number of results per topic, unless a profile
+            sets its own.
+        date_from: Start date in 'YYYY-MM-DD' format. Defaults to 7 days ago.
+        date_to: End date in 'YYYY-MM-DD' format. Defaults to today.
+        categories: arXiv categories to filter by, unless a profile sets its own.
+        batch_size: Size of each batch, unless a profile sets its own.
+        max_workers: Maximum number of merged queries fetched concurrently.
+        profile_workers: Number of threads writing profile outputs.
+        delay_seconds: Minimum delay between arXiv requests.
+        topic_timeout: Per-query timeout in seconds.
+        cache: Query cache consulted before every arXiv query.
+        date_slack_days: See `fetch_papers_by_config`.
+        page_size: Number of results requested per arXiv API page.
+        fast_parser: Parse feeds with the streaming `atom_parser`.
+
+    Returns:
+        A dictionary mapping profile names to their output files.
+    """
+    date_to = date_to or date.today().strftime('%Y-%m-%d')
+    date_from = date_from or (date.today() - timedelta(days=7)).strftime('%Y-%m-%d')
+
+    groups: Dict[Tuple[str, str, Tuple[str, ...]], List[str]] = {}
+    for name, profile in profiles.items():
+        groups.setdefault(profile_window(profile, date_from, date_to, categories), []).append(name)
+
+    rate_limiter = RateLimiter(delay_seconds) if delay_seconds is not None else None
+    fetcher = ArxivPaperFetcher(rate_limiter=rate_limiter, cache=cache,
+                                date_slack_days=date_slack_days, page_size=page_size,
+                                fast_parser=fast_parser)
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {}
+    with ThreadPoolExecutor(max_workers=max(1, profile_workers), thread_name_prefix="profile-writer") as executor:
+        futures = {}
+        for (window_from, window_to, window_categories), names in groups.items():
+            # Distinct topics of the group, each fetched for its most demanding profile
+            distinct = {}
+            limit = 0
+            for name in names:
+                limit = max(limit, int(profiles[name].get('max_results') or max_results))
+                for topic in profiles[name]['keywords'].values():
+                    distinct.setdefault(topic_key(topic['filters']), topic['filters'])
+            logging.info(f"Fetching {len(distinct)} distinct topics of {len(names)} profiles "
+                         f"from {window_from} to {window_to}")
+            papers = fetch_merged(
+                fetcher,
+                distinct,
+                max_results=limit,
+                max_workers=max_workers,
+                topic_timeout=topic_timeout,
+                date_from=datetime.datetime.strptime(window_from, '%Y-%m-%d').date(),
+                date_to=datetime.datetime.strptime(window_to, '%Y-%m-%d').date(),
+                categories=list(window_categories) or None
+            )
+
+            for name in names:
+                profile = profiles[name]
+                profile_max = int(profile.get('max_results') or max_results)
+                topics = {topic: papers[topic_key(spec['filters'])][:profile_max]
+                          for topic, spec in profile['keywords'].items()}
+                outputs[name] = os.path.join(output_dir, f"{name}.json")
+                future = executor.submit(_write_profile, fetcher, name, topics, outputs[name],
+                                         int(profile.get('batch_size') or batch_size))
+                futures[future] = name
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                counts = future.result()[1]
+                logging.info(f"Profile {name}: {sum(counts.values())} papers in {len(counts)} topics "
+                             f"saved to {outputs[name]}")
+            except Exception as e:
+                logging.error(f"Failed to write the output of profile {name}: {e}")
+                del outputs[name]
+    return outputs
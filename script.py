@@ -1,44 +1,36 @@
 import os
 import re
 import json
-import arxiv
 import logging
-import yaml
+import atexit
 import argparse
 import datetime
-import requests
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import date, timedelta
+from arxiv_fetcher import (
+    ArxivPaperFetcher, RateLimiter, QueryCache, iter_fetch_papers, iter_topic_papers, filter_query,
+    read_config_file, get_default_session, set_paper_log_sample,
+    DEFAULT_MAX_WORKERS, DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, DEFAULT_DATE_SLACK_DAYS, DEFAULT_PAGE_SIZE
+)
+from paper_store import PaperStore, sync_store, DEFAULT_SYNC_DAYS, DEFAULT_SYNC_MAX_RESULTS
+from search_index import SearchIndex
+from oai_harvester import backfill, OaiHarvester, DEFAULT_OAI_SET, DEFAULT_SLICE_DAYS, DEFAULT_BACKFILL_WORKERS, DEFAULT_CHECKPOINT_FILE
+from paper_record import PaperCollection
+from metrics import metrics
+from semantic import SemanticScorer
+from dedup import Deduplicator, DEFAULT_SEEN_FILE
+from batching import get_token_counter, batch_utilization, TOKENIZERS
+from analytics import Analytics, DEFAULT_ANALYTICS_FILE
+from snapshots import SnapshotStore, snapshot_name, DEFAULT_SNAPSHOT_DIR, DEFAULT_SNAPSHOT_DAYS, DEFAULT_SNAPSHOT_KEEP
+from summarizer import (
+    Summarizer, SummaryCache, OpenAIChatBackend, MockBackend,
+    DEFAULT_SUMMARY_CACHE, DEFAULT_LLM_URL, DEFAULT_LLM_MODEL, DEFAULT_LLM_CONCURRENCY
+)
+from scheduler import load_profiles, run_profiles, DEFAULT_PROFILES_OUTPUT, DEFAULT_PROFILE_WORKERS
+from exporters import export_collection, JsonlStreamWriter, EXPORT_FORMATS, DEFAULT_CHECKPOINT_EVERY
 
-
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%m/%d/%Y %H:%M:%S',
-    )
-
-arxiv_url = "http://arxiv.org/"
-
-
-def parse_single_filter(filter_str: str) -> str:
-    """
-    Parse a single filter string.
-    """
-    if not filter_str:
-        return ""
-    
-    ESCAPE = '"'
-    if len(filter_str.split()) > 1:
-        return f"{ESCAPE}{filter_str}{ESCAPE}"
-    return filter_str
-
-
-def parse_filter_list(filters: list) -> str:
-    """
-    Parse a list of filters.
-    """
-    OR = " OR "
-    return OR.join([parse_single_filter(f) for f in filters])
+# Output key of the batches built with mix_topics
+MIXED_TOPICS_KEY = "All topics"
 
 
 def process_keywords(config: dict) -> dict:
@@ -47,7 +39,7 @@ def process_keywords(config: dict) -> dict:
     """
     keywords = {}
     for k, v in config['keywords'].items():
-        keywords[k] = parse_filter_list(v['filters'])
+        keywords[k] = filter_query(tuple(v['filters']))
     return keywords
 
 
@@ -56,13 +48,13 @@ def load_config(config_file: str) -> dict:
     Load configuration from a YAML file.
     """
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = read_config_file(config_file)
         
         if not config:
             raise ValueError("Empty configuration file.")
         
-        config['kv'] = process_keywords(config)
+        # The parsed file is cached and shared, so add the queries to a copy
+        config = {**config, 'kv': process_keywords(config)}
 
         logging.info(f"Configuration loaded successfully: {config}")
         return config
@@ -84,148 +76,171 @@ def sort_papers(papers):
     return ans
 
 
-class ArxivPaperFetcher:
-    def __init__(self, arxiv_url: str = arxiv_url):
-        self.arxiv_url = arxiv_url
-
-
-    @staticmethod
-    def get_authors(authors, first_author=False):
-        """
-        Get authors from the author list as strings.
-        """
-        if first_author and authors:
-            return str(authors[0])
-        return ", ".join(str(author) for author in authors)
+def iter_papers_by_config(config: dict, max_results: int = 50, 
+                          date_from: Optional[str] = None, date_to: Optional[str] = None,
+                          categories: Optional[List[str]] = None,
+                          max_workers: int = DEFAULT_MAX_WORKERS, delay_seconds: Optional[float] = None,
+                          topic_timeout: Optional[float] = None,
+                          merged: bool = False, store: Optional[PaperStore] = None,
+                          offline: bool = False,
+                          cache: Optional[QueryCache] = None,
+                          date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                          page_size: int = DEFAULT_PAGE_SIZE,
+                          fast_parser: bool = False,
+                          semantic: bool = False, min_score: Optional[float] = None,
+                          dedup: Optional[Deduplicator] = None, new_only: bool = False,
+                          analytics: Optional[Analytics] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Fetch papers for a loaded configuration, yielding topics as they complete.
     
-
-    def get_paper_key(self, paper_id: str) -> str:
-        """
-        Remove the version number from the paper ID.
-        """
-        return paper_id.split("v")[0]
+    Takes the same arguments as `fetch_papers_by_config`, except that the
+    configuration is passed already loaded and there is no `batch_size`.
     
-
-    def format_paper_info(self, paper_key: str, update_time: date, paper_title: str, 
-                          paper_first_author: str, paper_authors: str, paper_url: str, 
-                          comments: Optional[str], category: str,
-                          paper_summary: str) -> Dict[str, Any]:
-        """
-        Format the paper information into a structured dictionary.
-        
-        Args:
-            paper_key: The paper key (arXiv ID without version).
-            update_time: The update time of the paper.
-            paper_title: The title of the paper.
-            paper_first_author: The first author of the paper.
-            paper_authors: All authors of the paper.
-            paper_url: The URL of the paper.
-            comments: Additional comments.
-            category: The primary category of the paper.
-            paper_summary: The abstract of the paper.
-            
-        Returns:
-            A dictionary containing the paper information.
-        """
-        paper_info = {
-            "id": paper_key,
-            "title": paper_title,
-            "url": paper_url,
-            "update_date": str(update_time),
-            "first_author": paper_first_author,
-            "authors": paper_authors,
-            "category": category,
-            "abstract": paper_summary,
-            "comments": comments if comments else ""
-        }
-        
-        return paper_info
+    Yields:
+        (topic, papers) tuples. Topics without papers are left out.
+    """
+    keywords_dict = {k: v['filters'] for k, v in config['keywords'].items()}
     
-
-    def get_papers(self, topic: str, query: str, max_results: int = 50, 
-                  date_from: Optional[date] = None, date_to: Optional[date] = None,
-                  categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """
-        Get papers from arXiv that match the criteria.
-        
-        Args:
-            topic: The topic of the papers.
-            query: The query for the papers.
-            max_results: The maximum number of results.
-            date_from: The start date for filtering papers (inclusive).
-            date_to: The end date for filtering papers (inclusive).
-            categories: List of arXiv categories to filter by.
-            
-        Returns:    
-            A list of paper information dictionaries.
-        """
-        papers = []
-        search_engine = arxiv.Search(
-            query=query,
+    # Search the local index only
+    if offline:
+        if store is None:
+            logging.error("Offline search needs a local paper store (--store)")
+            return
+        results = SearchIndex(store).search_topics(
+            keywords_dict,
             max_results=max_results,
-            sort_by=arxiv.SortCriterion.SubmittedDate
+            date_from=datetime.datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None,
+            date_to=datetime.datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None,
+            categories=categories
+        ).items()
+    else:
+        # Fetch papers for all topics
+        results = iter_fetch_papers(
+            keywords_dict,
+            max_results=max_results,
+            date_from=date_from,
+            date_to=date_to,
+            categories=categories,
+            max_workers=max_workers,
+            delay_seconds=delay_seconds,
+            topic_timeout=topic_timeout,
+            merged=merged,
+            store=store,
+            cache=cache,
+            date_slack_days=date_slack_days,
+            page_size=page_size,
+            fast_parser=fast_parser
         )
+    
+    # Count the papers into the analytics aggregates, saved once all topics are in
+    if analytics is not None:
+        results = analytics.track(results)
+    
+    # Mark papers against earlier runs, keeping each paper under one topic
+    if dedup is not None:
+        results = dedup.mark(results, new_only=new_only)
+    
+    # Rank all topics together: one embedding pass over the distinct papers,
+    # one matrix multiply and one write of the embedding cache
+    if semantic:
+        results = SemanticScorer(keywords_dict).rank_all(dict(results), min_score=min_score).items()
+    for topic, papers in results:
+        if papers:
+            yield topic, papers
+        else:
+            logging.info(f"No papers found for topic '{topic}'")
 
-        for result in search_engine.results():
-            update_time = result.updated.date()
-            
-            # Apply date filter if specified
-            if date_from and update_time < date_from:
-                continue
-            if date_to and update_time > date_to:
-                continue
-                
-            # Apply category filter if specified
-            primary_category = result.primary_category
-            if categories and primary_category not in categories:
-                continue
-                
-            paper_id = result.get_short_id()
-            paper_title = result.title
-            paper_summary = result.summary.replace("\n", " ")
-            
-            # Convert author objects to strings to ensure JSON serialization works
-            paper_first_author = self.get_authors(result.authors, first_author=True)
-            paper_authors = self.get_authors(result.authors)
-            
-            comments = result.comment
-            
-            logging.info(f"Found paper: {update_time} - {paper_title} - {paper_first_author} - {primary_category}")
-
-            paper_key = self.get_paper_key(paper_id)
-            paper_url = f"{self.arxiv_url}abs/{paper_key}"
 
-            try:
-                paper_info = self.format_paper_info(
-                    paper_key, update_time, paper_title, paper_first_author, 
-                    paper_authors, paper_url, comments, primary_category, paper_summary
-                )
-                
-                papers.append(paper_info)
-                
-            except Exception as e:
-                logging.error(f"Error processing paper {paper_key}: {e}")
-        
-        return papers
+def iter_paper_stream(config: dict, max_results: int = 50, 
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      categories: Optional[List[str]] = None,
+                      max_workers: int = DEFAULT_MAX_WORKERS, delay_seconds: Optional[float] = None,
+                      topic_timeout: Optional[float] = None,
+                      merged: bool = False, store: Optional[PaperStore] = None,
+                      offline: bool = False,
+                      cache: Optional[QueryCache] = None,
+                      date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                      page_size: int = DEFAULT_PAGE_SIZE,
+                      fast_parser: bool = False,
+                      semantic: bool = False, min_score: Optional[float] = None,
+                      dedup: Optional[Deduplicator] = None, new_only: bool = False,
+                      analytics: Optional[Analytics] = None,
+                      starts: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, Dict[str, Any], Optional[int]]]:
+    """
+    Yield every paper for a loaded configuration as soon as it is fetched.
     
-
-    def batch_papers(self, papers: List[Dict[str, Any]], batch_size: int = 5) -> List[List[Dict[str, Any]]]:
-        """
-        Split papers into batches for processing by LLM.
-        
-        Args:
-            papers: List of paper information dictionaries.
-            batch_size: The size of each batch.
-            
-        Returns:
-            A list of batches, where each batch is a list of paper dictionaries.
-        """
-        return [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+    Takes the same arguments as `iter_papers_by_config`. Plain live fetches
+    stream paper by paper in arXiv order, starting each topic at its result
+    index in `starts`; merged, offline, store-backed, semantically ranked,
+    deduplicated and analytics-tracked runs stream topic by topic from the
+    beginning.
+    
+    Yields:
+        (topic, paper, offset) tuples, where offset is the arXiv result index
+        to restart the topic from to get the paper again (None when the
+        papers do not come straight from a live arXiv query).
+    """
+    if merged or offline or store is not None or semantic or dedup is not None or analytics is not None:
+        for topic, papers in iter_papers_by_config(
+            config,
+            max_results=max_results,
+            date_from=date_from,
+            date_to=date_to,
+            categories=categories,
+            max_workers=max_workers,
+            delay_seconds=delay_seconds,
+            topic_timeout=topic_timeout,
+            merged=merged,
+            store=store,
+            offline=offline,
+            cache=cache,
+            date_slack_days=date_slack_days,
+            page_size=page_size,
+            fast_parser=fast_parser,
+            semantic=semantic,
+            min_score=min_score,
+            dedup=dedup,
+            new_only=new_only,
+            analytics=analytics
+        ):
+            for paper in papers:
+                yield topic, paper, None
+        return
+    
+    rate_limiter = RateLimiter(delay_seconds) if delay_seconds is not None else None
+    fetcher = ArxivPaperFetcher(rate_limiter=rate_limiter, cache=cache,
+                                date_slack_days=date_slack_days, page_size=page_size,
+                                fast_parser=fast_parser)
+    yield from iter_topic_papers(
+        fetcher,
+        config['kv'],
+        max_workers=max_workers,
+        topic_timeout=topic_timeout,
+        max_results=max_results,
+        date_from=datetime.datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None,
+        date_to=datetime.datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None,
+        categories=categories,
+        starts=starts,
+        offsets=True
+    )
 
 
 def fetch_papers_by_config(config_file: str, max_results: int = 50, 
                           date_from: Optional[str] = None, date_to: Optional[str] = None,
-                          categories: Optional[List[str]] = None, batch_size: int = 5) -> Dict[str, List[List[Dict[str, Any]]]]:
+                          categories: Optional[List[str]] = None, batch_size: int = 5,
+                          max_tokens: Optional[int] = None, tokenizer: str = "chars",
+                          mix_topics: bool = False,
+                          max_workers: int = DEFAULT_MAX_WORKERS, delay_seconds: Optional[float] = None,
+                          topic_timeout: Optional[float] = None,
+                          merged: bool = False, store: Optional[PaperStore] = None,
+                          offline: bool = False,
+                          cache: Optional[QueryCache] = None,
+                          date_slack_days: int = DEFAULT_DATE_SLACK_DAYS,
+                          page_size: int = DEFAULT_PAGE_SIZE,
+                          fast_parser: bool = False,
+                          semantic: bool = False, min_score: Optional[float] = None,
+                          dedup: Optional[Deduplicator] = None, new_only: bool = False,
+                          analytics: Optional[Analytics] = None) -> Dict[str, List[List[Dict[str, Any]]]]:
     """
     Fetch papers based on a configuration file.
     
@@ -236,6 +251,38 @@ def fetch_papers_by_config(config_file: str, max_results: int = 50,
         date_to: End date in 'YYYY-MM-DD' format.
         categories: List of arXiv categories to filter by.
         batch_size: Size of each batch for LLM processing.
+        max_tokens: Token budget of a batch; papers are bin-packed under it
+            instead of split into `batch_size` chunks.
+        tokenizer: Token counter used with `max_tokens`, see
+            `batching.get_token_counter`.
+        mix_topics: Pack the distinct papers of all topics together under
+            `MIXED_TOPICS_KEY`, each tagged with its "topics", so a paper
+            matched by several topics is processed once.
+        max_workers: Maximum number of topics fetched concurrently.
+        delay_seconds: Minimum delay between arXiv requests. Defaults to the
+            process-wide limiter honoring arXiv's politeness delay.
+        topic_timeout: Per-topic timeout in seconds.
+        merged: Fetch the union of all topics' filters once and classify
+            papers into topics locally.
+        store: Local paper store used for covered topics and updated with
+            fetched papers.
+        offline: Search only the store's full-text index instead of arXiv.
+        cache: Query cache consulted before every arXiv query.
+        date_slack_days: Also keep papers submitted up to this many days
+            before date_from if they were updated inside the window.
+        page_size: Number of results requested per arXiv API page.
+        fast_parser: Parse feeds with the streaming `atom_parser` instead of
+            the arxiv library.
+        semantic: Rank each topic's papers by embedding similarity to the
+            topic's filters, see `semantic.SemanticScorer`.
+        min_score: With `semantic`, drop papers scoring below this
+            similarity.
+        dedup: Marks papers "new", "revised" or "seen" relative to earlier
+            runs and keeps each paper under the first topic returning it.
+            The run's papers are remembered on `dedup.save()`.
+        new_only: With `dedup`, output only papers never seen before.
+        analytics: Aggregates updated with the fetched papers and saved
+            after the run, see `analytics.Analytics`.
         
     Returns:
         A dictionary mapping topics to batches of papers.
@@ -245,47 +292,65 @@ def fetch_papers_by_config(config_file: str, max_results: int = 50,
     if not config:
         return {}
     
-    # Parse date strings to date objects if provided
-    from_date = None
-    to_date = None
-    if date_from:
-        from_date = datetime.datetime.strptime(date_from, '%Y-%m-%d').date()
-    if date_to:
-        to_date = datetime.datetime.strptime(date_to, '%Y-%m-%d').date()
+    papers_by_topic = dict(iter_papers_by_config(
+        config,
+        max_results=max_results,
+        date_from=date_from,
+        date_to=date_to,
+        categories=categories,
+        max_workers=max_workers,
+        delay_seconds=delay_seconds,
+        topic_timeout=topic_timeout,
+        merged=merged,
+        store=store,
+        offline=offline,
+        cache=cache,
+        date_slack_days=date_slack_days,
+        page_size=page_size,
+        fast_parser=fast_parser,
+        semantic=semantic,
+        min_score=min_score,
+        dedup=dedup,
+        new_only=new_only,
+        analytics=analytics
+    ))
     
-    # Initialize paper fetcher
     fetcher = ArxivPaperFetcher()
+    count_tokens = get_token_counter(tokenizer)
+    
+    groups = {}
+    if mix_topics:
+        distinct = {}
+        for topic in config['keywords']:
+            for paper in papers_by_topic.get(topic) or []:
+                distinct.setdefault(paper["id"], {**paper, "topics": []})["topics"].append(topic)
+        if distinct:
+            groups[MIXED_TOPICS_KEY] = list(distinct.values())
+    else:
+        groups = {topic: papers_by_topic[topic] for topic in config['keywords'] if papers_by_topic.get(topic)}
     
-    # Fetch papers for each topic
     result = {}
-    for topic, query in config['kv'].items():
-        logging.info(f"Fetching papers for topic: {topic} with query: {query}")
-        papers = fetcher.get_papers(
-            topic=topic,
-            query=query,
-            max_results=max_results,
-            date_from=from_date,
-            date_to=to_date,
-            categories=categories
-        )
+    for topic, papers in groups.items():
+        # Split into batches
+        batches = fetcher.batch_papers(papers, batch_size, max_tokens=max_tokens, count_tokens=count_tokens)
+        result[topic] = batches
         
-        if papers:
-            # Sort papers by date (most recent first)
-            papers.sort(key=lambda x: x["update_date"], reverse=True)
-            
-            # Split into batches
-            batches = fetcher.batch_papers(papers, batch_size)
-            result[topic] = batches
-            
-            logging.info(f"Found {len(papers)} papers for topic '{topic}', split into {len(batches)} batches")
-        else:
-            logging.info(f"No papers found for topic '{topic}'")
+        logging.info(f"Found {len(papers)} papers for topic '{topic}', split into {len(batches)} batches")
+        if max_tokens:
+            for i, usage in enumerate(batch_utilization(batches, max_tokens, count_tokens)):
+                logging.info(f"Batch {i}: {usage['papers']} papers, {usage['tokens']} tokens "
+                             f"({usage['utilization']:.0%} of {max_tokens})")
     
     return result
 
 
-
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, 
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%m/%d/%Y %H:%M:%S',
+        )
+    
     parser = argparse.ArgumentParser(description="Fetch arXiv papers based on configuration")
     parser.add_argument('--config', type=str, default='config.yaml', help='Path to configuration file')
     parser.add_argument('--max_results', type=int, default=50, help='Maximum number of results per topic')
@@ -293,10 +358,111 @@ if __name__ == "__main__":
     parser.add_argument('--date_to', type=str, help='End date in YYYY-MM-DD format')
     parser.add_argument('--categories', type=str, nargs='+', help='arXiv categories to filter by')
     parser.add_argument('--batch_size', type=int, default=5, help='Size of each batch for LLM processing')
-    parser.add_argument('--output', type=str, help='Output file path for JSON results')
+    parser.add_argument('--max_tokens', type=int, help='Token budget per LLM batch; papers are bin-packed under it instead of split by --batch_size')
+    parser.add_argument('--tokenizer', type=str, default='chars', help=f'Token counter for --max_tokens: {" or ".join(TOKENIZERS)}[:encoding]')
+    parser.add_argument('--mix_topics', action='store_true', help='Batch the distinct papers of all topics together instead of per topic')
+    parser.add_argument('--output', type=str, help='Output file path for results')
+    parser.add_argument('--format', type=str, default='json', choices=EXPORT_FORMATS, help='Output format: nested JSON batches, or one record per distinct paper as compact JSONL, Parquet or Arrow')
+    parser.add_argument('--stream', action='store_true', help='Append each paper to the --output JSONL file (with topic and batch index) as soon as it is fetched')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted --stream output from its last checkpoint')
+    parser.add_argument('--checkpoint_every', type=int, default=DEFAULT_CHECKPOINT_EVERY, help='Number of papers between fsync checkpoints of a --stream output')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='Maximum number of topics fetched concurrently')
+    parser.add_argument('--delay', type=float, help='Minimum delay in seconds between arXiv requests (default: 3)')
+    parser.add_argument('--topic_timeout', type=float, help='Per-topic timeout in seconds')
+    parser.add_argument('--date_slack', type=int, default=DEFAULT_DATE_SLACK_DAYS, help='Also keep papers submitted up to this many days before date_from if updated inside the window')
+    parser.add_argument('--page_size', type=int, default=DEFAULT_PAGE_SIZE, help='Number of results requested per arXiv API page')
+    parser.add_argument('--fast_parser', action='store_true', help='Parse arXiv feeds with the streaming Atom parser')
+    parser.add_argument('--metrics', action='store_true', help='Time every stage (requests, parsing, sorting...) and log a summary at exit')
+    parser.add_argument('--log_papers', type=float, default=0.0, metavar='RATE', help='Log a "Found paper" line for this fraction (0 to 1) of fetched papers')
+    parser.add_argument('--semantic', action='store_true', help='Rank papers by embedding similarity to their topic (requires numpy)')
+    parser.add_argument('--min_score', type=float, help='With --semantic, drop papers scoring below this similarity')
+    parser.add_argument('--summarize', action='store_true', help='Summarize every batch with an LLM and add a "summary" to each paper')
+    parser.add_argument('--llm_url', type=str, default=DEFAULT_LLM_URL, help='Base URL of an OpenAI-compatible API used by --summarize')
+    parser.add_argument('--llm_model', type=str, default=DEFAULT_LLM_MODEL, help='Model used by --summarize')
+    parser.add_argument('--llm_concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY, help='Maximum number of concurrent LLM requests')
+    parser.add_argument('--llm_mock', action='store_true', help='Summarize with an offline mock backend instead of calling an LLM')
+    parser.add_argument('--llm_requests', type=str, help='Also write the LLM batch requests sent to this JSONL file')
+    parser.add_argument('--summary_cache', type=str, default=DEFAULT_SUMMARY_CACHE, help='SQLite cache of summaries by paper id and prompt, shared with app.py')
+    parser.add_argument('--dedup', action='store_true', help='Mark papers new, revised or seen relative to earlier runs and list each paper under one topic only')
+    parser.add_argument('--new_only', action='store_true', help='Output only papers not seen in earlier runs (implies --dedup)')
+    parser.add_argument('--seen_file', type=str, default=DEFAULT_SEEN_FILE, help='File remembering the papers of earlier --dedup runs')
+    parser.add_argument('--analytics', action='store_true', help='Add the fetched papers to the per-topic statistics shown at /analytics')
+    parser.add_argument('--analytics_file', type=str, default=DEFAULT_ANALYTICS_FILE, help='File of the --analytics statistics, shared with app.py')
+    parser.add_argument('--merged', action='store_true', help='Fetch all topics with merged queries and classify papers locally')
+    parser.add_argument('--store', type=str, help='Path to a local SQLite paper store to read from and update')
+    parser.add_argument('--cache_dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory of the query cache shared with app.py')
+    parser.add_argument('--cache_ttl', type=float, default=DEFAULT_CACHE_TTL, help='Seconds a cached query stays valid')
+    parser.add_argument('--no_cache', action='store_true', help='Always query arXiv, bypassing the query cache')
+    parser.add_argument('--offline', action='store_true', help='Search only the local paper store (requires --store)')
+    parser.add_argument('--sync', action='store_true', help='Incrementally sync the paper store with arXiv and exit')
+    parser.add_argument('--sync_days', type=int, default=DEFAULT_SYNC_DAYS, help='Days fetched on the first sync of a topic')
+    parser.add_argument('--sync_max_results', type=int, default=DEFAULT_SYNC_MAX_RESULTS, help='Maximum number of papers synced per topic')
+    parser.add_argument('--backfill', action='store_true', help='Harvest --date_from to --date_to through OAI-PMH into the paper store and exit')
+    parser.add_argument('--oai_set', type=str, default=DEFAULT_OAI_SET, help='OAI-PMH set harvested by --backfill, e.g. cs or physics:hep-th')
+    parser.add_argument('--slice_days', type=int, default=DEFAULT_SLICE_DAYS, help='Days per date slice harvested by one --backfill worker')
+    parser.add_argument('--backfill_workers', type=int, default=DEFAULT_BACKFILL_WORKERS, help='Maximum number of date slices harvested concurrently')
+    parser.add_argument('--backfill_checkpoint', type=str, default=DEFAULT_CHECKPOINT_FILE, help='Checkpoint file used to resume an interrupted --backfill')
+    parser.add_argument('--snapshot', nargs='*', metavar='CONFIG', help='Build digest snapshots of these config files (default: --config) and exit, e.g. from a daily cron job')
+    parser.add_argument('--snapshot_days', type=int, nargs='+', default=[DEFAULT_SNAPSHOT_DAYS], help='Date windows (days back from today) to build a snapshot for')
+    parser.add_argument('--snapshot_dir', type=str, default=DEFAULT_SNAPSHOT_DIR, help='Directory of the versioned snapshots served by app.py')
+    parser.add_argument('--profiles', type=str, metavar='DIR', help='Fetch every profile (config YAML) in this directory with shared queries, write one output per profile and exit')
+    parser.add_argument('--profiles_output', type=str, default=DEFAULT_PROFILES_OUTPUT, help='Directory of the per-profile outputs of --profiles')
+    parser.add_argument('--profile_workers', type=int, default=DEFAULT_PROFILE_WORKERS, help='Number of threads writing --profiles outputs while later profile groups are fetched')
+    parser.add_argument('--snapshot_keep', type=int, default=DEFAULT_SNAPSHOT_KEEP, help='Number of versions kept per snapshot')
     
     args = parser.parse_args()
     
+    if args.log_papers:
+        set_paper_log_sample(args.log_papers)
+    if args.metrics:
+        metrics.enable()
+        atexit.register(lambda: logging.info(f"Timing summary:\n{metrics.summary()}"))
+    
+    store = PaperStore(args.store) if args.store else None
+    cache = None if args.no_cache else QueryCache(ttl=args.cache_ttl, path=args.cache_dir)
+    
+    # Incremental sync of the local store
+    if args.sync:
+        if store is None:
+            store = PaperStore()
+        config = load_config(args.config)
+        rate_limiter = RateLimiter(args.delay) if args.delay is not None else None
+        counts = sync_store(
+            store,
+            config.get('kv', {}),
+            fetcher=ArxivPaperFetcher(rate_limiter=rate_limiter),
+            date_to=datetime.datetime.strptime(args.date_to, '%Y-%m-%d').date() if args.date_to else None,
+            days=args.sync_days,
+            max_results=args.sync_max_results,
+            max_workers=args.workers
+        )
+        for topic, count in counts.items():
+            logging.info(f"Topic: {topic} - {count} papers synced into {store.path}")
+        raise SystemExit(0)
+    
+    # Bulk harvest of a date range into the local store
+    if args.backfill:
+        if not args.date_from:
+            parser.error("--backfill requires --date_from")
+        if store is None:
+            store = PaperStore()
+        config = load_config(args.config)
+        rate_limiter = RateLimiter(args.delay) if args.delay is not None else None
+        counts = backfill(
+            store,
+            {k: v['filters'] for k, v in config['keywords'].items()},
+            date_from=datetime.datetime.strptime(args.date_from, '%Y-%m-%d').date(),
+            date_to=datetime.datetime.strptime(args.date_to, '%Y-%m-%d').date() if args.date_to else date.today(),
+            harvester=OaiHarvester(set_spec=args.oai_set, rate_limiter=rate_limiter),
+            categories=args.categories,
+            slice_days=args.slice_days,
+            max_workers=args.backfill_workers,
+            checkpoint_file=args.backfill_checkpoint
+        )
+        for topic, count in counts.items():
+            logging.info(f"Topic: {topic} - {count} papers backfilled into {store.path}")
+        raise SystemExit(0)
+    
     # Set default date_to to today if not specified
     if not args.date_to:
         args.date_to = datetime.date.today().strftime('%Y-%m-%d')
@@ -308,23 +474,138 @@ if __name__ == "__main__":
     
     logging.info(f"Fetching papers from {args.date_from} to {args.date_to}")
     
-    # Fetch papers
-    results = fetch_papers_by_config(
-        config_file=args.config,
+    dedup = Deduplicator(args.seen_file) if args.dedup or args.new_only else None
+    
+    fetch_args = dict(
         max_results=args.max_results,
         date_from=args.date_from,
         date_to=args.date_to,
         categories=args.categories,
-        batch_size=args.batch_size
+        max_workers=args.workers,
+        delay_seconds=args.delay,
+        topic_timeout=args.topic_timeout,
+        merged=args.merged,
+        store=store,
+        offline=args.offline,
+        cache=cache,
+        date_slack_days=args.date_slack,
+        page_size=args.page_size,
+        fast_parser=args.fast_parser,
+        semantic=args.semantic,
+        min_score=args.min_score,
+        dedup=dedup,
+        new_only=args.new_only,
+        analytics=Analytics(args.analytics_file) if args.analytics else None
+    )
+    
+    # Many users' profiles at once, each distinct query fetched once per window
+    if args.profiles:
+        profiles = load_profiles(args.profiles)
+        if not profiles:
+            parser.error(f"No profiles found in {args.profiles}")
+        run_profiles(
+            profiles,
+            output_dir=args.profiles_output,
+            max_results=args.max_results,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            categories=args.categories,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+            profile_workers=args.profile_workers,
+            delay_seconds=args.delay,
+            topic_timeout=args.topic_timeout,
+            cache=cache,
+            date_slack_days=args.date_slack,
+            page_size=args.page_size,
+            fast_parser=args.fast_parser
+        )
+        raise SystemExit(0)
+    
+    # Precompute digests for the web app
+    if args.snapshot is not None:
+        snapshots = SnapshotStore(args.snapshot_dir, keep=args.snapshot_keep)
+        for config_file in args.snapshot or [args.config]:
+            config = load_config(config_file)
+            if not config:
+                continue
+            for days in args.snapshot_days:
+                window = dict(
+                    date_from=(datetime.date.today() - timedelta(days=days)).strftime('%Y-%m-%d'),
+                    date_to=datetime.date.today().strftime('%Y-%m-%d')
+                )
+                results = dict(iter_papers_by_config(config, **{**fetch_args, **window}))
+                snapshots.write(snapshot_name(config_file, days), results, config_file=config_file, **window)
+        if dedup is not None:
+            dedup.save()
+        raise SystemExit(0)
+    
+    # Stream papers to disk as they arrive, keeping memory flat
+    if args.stream:
+        if not args.output:
+            parser.error("--stream requires --output")
+        with JsonlStreamWriter(args.output, batch_size=args.batch_size,
+                               checkpoint_every=args.checkpoint_every, resume=args.resume) as writer:
+            for topic, paper, offset in iter_paper_stream(load_config(args.config),
+                                                          starts=writer.resume_points(), **fetch_args):
+                writer.write(topic, paper, offset)
+        if dedup is not None:
+            dedup.save()
+        for topic, count in writer.counts.items():
+            logging.info(f"Topic: {topic} - {count} papers streamed to {args.output}")
+        raise SystemExit(0)
+    
+    # Compact formats keep each distinct paper once, converted as topics arrive
+    if args.output and args.format != 'json':
+        collection = PaperCollection()
+        for topic, papers in iter_papers_by_config(load_config(args.config), **fetch_args):
+            collection.add_topic(topic, papers)
+            logging.info(f"Topic: {topic} - {len(papers)} papers")
+        export_collection(collection, args.output, args.format)
+        if dedup is not None:
+            dedup.save()
+        raise SystemExit(0)
+    
+    # Fetch papers
+    results = fetch_papers_by_config(
+        config_file=args.config,
+        batch_size=args.batch_size,
+        max_tokens=args.max_tokens,
+        tokenizer=args.tokenizer,
+        mix_topics=args.mix_topics,
+        **fetch_args
     )
     
+    # Summarize the batches, reusing cached summaries
+    if args.summarize:
+        summarizer = Summarizer(
+            backend=MockBackend() if args.llm_mock else OpenAIChatBackend(args.llm_url),
+            cache=SummaryCache(args.summary_cache),
+            model=args.llm_model,
+            max_concurrency=args.llm_concurrency
+        )
+        summarizer.summarize_results(results, requests_file=args.llm_requests)
+    
     # Save results to file if output path is specified
     if args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         logging.info(f"Results saved to {args.output}")
     
+    # Remember this run's papers only once its output is written
+    if dedup is not None:
+        dedup.save()
+    
     # Print summary
     for topic, batches in results.items():
         total_papers = sum(len(batch) for batch in batches)
-        logging.info(f"Topic: {topic} - {total_papers} papers in {len(batches)} batches")
\ No newline at end of file
+        logging.info(f"Topic: {topic} - {total_papers} papers in {len(batches)} batches")
+    
+    if cache is not None:
+        stats = cache.stats()
+        logging.info(f"Query cache: {stats['hits']} hits, {stats['misses']} misses")
+    http_stats = get_default_session().http_stats.to_dict()
+    if http_stats['requests']:
+        unsized = f" (+{http_stats['unsized_responses']} responses of unknown size)" if http_stats['unsized_responses'] else ""
+        logging.info(f"arXiv API: {http_stats['requests']} requests, {http_stats['bytes']} bytes on the wire{unsized}, "
+                     f"{http_stats['avg_latency']:.2f}s average latency")
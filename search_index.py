@@ -0,0 +1,162 @@
+import re
+import logging
+from contextlib import closing
+from typing import List, Optional, Dict, Any
+from datetime import date
+
+from arxiv_fetcher import parse_filter_list
+from paper_store import PaperStore
+
+# External-content FTS5 index over the store's papers table. The triggers keep
+# it in step with PaperStore.add_papers (REPLACE fires the delete trigger
+# because the store enables recursive_triggers).
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, comments,
+    content='papers', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, abstract, comments)
+    VALUES (new.rowid, new.title, new.abstract, new.comments);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract, comments)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.comments);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, abstract, comments)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.comments);
+    INSERT INTO papers_fts (rowid, title, abstract, comments)
+    VALUES (new.rowid, new.title, new.abstract, new.comments);
+END;
+"""
+
+# BM25 column weights for title, abstract and comments
+BM25_WEIGHTS = (10.0, 1.0, 0.5)
+
+OPERATORS = {"OR": "OR", "AND": "AND", "ANDNOT": "NOT", "NOT": "NOT"}
+
+
+def to_match_expression(query: str) -> str:
+    """
+    Translate an arXiv-style filter expression into an FTS5 MATCH expression.
+
+    Quoted phrases and bare terms become FTS5 phrases, so terms such as
+    `Fine-tuning` or `GPT-4` need no escaping; OR/AND/ANDNOT are kept as
+    operators.
+
+    Args:
+        query: Expression as produced by `parse_filter_list`.
+
+    Returns:
+        The FTS5 MATCH expression.
+    """
+    parts = []
+    for token in re.findall(r'"[^"]*"|[()]|[^\s()"]+', query):
+        if token in OPERATORS:
+            parts.append(OPERATORS[token])
+        elif token in "()":
+            parts.append(token)
+        else:
+            phrase = token.strip('"').strip()
+            if phrase:
+                parts.append('"' + phrase.replace('"', '""') + '"')
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """
+    BM25-ranked full-text search over the papers held in a PaperStore.
+
+    Searches only see papers already in the store, so they need no network
+    access at all.
+    """
+
+    def __init__(self, store: PaperStore):
+        self.store = store
+        with closing(store._connect()) as conn, conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'"
+            ).fetchone()
+            conn.executescript(FTS_SCHEMA)
+        if not exists:
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the index from the papers table."""
+        with closing(self.store._connect()) as conn, conn:
+            conn.execute("INSERT INTO papers_fts (papers_fts) VALUES ('rebuild')")
+        logging.info(f"Rebuilt full-text index of {self.store.path}")
+
+    def search(self, match: str, max_results: int = 50,
+               date_from: Optional[date] = None, date_to: Optional[date] = None,
+               categories: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search the index, best BM25 matches first, latest version only.
+
+        Args:
+            match: FTS5 MATCH expression, see `to_match_expression`.
+            max_results: The maximum number of results.
+            date_from: The start date for filtering papers (inclusive).
+            date_to: The end date for filtering papers (inclusive).
+            categories: List of arXiv categories to filter by.
+
+        Returns:
+            A list of paper information dictionaries with an added "score"
+            (higher is better).
+        """
+        if not match:
+            return []
+        sql = [
+            f"SELECT p.*, -bm25(papers_fts, {', '.join(map(str, BM25_WEIGHTS))}) AS score",
+            "FROM papers_fts JOIN papers p ON p.rowid = papers_fts.rowid",
+            "WHERE papers_fts MATCH ?",
+            "AND p.version = (SELECT MAX(version) FROM papers WHERE id = p.id)",
+        ]
+        params = [match]
+        if date_from:
+            sql.append("AND p.update_date >= ?")
+            params.append(date_from.isoformat())
+        if date_to:
+            sql.append("AND p.update_date <= ?")
+            params.append(date_to.isoformat())
+        if categories:
+            sql.append(f"AND p.category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        sql.append("ORDER BY score DESC LIMIT ?")
+        params.append(max_results)
+
+        with closing(self.store._connect()) as conn:
+            rows = conn.execute(" ".join(sql), params).fetchall()
+        return [dict(row) for row in rows]
+
+    def search_topics(self, keywords_dict: Dict[str, List[str]], max_results: int = 50,
+                      date_from: Optional[date] = None, date_to: Optional[date] = None,
+                      categories: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search every topic's filter terms against the index.
+
+        Args:
+            keywords_dict: Dictionary mapping topics to lists of filter terms.
+            max_results: Maximum number of results per topic.
+            date_from: The start date for filtering papers (inclusive).
+            date_to: The end date for filtering papers (inclusive).
+            categories: List of arXiv categories to filter by.
+
+        Returns:
+            A dictionary mapping topics to lists of paper dictionaries,
+            ranked by BM25 score. Topics without matches are left out.
+        """
+        result = {}
+        for topic, filters in keywords_dict.items():
+            papers = self.search(
+                to_match_expression(parse_filter_list(filters)), max_results=max_results,
+                date_from=date_from, date_to=date_to, categories=categories
+            )
+            if papers:
+                result[topic] = papers
+                logging.info(f"Found {len(papers)} indexed papers for topic '{topic}'")
+            else:
+                logging.info(f"No indexed papers found for topic '{topic}'")
+        return result
@@ -0,0 +1,266 @@
+import io
+import os
+import re
+import zlib
+import logging
+import threading
+import importlib.util
+from typing import List, Optional, Dict, Any
+
+# numpy (optional) takes longer to import than the rest of the CLI, so it is
+# only imported by `require_numpy()` once semantic ranking is used
+np = None
+
+DEFAULT_EMBEDDING_DIR = '.embedding_cache'
+DEFAULT_HASH_FEATURES = 1024
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by can for from has have in is it its of on or our that the their this
+to we which with via using based towards toward into than these those such not also both
+""".split())
+
+
+def numpy_available() -> bool:
+    """Whether numpy can be imported, without importing it."""
+    return np is not None or importlib.util.find_spec("numpy") is not None
+
+
+def require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Semantic ranking requires numpy, run `pip install numpy`")
+        np = numpy
+
+
+class HashingVectorizer:
+    """
+    Stateless bag-of-words embedding using the hashing trick.
+
+    Unigrams and bigrams are hashed into `n_features` signed buckets with
+    sublinear term frequencies, and every vector is L2-normalized, so dot
+    products are cosine similarities. No model or vocabulary is needed.
+    """
+
+    def __init__(self, n_features: int = DEFAULT_HASH_FEATURES):
+        self.n_features = n_features
+        self.name = f"hashing-{n_features}"
+
+    def tokens(self, text: str) -> List[str]:
+        words = [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def transform(self, texts: List[str]):
+        """Embed texts into an (n_texts, n_features) float32 matrix."""
+        require_numpy()
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for token in self.tokens(text):
+                h = zlib.crc32(token.encode('utf-8'))
+                index = (h >> 1) % self.n_features
+                counts[index] = counts.get(index, 0.0) + (1.0 if h & 1 else -1.0)
+            if counts:
+                indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+                values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+                matrix[row, indices] = np.sign(values) * np.log1p(np.abs(values))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerVectorizer:
+    """Embed texts with a local sentence-transformers model on the CPU."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        require_numpy()
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = "st-" + model_name.replace("/", "_")
+
+    def transform(self, texts: List[str]):
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def paper_text(paper: Dict[str, Any]) -> str:
+    return f"{paper['title']}. {paper.get('abstract', '')}"
+
+
+def paper_embedding_key(paper: Dict[str, Any]) -> str:
+    # A revision may change the abstract, so embeddings are kept per version
+    return f"{paper['id']}v{paper.get('version', 1)}"
+
+
+class EmbeddingCache:
+    """
+    On-disk paper embeddings of one vectorizer, keyed by paper id and version.
+
+    All vectors are kept in a single .npz file (as float16) that is loaded
+    once and rewritten atomically whenever new papers have been embedded,
+    or only on `flush()` for embeddings made with `save=False`.
+    """
+
+    def __init__(self, vectorizer, path: str = DEFAULT_EMBEDDING_DIR):
+        require_numpy()
+        self.vectorizer = vectorizer
+        self.file = os.path.join(path, f"{vectorizer.name}.npz") if path else None
+        self._index: Dict[str, int] = {}
+        self._vectors = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.file and os.path.exists(self.file):
+            try:
+                with np.load(self.file) as data:
+                    self._vectors = data["vectors"]
+                    self._index = {key: row for row, key in enumerate(data["keys"].tolist())}
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Ignoring unreadable embedding cache {self.file}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def embed(self, papers: List[Dict[str, Any]], save: bool = True):
+        """
+        Return the (n_papers, dim) float32 embedding matrix of papers.
+
+        Only papers missing from the cache are passed to the vectorizer.
+        With `save=False` new embeddings are written by the next `flush()`
+        instead of right away.
+        """
+        keys = [paper_embedding_key(p) for p in papers]
+        with self._lock:
+            missing = {}
+            for key, paper in zip(keys, papers):
+                if key not in self._index and key not in missing:
+                    missing[key] = paper
+            if missing:
+                vectors = self.vectorizer.transform([paper_text(p) for p in missing.values()])
+                vectors = vectors.astype(np.float16)
+                start = len(self._index)
+                for offset, key in enumerate(missing):
+                    self._index[key] = start + offset
+                self._vectors = vectors if self._vectors is None else np.concatenate([self._vectors, vectors])
+                self._dirty = True
+            if self._dirty and save:
+                self._save()
+            if not keys:
+                return np.zeros((0, 0), dtype=np.float32)
+            rows = np.fromiter((self._index[key] for key in keys), dtype=np.int64, count=len(keys))
+            return self._vectors[rows].astype(np.float32)
+
+    def flush(self):
+        """Write embeddings added since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        self._dirty = False
+        if not self.file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.file) or ".", exist_ok=True)
+            buffer = io.BytesIO()
+            np.savez(buffer, keys=np.array(list(self._index), dtype=str), vectors=self._vectors)
+            tmp = f"{self.file}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp, self.file)
+        except OSError as e:
+            self._dirty = True
+            logging.warning(f"Failed to write embedding cache {self.file}: {e}")
+
+
+class SemanticScorer:
+    """
+    Score papers against topics by embedding similarity.
+
+    Each topic is represented by the normalized centroid of its embedded
+    filter terms; the scores of all papers against all topics are one
+    matrix multiply of paper embeddings with the topic centroids (see
+    `rank_all`). `rank` scores a single topic's papers against its own
+    centroid only, for results that arrive one topic at a time.
+    """
+
+    def __init__(self, keywords_dict: Dict[str, List[str]], vectorizer=None,
+                 cache_dir: Optional[str] = DEFAULT_EMBEDDING_DIR,
+                 cache: Optional[EmbeddingCache] = None):
+        require_numpy()
+        # A shared cache (e.g. one per web process) brings its own vectorizer
+        self.cache = cache or EmbeddingCache(vectorizer or HashingVectorizer(), cache_dir)
+        self.vectorizer = self.cache.vectorizer
+        self.topics = list(keywords_dict)
+        centroids = []
+        for topic in self.topics:
+            terms = [f for f in keywords_dict[topic] if f.strip()] or [topic]
+            centroid = self.vectorizer.transform(terms).mean(axis=0)
+            centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+        self.centroids = np.vstack(centroids).astype(np.float32) if centroids else None
+
+    def score_matrix(self, papers: List[Dict[str, Any]]):
+        """Return the (n_papers, n_topics) cosine similarity matrix."""
+        if not papers or self.centroids is None:
+            return np.zeros((len(papers), len(self.topics)), dtype=np.float32)
+        return self.cache.embed(papers) @ self.centroids.T
+
+    def rank(self, topic: str, papers: List[Dict[str, Any]],
+             min_score: Optional[float] = None, save: bool = True) -> List[Dict[str, Any]]:
+        """
+        Add a "score" to a topic's papers and sort them by it, best first.
+
+        Args:
+            topic: The topic the papers were fetched for.
+            papers: List of paper dictionaries.
+            min_score: Drop papers scoring below this similarity.
+            save: Write new embeddings to the cache file right away, see
+                `EmbeddingCache.embed`.
+
+        Returns:
+            The ranked papers.
+        """
+        if not papers or topic not in self.topics:
+            scores = [0.0] * len(papers)
+        else:
+            scores = self.cache.embed(papers, save=save) @ self.centroids[self.topics.index(topic)]
+        return self._sorted(papers, scores, min_score)
+
+    @staticmethod
+    def _sorted(papers: List[Dict[str, Any]], scores, min_score: Optional[float]) -> List[Dict[str, Any]]:
+        scored = []
+        for paper, score in zip(papers, scores):
+            score = float(score)
+            if min_score is not None and score < min_score:
+                continue
+            scored.append({**paper, "score": round(score, 4)})
+        scored.sort(key=lambda p: p["score"], reverse=True)
+        return scored
+
+    def rank_all(self, results: Dict[str, List[Dict[str, Any]]],
+                 min_score: Optional[float] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Rank every topic's papers with one scoring pass over distinct papers.
+
+        Args:
+            results: Dictionary mapping topics to lists of paper dictionaries.
+            min_score: Drop papers scoring below this similarity.
+
+        Returns:
+            A dictionary mapping topics to ranked papers.
+        """
+        distinct = {}
+        for papers in results.values():
+            for paper in papers:
+                distinct.setdefault(paper_embedding_key(paper), paper)
+        rows = {key: row for row, key in enumerate(distinct)}
+        scores = self.score_matrix(list(distinct.values()))
+
+        ranked = {}
+        for topic, papers in results.items():
+            column = self.topics.index(topic) if topic in self.topics else None
+            topic_scores = ([scores[rows[paper_embedding_key(paper)], column] for paper in papers]
+                            if column is not None else [0.0] * len(papers))
+            ranked[topic] = self._sorted(papers, topic_scores, min_score)
+        return ranked
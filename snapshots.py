@@ -0,0 +1,157 @@
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import logging
+from typing import List, Optional, Dict, Any
+
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+DEFAULT_SNAPSHOT_DAYS = 7
+# Versions kept per snapshot; older artifacts are deleted after a build
+DEFAULT_SNAPSHOT_KEEP = 7
+
+SNAPSHOT_FORMATS = ("json", "html")
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+_template_env = None
+
+
+def snapshot_name(config_file: str, days: int = DEFAULT_SNAPSHOT_DAYS) -> str:
+    """Name of the snapshot of a config file and a date window, e.g. "config-7d"."""
+    stem = os.path.splitext(os.path.basename(config_file))[0]
+    return f"{re.sub(r'[^A-Za-z0-9_-]+', '-', stem).strip('-') or 'config'}-{days}d"
+
+
+def render_snapshot_html(snapshot: Dict[str, Any]) -> str:
+    """Render a snapshot as a standalone HTML digest."""
+    global _template_env
+    if _template_env is None:
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+        _template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
+                                    autoescape=select_autoescape(['html']))
+    return _template_env.get_template('snapshot.html').render(**snapshot)
+
+
+class SnapshotStore:
+    """
+    Versioned, gzip-compressed digest snapshots on disk.
+
+    Every build writes `<name>/<version>.json.gz` and `<name>/<version>.html.gz`
+    and then points `<name>/latest.json` at them, so readers never see a
+    half-written snapshot.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_DIR, keep: int = DEFAULT_SNAPSHOT_KEEP):
+        self.path = path
+        self.keep = keep
+
+    def _write_atomic(self, file: str, data: bytes):
+        tmp = f"{file}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, file)
+
+    def write(self, name: str, results: Dict[str, List[Dict[str, Any]]], config_file: str,
+              date_from: str, date_to: str) -> Dict[str, Any]:
+        """
+        Write a new version of a snapshot and make it the latest.
+
+        Args:
+            name: The snapshot name, see `snapshot_name`.
+            results: Dictionary mapping topics to lists of paper dictionaries.
+            config_file: The configuration the snapshot was built from.
+            date_from: Start date in 'YYYY-MM-DD' format.
+            date_to: End date in 'YYYY-MM-DD' format.
+
+        Returns:
+            The snapshot's new manifest.
+        """
+        directory = os.path.join(self.path, name)
+        os.makedirs(directory, exist_ok=True)
+        built = time.time()
+        version = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(built))
+        snapshot = {
+            "name": name,
+            "config": config_file,
+            "date_from": date_from,
+            "date_to": date_to,
+            "built": time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(built)),
+            "results": results,
+        }
+        contents = {
+            "json": json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+            "html": render_snapshot_html(snapshot).encode('utf-8'),
+        }
+
+        manifest = {
+            "name": name,
+            "version": version,
+            "built": built,
+            "config": config_file,
+            "date_from": date_from,
+            "date_to": date_to,
+            "papers": sum(len(papers) for papers in results.values()),
+            "files": {},
+        }
+        for fmt, content in contents.items():
+            file = f"{version}.{fmt}.gz"
+            # mtime=0 keeps the compressed bytes a function of the content
+            data = gzip.compress(content, compresslevel=9, mtime=0)
+            self._write_atomic(os.path.join(directory, file), data)
+            manifest["files"][fmt] = {
+                "file": file,
+                "etag": hashlib.sha1(content).hexdigest()[:20],
+                "size": len(content),
+                "gzip_size": len(data),
+            }
+        self._write_atomic(os.path.join(directory, "latest.json"), json.dumps(manifest, indent=2).encode('utf-8'))
+        self._prune(directory)
+        logging.info(f"Snapshot {name} version {version}: {manifest['papers']} papers, "
+                     f"{manifest['files']['html']['gzip_size']} bytes of gzipped HTML")
+        return manifest
+
+    def _prune(self, directory: str):
+        versions = sorted({f.split(".", 1)[0] for f in os.listdir(directory) if f.endswith(".gz")})
+        for version in versions[:-self.keep] if self.keep else []:
+            for fmt in SNAPSHOT_FORMATS:
+                file = os.path.join(directory, f"{version}.{fmt}.gz")
+                if os.path.exists(file):
+                    os.remove(file)
+
+    def latest(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest of a snapshot's latest version, or None."""
+        try:
+            with open(os.path.join(self.path, name, "latest.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read(self, name: str, fmt: str = "html") -> Optional[Dict[str, Any]]:
+        """
+        Read the latest version of a snapshot in one format.
+
+        Returns:
+            The format's manifest entry with the gzipped artifact under
+            "data" and the build time under "built", or None if the
+            snapshot does not exist.
+        """
+        manifest = self.latest(name)
+        if manifest is None or fmt not in manifest["files"]:
+            return None
+        entry = manifest["files"][fmt]
+        try:
+            with open(os.path.join(self.path, name, entry["file"]), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        return {**entry, "data": data, "built": manifest["built"]}
+
+    def names(self) -> List[str]:
+        """Names of all snapshots with a latest version."""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path)
+                      if os.path.exists(os.path.join(self.path, name, "latest.json")))
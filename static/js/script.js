@@ -18,30 +18,153 @@ document.addEventListener('DOMContentLoaded', function() {
     });
     
     // Add animation to cards when they come into view
-    const animateOnScroll = function() {
-        const cards = document.querySelectorAll('.card');
-        
-        cards.forEach(card => {
-            const cardPosition = card.getBoundingClientRect();
-            
-            // Check if card is in viewport
-            if(cardPosition.top < window.innerHeight && cardPosition.bottom > 0) {
-                card.style.opacity = '1';
-                card.style.transform = 'translateY(0)';
+    const cardObserver = 'IntersectionObserver' in window ? new IntersectionObserver(function(entries, observer) {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add('in-view');
+                observer.unobserve(entry.target);
+            }
+        });
+    }) : null;
+    
+    const observeCards = function(root) {
+        root.querySelectorAll('.card').forEach(card => {
+            if (cardObserver) {
+                card.classList.add('reveal');
+                cardObserver.observe(card);
             }
         });
     };
     
-    // Set initial state for cards
-    document.querySelectorAll('.card').forEach(card => {
-        card.style.opacity = '0';
-        card.style.transform = 'translateY(20px)';
-        card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
-    });
+    observeCards(document);
     
-    // Run animation on page load and scroll
-    animateOnScroll();
-    window.addEventListener('scroll', animateOnScroll);
+    // Paginated results: later pages and full abstracts are loaded on demand
+    const results = document.getElementById('results');
+    if (results) {
+        let sortKey = 'score';
+        
+        const loadPage = function(list, page, replace) {
+            if (list.dataset.loading === 'true') {
+                return Promise.resolve();
+            }
+            list.dataset.loading = 'true';
+            const params = new URLSearchParams({topic: list.dataset.topic, page: page, sort: sortKey});
+            return fetch(results.dataset.pageUrl + '?' + params)
+                .then(response => response.json().then(data => {
+                    if (!response.ok) {
+                        throw new Error(data.message);
+                    }
+                    return data;
+                }))
+                .then(data => {
+                    if (replace) {
+                        list.innerHTML = '';
+                    }
+                    const container = document.createElement('div');
+                    container.innerHTML = data.html;
+                    observeCards(container);
+                    list.append(...container.children);
+                    list.dataset.page = data.page;
+                    list.dataset.hasMore = data.has_more;
+                    updateSentinel(list);
+                })
+                .catch(error => {
+                    const sentinel = list.nextElementSibling;
+                    if (sentinel && sentinel.classList.contains('page-sentinel')) {
+                        sentinel.textContent = error.message;
+                    }
+                })
+                .finally(() => {
+                    list.dataset.loading = 'false';
+                });
+        };
+        
+        // Load the next page once the end of a topic's list comes into view
+        const pageObserver = 'IntersectionObserver' in window ? new IntersectionObserver(function(entries) {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    const list = entry.target.previousElementSibling;
+                    loadPage(list, parseInt(list.dataset.page, 10) + 1, false);
+                }
+            });
+        }, {rootMargin: '400px'}) : null;
+        
+        const updateSentinel = function(list) {
+            let sentinel = list.nextElementSibling;
+            const hasSentinel = sentinel && sentinel.classList.contains('page-sentinel');
+            if (list.dataset.hasMore !== 'true') {
+                if (hasSentinel) {
+                    if (pageObserver) {
+                        pageObserver.unobserve(sentinel);
+                    }
+                    sentinel.remove();
+                }
+                return;
+            }
+            if (!hasSentinel) {
+                sentinel = document.createElement('div');
+                sentinel.className = 'page-sentinel text-center text-muted small mb-5';
+                sentinel.textContent = 'Loading more papers...';
+                list.after(sentinel);
+            }
+            if (pageObserver) {
+                // Re-observing fires again if the sentinel is still in view
+                pageObserver.unobserve(sentinel);
+                pageObserver.observe(sentinel);
+            } else {
+                sentinel.innerHTML = '<button type="button" class="btn btn-outline-primary btn-sm">Load more</button>';
+            }
+        };
+        
+        results.querySelectorAll('.paper-list').forEach(updateSentinel);
+        
+        results.addEventListener('click', function(event) {
+            // Without IntersectionObserver, pages load with a button
+            const more = event.target.closest('.page-sentinel button');
+            if (more) {
+                const list = more.closest('.page-sentinel').previousElementSibling;
+                loadPage(list, parseInt(list.dataset.page, 10) + 1, false);
+                return;
+            }
+            
+            // Toggle abstract expansion, fetching the full abstract the first time
+            const button = event.target.closest('.expand-btn');
+            if (!button) {
+                return;
+            }
+            const card = button.closest('.col');
+            const abstract = card.querySelector('.paper-abstract');
+            const toggle = function() {
+                abstract.classList.toggle('expanded');
+                button.innerHTML = abstract.classList.contains('expanded')
+                    ? '<i class="fas fa-chevron-up"></i> Show Less'
+                    : '<i class="fas fa-chevron-down"></i> Show More';
+            };
+            if (abstract.dataset.loaded) {
+                toggle();
+                return;
+            }
+            fetch(results.dataset.abstractUrl + '?' + new URLSearchParams({id: card.dataset.id}))
+                .then(response => response.json())
+                .then(data => {
+                    if (data.abstract !== undefined) {
+                        abstract.querySelector('p').textContent = data.abstract;
+                        abstract.dataset.loaded = 'true';
+                    }
+                    toggle();
+                });
+        });
+        
+        // Re-order each topic's papers by relevance score or date on the server
+        document.querySelectorAll('.sort-btn').forEach(button => {
+            button.addEventListener('click', function() {
+                document.querySelectorAll('.sort-btn').forEach(b => b.classList.remove('active'));
+                this.classList.add('active');
+                sortKey = this.dataset.sort;
+                results.querySelectorAll('.paper-list').forEach(list => loadPage(list, 1, true));
+            });
+        });
+    }
     
     // Form validation
     const searchForm = document.getElementById('searchForm');
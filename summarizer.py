@@ -0,0 +1,298 @@
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict, Any, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_SUMMARY_CACHE = 'summaries.db'
+
+# OpenAI-compatible endpoint; point LLM_BASE_URL at a local server to test
+DEFAULT_LLM_URL = os.environ.get('LLM_BASE_URL', 'https://api.openai.com/v1')
+DEFAULT_LLM_MODEL = os.environ.get('LLM_MODEL', 'gpt-4o-mini')
+DEFAULT_LLM_CONCURRENCY = 4
+DEFAULT_LLM_RETRIES = 3
+DEFAULT_LLM_TIMEOUT = 120
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_PROMPT = (
+    "You summarize arXiv papers for a researcher's daily reading list. "
+    "For every paper below write a one or two sentence summary of its main "
+    "contribution. Answer only with JSON of the form "
+    '{"summaries": [{"id": "<paper id>", "summary": "<summary>"}]}.'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    id TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    model TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (id, prompt_hash)
+);
+"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:16]
+
+
+class SummaryCache:
+    """SQLite cache of paper summaries keyed by paper id and prompt hash."""
+
+    def __init__(self, path: str = DEFAULT_SUMMARY_CACHE):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, ids: List[str], prompt: str = DEFAULT_PROMPT) -> Dict[str, str]:
+        """Return the cached summaries of the given paper ids."""
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        with closing(self._connect()) as conn:
+            # Stay under SQLite's bound parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT id, summary FROM summaries WHERE prompt_hash = ? "
+                    f"AND id IN ({', '.join('?' * len(chunk))})",
+                    [prompt_hash(prompt)] + chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def set_many(self, summaries: Dict[str, str], prompt: str = DEFAULT_PROMPT, model: Optional[str] = None):
+        """Cache summaries by paper id."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (id, prompt_hash, summary, model, created) VALUES (?, ?, ?, ?, ?)",
+                [(paper_id, prompt_hash(prompt), summary, model, now) for paper_id, summary in summaries.items()]
+            )
+
+
+def paper_prompt(papers: List[Dict[str, Any]]) -> str:
+    """Format a batch of papers as the user message."""
+    return "\n\n".join(
+        f"ID: {p['id']}\nTitle: {p['title']}\nAbstract: {p.get('abstract', '')}" for p in papers
+    )
+
+
+def build_batch_request(custom_id: str, papers: List[Dict[str, Any]], prompt: str = DEFAULT_PROMPT,
+                        model: str = DEFAULT_LLM_MODEL) -> Dict[str, Any]:
+    """Build one request line of an OpenAI-style batch (JSONL) file."""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": paper_prompt(papers)},
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0,
+        },
+    }
+
+
+def write_batch_requests(requests_list: List[Dict[str, Any]], output_file: str):
+    """Write batch requests as JSONL, e.g. for an offline batch API upload."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for line in requests_list:
+            f.write(json.dumps(line, ensure_ascii=False))
+            f.write("\n")
+
+
+def parse_summaries(content: str) -> Dict[str, str]:
+    """
+    Parse a model answer into summaries by paper id.
+
+    Raises:
+        ValueError: If the answer holds no JSON summaries.
+    """
+    match = re.search(r"\{.*\}", content, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON object in the model answer")
+    data = json.loads(match.group(0))
+    return {str(item["id"]): str(item["summary"]).strip()
+            for item in data.get("summaries", []) if item.get("id") and item.get("summary")}
+
+
+class OpenAIChatBackend:
+    """Send batch requests to an OpenAI-compatible chat completions endpoint."""
+
+    def __init__(self, base_url: str = DEFAULT_LLM_URL, api_key: Optional[str] = None,
+                 timeout: float = DEFAULT_LLM_TIMEOUT, session: Optional["requests.Session"] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or os.environ.get('LLM_API_KEY') or os.environ.get('OPENAI_API_KEY')
+        self.timeout = timeout
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+
+    def __call__(self, batch_request: Dict[str, Any]) -> str:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        response = self.session.post(f"{self.base_url}/chat/completions", json=batch_request["body"],
+                                     headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+class MockBackend:
+    """Offline backend answering with each paper's first abstract sentence."""
+
+    def __call__(self, batch_request: Dict[str, Any]) -> str:
+        text = batch_request["body"]["messages"][-1]["content"]
+        summaries = []
+        for block in text.split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+            sentence = re.split(r"(?<=\.)\s", fields.get("Abstract", ""), maxsplit=1)[0]
+            summaries.append({"id": fields.get("ID"), "summary": sentence or fields.get("Title", "")})
+        return json.dumps({"summaries": summaries})
+
+
+class Summarizer:
+    """
+    Summarize paper batches with an LLM, caching summaries per paper.
+
+    Papers with a cached summary for the prompt are never sent again; the
+    remaining papers of each batch become one request. Requests run with
+    bounded concurrency and are retried with exponential backoff on
+    throttling, server errors, unparseable answers and answers missing
+    some of the batch's papers.
+    """
+
+    def __init__(self, backend: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 cache: Optional[SummaryCache] = None, prompt: str = DEFAULT_PROMPT,
+                 model: str = DEFAULT_LLM_MODEL, max_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+                 retries: int = DEFAULT_LLM_RETRIES, backoff_seconds: float = 2.0):
+        self.backend = backend or OpenAIChatBackend()
+        self.cache = cache
+        self.prompt = prompt
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+
+    def plan_requests(self, batches: List[List[Dict[str, Any]]],
+                      cached: Dict[str, str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Group the papers without a cached summary into (custom_id, papers) requests."""
+        planned = []
+        queued = set(cached)
+        for i, batch in enumerate(batches):
+            # A paper listed under several topics is only sent once
+            papers = [p for p in batch if p["id"] not in queued]
+            queued.update(p["id"] for p in papers)
+            if papers:
+                planned.append((f"batch-{i}", papers))
+        return planned
+
+    def build_requests(self, batches: List[List[Dict[str, Any]]], cached: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Build the batch requests of the papers without a cached summary."""
+        return [build_batch_request(custom_id, papers, self.prompt, self.model)
+                for custom_id, papers in self.plan_requests(batches, cached)]
+
+    def _dispatch(self, custom_id: str, papers: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Summarize one batch of papers.
+
+        Answers are kept only for the papers asked about. Papers the model
+        left out are sent again, like failed requests, until the retries
+        run out; they are then logged and left without a summary.
+        """
+        import requests
+        summaries = {}
+        pending = papers
+        for attempt in range(self.retries + 1):
+            try:
+                fresh = parse_summaries(self.backend(build_batch_request(custom_id, pending, self.prompt, self.model)))
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if (attempt == self.retries and not summaries) or (status is not None and status not in RETRY_STATUSES):
+                    raise
+                error = str(e)
+            else:
+                wanted = {p["id"] for p in pending}
+                unexpected = set(fresh) - wanted
+                if unexpected:
+                    logging.warning(f"LLM request {custom_id} answered for {len(unexpected)} papers "
+                                    f"it was not asked about, ignoring them")
+                summaries.update((paper_id, summary) for paper_id, summary in fresh.items() if paper_id in wanted)
+                pending = [p for p in pending if p["id"] not in summaries]
+                if not pending:
+                    return summaries
+                error = f"no summary for {len(pending)} of {len(wanted)} papers"
+            if attempt == self.retries:
+                break
+            delay = self.backoff_seconds * 2 ** attempt * (0.5 + random.random())
+            logging.warning(f"LLM request {custom_id} failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+        logging.error(f"LLM request {custom_id} left {len(pending)} papers unsummarized: {error}")
+        return summaries
+
+    def summarize(self, batches: List[List[Dict[str, Any]]],
+                  requests_file: Optional[str] = None) -> Dict[str, str]:
+        """
+        Summarize every paper of the batches.
+
+        Args:
+            batches: Batches of paper dictionaries, e.g. one topic's batches
+                from `fetch_papers_by_config`.
+            requests_file: Optionally also write the requests sent as JSONL.
+
+        Returns:
+            A dictionary mapping paper ids to summaries, cached ones
+            included. Papers of failed requests, and papers the model
+            still left out after the retries, are left out.
+        """
+        ids = [p["id"] for batch in batches for p in batch]
+        summaries = self.cache.get_many(ids, self.prompt) if self.cache else {}
+        planned = self.plan_requests(batches, summaries)
+        if requests_file:
+            write_batch_requests([build_batch_request(custom_id, papers, self.prompt, self.model)
+                                  for custom_id, papers in planned], requests_file)
+        logging.info(f"{len(summaries)} summaries cached, sending {len(planned)} LLM requests")
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {executor.submit(self._dispatch, custom_id, papers): custom_id for custom_id, papers in planned}
+            for future in as_completed(futures):
+                custom_id = futures[future]
+                try:
+                    fresh = future.result()
+                except Exception as e:
+                    logging.error(f"Error summarizing {custom_id}: {e}")
+                    continue
+                if self.cache:
+                    self.cache.set_many(fresh, self.prompt, self.model)
+                summaries.update(fresh)
+        return summaries
+
+    def summarize_results(self, results: Dict[str, List[List[Dict[str, Any]]]],
+                          requests_file: Optional[str] = None) -> Dict[str, List[List[Dict[str, Any]]]]:
+        """
+        Summarize `fetch_papers_by_config` results, adding a "summary" to
+        every summarized paper in place.
+        """
+        batches = [batch for topic_batches in results.values() for batch in topic_batches]
+        summaries = self.summarize(batches, requests_file=requests_file)
+        for batch in batches:
+            for paper in batch:
+                if paper["id"] in summaries:
+                    paper["summary"] = summaries[paper["id"]]
+        return results
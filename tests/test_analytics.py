@@ -0,0 +1,135 @@
+import json
+from datetime import date, timedelta
+from itertools import count
+
+from analytics import Analytics, CountMinSketch, SpaceSaving
+
+
+def row_collision(sketch, row):
+    """Two equal-length names sharing a column in `row`."""
+    columns = {}
+    for i in count():
+        name = f"author {i:06d}"
+        cells = dict(sketch._cells(name))
+        other = columns.setdefault(cells[row], name)
+        if other != name:
+            return other, name
+
+
+def test_count_min_sketch_rows_are_independent():
+    sketch = CountMinSketch()
+    for row in range(sketch.depth):
+        first, second = row_collision(sketch, row)
+        sketch = CountMinSketch()
+        sketch.add(first, 100)
+
+        assert sketch.estimate(first) == 100
+        assert sketch.estimate(second) == 0
+
+
+def test_count_min_sketch_never_undercounts():
+    sketch = CountMinSketch(width=16, depth=3)
+    counts = {f"author {i}": i % 5 + 1 for i in range(100)}
+    for name, n in counts.items():
+        sketch.add(name, n)
+
+    assert all(sketch.estimate(name) >= n for name, n in counts.items())
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounded_error():
+    summary = SpaceSaving(k=3)
+    for item in "aaaaabbbbcdde":
+        summary.add(item)
+
+    assert summary.top(2) == [("a", 5), ("b", 4)]
+    # "d" took over the count of "c", then "e" the count of "d"
+    assert summary.counts["e"] == [4, 3]
+    for item, (estimate, error) in summary.counts.items():
+        assert estimate - error <= "aaaaabbbbcdde".count(item) <= estimate
+
+
+def test_space_saving_merge_adds_counts_and_keeps_k():
+    first, second = SpaceSaving(k=3), SpaceSaving(k=3)
+    for item in "aaabbc":
+        first.add(item)
+    for item in "bbbdd":
+        second.add(item)
+
+    merged = SpaceSaving.merge([first, second], k=2)
+
+    assert merged.top(5) == [("b", 5), ("a", 3)]
+    assert merged.k == 2
+
+
+def test_sketches_of_older_hash_are_discarded(tmp_path):
+    path = tmp_path / "analytics.json"
+    path.write_text(json.dumps({"days": {}, "sketches": {"LLM": [[7] * 2048] * 4}, "seen": {}}))
+
+    analytics = Analytics(str(path))
+    assert analytics.author_count("LLM", "Ada") == 0
+
+    day = (date.today() - timedelta(days=1)).isoformat()
+    analytics.ingest("LLM", [{"id": "1", "update_date": day, "authors": "Ada", "category": "cs.CL"}])
+    analytics.save()
+
+    assert Analytics(str(path)).author_count("LLM", "Ada") == 1
+
+
+def paper(paper_id, day, authors="Ada"):
+    return {"id": paper_id, "update_date": day.isoformat(), "authors": authors, "category": "cs.CL"}
+
+
+def test_untracked_topics_are_ignored(tmp_path):
+    analytics = Analytics(str(tmp_path / "analytics.json"))
+    analytics.limit_topics(["LLM"])
+    yesterday = date.today() - timedelta(days=1)
+
+    assert analytics.ingest("LLM", [paper("1", yesterday)]) == 1
+    assert analytics.ingest("some free text", [paper("2", yesterday)]) == 0
+    assert analytics.topics() == ["LLM"]
+    assert list(analytics.sketches) == ["LLM"]
+
+
+def test_save_drops_topics_without_days_in_retention(tmp_path):
+    path = tmp_path / "analytics.json"
+    analytics = Analytics(str(path), retention_days=30)
+    recent = date.today() - timedelta(days=1)
+    analytics.ingest("LLM", [paper("1", recent)])
+    analytics.ingest("GNN", [paper("2", recent)])
+    # GNN's only day falls out of the window
+    analytics.days["GNN"] = {(date.today() - timedelta(days=40)).isoformat(): analytics.days["GNN"][recent.isoformat()]}
+    analytics.save()
+
+    data = json.loads(path.read_text())
+    assert list(data["days"]) == ["LLM"]
+    assert list(data["sketches"]) == ["LLM"]
+
+
+def test_save_later_writes_once_per_interval(tmp_path, monkeypatch):
+    import threading
+
+    path = tmp_path / "analytics.json"
+    analytics = Analytics(str(path), save_interval=60)
+    timers = []
+    monkeypatch.setattr(threading.Timer, "start", lambda self: timers.append(self))
+    yesterday = date.today() - timedelta(days=1)
+
+    for i in range(3):
+        list(analytics.track([("LLM", [paper(str(i), yesterday)])]))
+
+    assert not path.exists()
+    assert len(timers) == 1
+    timers[0].function()
+    assert len(json.loads(path.read_text())["seen"]) == 3
+
+    list(analytics.track([("LLM", [paper("3", yesterday)])]))
+    assert len(timers) == 2
+
+
+def test_save_later_without_interval_saves_right_away(tmp_path):
+    path = tmp_path / "analytics.json"
+    analytics = Analytics(str(path))
+
+    list(analytics.track([("LLM", [paper("1", date.today())])]))
+
+    assert path.exists()
@@ -0,0 +1,78 @@
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # app.py keeps its caches and state files in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ARXIV_METRICS", "0")
+    app = importlib.import_module("app")
+    return app.app.test_client()
+
+
+def search_form(**fields):
+    return {"topic_1": "LLM", "filters_1": "LLM", "max_results": "5", **fields}
+
+
+def test_search_with_bad_date_renders_index_with_error(client):
+    response = client.post("/search", data=search_form(date_from="bad-date"))
+
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "alert-danger" in html
+    assert "bad-date" in html
+    assert "Search Results" not in html
+
+
+def test_search_error_while_streaming_renders_error_block(client, monkeypatch):
+    import app
+
+    def failing_fetch(**kwargs):
+        yield "LLM", [{"id": "2405.00001", "version": 1, "title": "A paper", "url": "https://arxiv.org/abs/2405.00001",
+                       "update_date": "2024-05-10", "first_author": "A", "authors": "A", "category": "cs.CL",
+                       "abstract": "About LLMs.", "comments": ""}]
+        raise ConnectionError("arXiv went away")
+
+    monkeypatch.setattr(app, "iter_fetch_papers", failing_fetch)
+    response = client.post("/search", data=search_form())
+
+    html = response.get_data(as_text=True)
+    assert "A paper" in html
+    assert "The search stopped early: arXiv went away" in html
+    assert html.rstrip().endswith("</html>")
+
+
+def test_save_config_is_read_back_right_away(client):
+    import app
+
+    app.load_default_config()
+    response = client.post("/save_config", data={"topic_1": "Graphs", "filters_1": "GNN, graph"})
+
+    assert response.get_json()["status"] == "success"
+    assert app.load_default_config()["keywords"] == {"Graphs": {"filters": ["GNN", "graph"]}}
+
+
+def test_semantic_search_writes_embeddings_once_per_request(client, monkeypatch):
+    pytest.importorskip("numpy")
+    import app
+    from semantic import EmbeddingCache
+
+    def fetch(**kwargs):
+        for i, topic in enumerate(["LLM", "GNN"]):
+            yield topic, [{"id": f"2405.0000{i}", "version": 1, "title": f"{topic} paper",
+                           "url": f"https://arxiv.org/abs/2405.0000{i}", "update_date": "2024-05-10",
+                           "first_author": "A", "authors": "A", "category": "cs.CL",
+                           "abstract": "", "comments": ""}]
+
+    saves = []
+    original = EmbeddingCache._save
+    monkeypatch.setattr(EmbeddingCache, "_save", lambda self: saves.append(1) or original(self))
+    monkeypatch.setattr(app, "iter_fetch_papers", fetch)
+    form = search_form(topic_2="GNN", filters_2="GNN", semantic="on")
+
+    html = client.post("/search", data=form).get_data(as_text=True)
+
+    assert "LLM paper" in html and "GNN paper" in html
+    assert len(saves) == 1
@@ -0,0 +1,285 @@
+import gc
+import weakref
+
+import pytest
+
+from arxiv_fetcher import ArxivPaperFetcher, QueryCache, iter_topic_papers
+
+
+class Paper(dict):
+    """A paper dictionary that can be weakly referenced."""
+
+
+class FakeFeedFetcher(ArxivPaperFetcher):
+    """Fetcher whose arXiv results are `count` generated papers."""
+
+    def __init__(self, count, **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+
+    def _iter_result_papers(self, topic, search_engine, submitted_from, date_from, date_to, categories, start=0):
+        for i in range(start, self.count):
+            yield i, Paper(id=f"2405.{self.count - i:05d}", title=f"{topic} {i}")
+
+
+def test_get_papers_populates_cache():
+    cache = QueryCache()
+    fetcher = FakeFeedFetcher(3, cache=cache)
+
+    assert len(fetcher.get_papers("LLM", 'all:"llm"')) == 3
+    assert len(fetcher.get_papers("LLM", 'all:"llm"')) == 3
+    assert cache.hits == 1
+
+
+def test_streaming_keeps_no_papers_and_skips_cache():
+    cache = QueryCache()
+    fetcher = FakeFeedFetcher(50, cache=cache)
+    refs = []
+
+    for paper in fetcher.iter_papers("LLM", 'all:"llm"', populate_cache=False):
+        refs.append(weakref.ref(paper))
+        del paper
+        gc.collect()
+        assert sum(ref() is not None for ref in refs) <= 1
+
+    assert len(refs) == 50
+    assert fetcher.get_papers("LLM", 'all:"llm"', timeout=None) and cache.hits == 0
+
+
+def test_iter_topic_papers_does_not_fill_cache():
+    cache = QueryCache()
+    fetcher = FakeFeedFetcher(5, cache=cache)
+
+    papers = list(iter_topic_papers(fetcher, {"LLM": 'all:"llm"', "GNN": 'all:"gnn"'}))
+
+    assert len(papers) == 10
+    assert fetcher.get_papers("LLM", 'all:"llm"') and cache.hits == 0
+
+
+def test_iter_topic_papers_restarts_at_offsets():
+    fetcher = FakeFeedFetcher(5)
+
+    papers = list(iter_topic_papers(fetcher, {"LLM": 'all:"llm"', "GNN": 'all:"gnn"'},
+                                    starts={"LLM": 3}, offsets=True))
+
+    assert [offset for topic, paper, offset in papers if topic == "LLM"] == [3, 4]
+    assert [offset for topic, paper, offset in papers if topic == "GNN"] == [0, 1, 2, 3, 4]
+
+
+def test_session_requests_get_default_timeout(monkeypatch):
+    from requests.adapters import HTTPAdapter
+    from arxiv_fetcher import (
+        HTTP_TIMEOUT, create_session, get_default_session, rate_limited_client_class, default_rate_limiter
+    )
+
+    timeouts = []
+
+    def send(self, request, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    session = create_session()
+    for kwargs in ({}, {"timeout": 5}):
+        try:
+            session.get("http://127.0.0.1:9/api/query", **kwargs)
+        except ConnectionError:
+            pass
+
+    assert timeouts == [HTTP_TIMEOUT, 5]
+    # The arxiv library client never falls back to its own timeout-less session
+    assert rate_limited_client_class()(default_rate_limiter)._session is get_default_session()
+
+
+def test_compile_filter_matches_terms_with_symbols():
+    from arxiv_fetcher import compile_filter
+
+    for term, text, expected in [
+        ("C++", "Fuzzing C++ compilers", True),
+        ("C++", "Generating C code", False),
+        ("C#", "Static analysis for C# programs", True),
+        ("C#", "C programs", False),
+        (".NET", "Porting .NET applications", True),
+        (".NET", "ResNET backbones", False),
+        ("LLM", "LLMs are everywhere", False),
+        ("LLM", "An LLM-based agent", True),
+        ("Large Language Model", "large-language model agents", True),
+    ]:
+        assert bool(compile_filter(term).search(text)) is expected, (term, text)
+
+
+def test_config_cache_is_invalidated_after_same_size_rewrite(tmp_path):
+    import os
+    from arxiv_fetcher import read_config_file, invalidate_config_cache
+
+    path = tmp_path / "config.yaml"
+    path.write_text("keywords: {A: {filters: [x]}}\n")
+    stat = os.stat(path)
+    assert list(read_config_file(str(path))["keywords"]) == ["A"]
+
+    # Same size and mtime: the signature alone cannot see the change
+    path.write_text("keywords: {B: {filters: [x]}}\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert list(read_config_file(str(path))["keywords"]) == ["A"]
+
+    invalidate_config_cache(str(path))
+    assert list(read_config_file(str(path))["keywords"]) == ["B"]
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+EMPTY_FEED = b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"></feed>'
+
+
+def test_client_leaves_http_retries_to_the_session():
+    import arxiv
+    from arxiv_fetcher import RateLimiter, rate_limited_client_class
+
+    session = FakeSession(FakeResponse(503))
+    client = rate_limited_client_class()(RateLimiter(0), session=session)
+
+    with pytest.raises(arxiv.HTTPError):
+        client._parse_feed("http://127.0.0.1:9/api/query?start=0")
+    assert session.calls == 1
+
+
+def test_client_retries_empty_pages():
+    import arxiv
+    from arxiv_fetcher import FEED_EMPTY_PAGE_RETRIES, RateLimiter, rate_limited_client_class
+
+    session = FakeSession(FakeResponse(200, EMPTY_FEED))
+    client = rate_limited_client_class()(RateLimiter(0), session=session)
+
+    with pytest.raises(arxiv.UnexpectedEmptyPageError):
+        client._parse_feed("http://127.0.0.1:9/api/query?start=100", first_page=False)
+    assert session.calls == FEED_EMPTY_PAGE_RETRIES + 1
+
+
+def test_http_stats_count_declared_wire_bytes_without_reading_the_body():
+    from datetime import timedelta
+    from arxiv_fetcher import HttpStats
+
+    class Response:
+        def __init__(self, headers):
+            self.headers = headers
+            self.elapsed = timedelta(seconds=0.5)
+
+        @property
+        def content(self):
+            raise AssertionError("the body must not be read by the hook")
+
+    stats = HttpStats()
+    stats.record(Response({"Content-Length": "1200", "Content-Encoding": "gzip"}))
+    stats.record(Response({"Transfer-Encoding": "chunked"}))
+
+    assert stats.to_dict() == {"requests": 2, "bytes": 1200, "unsized_responses": 1, "avg_latency": 0.5}
+
+
+def test_query_url_pages_newest_first():
+    import arxiv
+    from urllib.parse import parse_qs, urlsplit
+
+    fetcher = ArxivPaperFetcher(api_url="http://127.0.0.1:1/api/query")
+    url = fetcher.query_url(arxiv.Search(query='all:"llm" AND cat:cs.CL', max_results=100), 200, 50)
+
+    assert url.startswith("http://127.0.0.1:1/api/query?")
+    assert parse_qs(urlsplit(url).query) == {
+        "search_query": ['all:"llm" AND cat:cs.CL'], "start": ["200"], "max_results": ["50"],
+        "sortBy": ["submittedDate"], "sortOrder": ["descending"],
+    }
+
+
+def test_fast_parser_pages_through_stub_server():
+    import os
+    import sys
+    from arxiv_fetcher import RateLimiter, build_query
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+    from stub_arxiv import StubArxivServer, build_corpus, load_fixture_entries
+
+    with StubArxivServer(build_corpus(load_fixture_entries(), 30)) as stub:
+        fetcher = ArxivPaperFetcher(rate_limiter=RateLimiter(0), api_url=stub.url,
+                                    page_size=10, fast_parser=True)
+        papers = fetcher.get_papers("LLM", 'all:"llm"', max_results=25)
+
+    assert [paper["id"] for paper in papers] == [f"2501.{i:05d}" for i in range(25)]
+    assert stub.requests == {build_query('all:"llm"'): 3}
+
+
+def test_build_query_adds_date_and_category_clauses():
+    from datetime import date
+    from arxiv_fetcher import build_query
+
+    assert build_query('"large language model" OR llm') == '("large language model" OR llm)'
+    assert build_query('llm', date(2024, 5, 1), date(2024, 5, 7), ["cs.CL", "cs.AI"]) == (
+        '(llm) AND submittedDate:[202405010000 TO 202405072359] AND (cat:cs.CL OR cat:cs.AI)'
+    )
+    assert build_query('llm', date_from=date(2024, 5, 1)) == (
+        '(llm) AND submittedDate:[202405010000 TO 999912312359]'
+    )
+    assert build_query('', date_to=date(2024, 5, 7)) == 'submittedDate:[199101010000 TO 202405072359]'
+
+
+def test_chunk_filters_keeps_each_query_within_limit():
+    from arxiv_fetcher import chunk_filters, parse_filter_list
+
+    filters = [f"term number {i}" for i in range(40)]
+    chunks = chunk_filters(filters, max_length=100)
+
+    assert len(chunks) > 1
+    assert [f for chunk in chunks for f in chunk] == filters
+    assert all(len(parse_filter_list(chunk)) <= 100 for chunk in chunks)
+    # A single term longer than the limit still gets a chunk of its own
+    assert chunk_filters(["x" * 200, "llm"], max_length=100) == [["x" * 200], ["llm"]]
+    assert chunk_filters([]) == []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_query_cache_evicts_least_recently_used():
+    cache = QueryCache(max_entries=2)
+    cache.set("a", [{"id": "a"}])
+    cache.set("b", [{"id": "b"}])
+    assert cache.get("a") == [{"id": "a"}]
+
+    cache.set("c", [{"id": "c"}])
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats()["entries"] == 2
+
+
+def test_query_cache_expires_entries_after_ttl(monkeypatch, tmp_path):
+    import arxiv_fetcher
+
+    clock = FakeClock()
+    monkeypatch.setattr(arxiv_fetcher.time, "time", clock.time)
+    cache = QueryCache(ttl=60, path=str(tmp_path))
+    cache.set("a", [{"id": "a"}])
+
+    clock.now += 60
+    assert QueryCache(ttl=60, path=str(tmp_path)).get("a") == [{"id": "a"}]
+    clock.now += 1
+    assert cache.get("a") is None
+    assert not list(tmp_path.glob("*.json"))
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 1
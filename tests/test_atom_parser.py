@@ -0,0 +1,66 @@
+from atom_parser import parse_feed
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom"
+      xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">
+  <opensearch:totalResults>120</opensearch:totalResults>
+  {entries}
+</feed>
+"""
+
+ENTRY = """<entry>
+    <id>http://arxiv.org/abs/{id}</id>
+    <published>{published}T10:00:00Z</published>
+    <updated>{updated}T10:00:00Z</updated>
+    <title>Scaling
+      {id}</title>
+    <summary>  First line
+second line.
+</summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+    <arxiv:comment>12 pages</arxiv:comment>
+    <arxiv:primary_category term="{category}"/>
+  </entry>"""
+
+
+def feed(*entries):
+    return FEED.format(entries="".join(ENTRY.format(**entry) for entry in entries)).encode()
+
+
+def entry(paper_id, published="2024-05-03", updated=None, category="cs.CL"):
+    return {"id": paper_id, "published": published, "updated": updated or published, "category": category}
+
+
+def test_parse_feed_reads_papers():
+    page = parse_feed(feed(entry("2405.00002v3"), entry("2405.00001")), arxiv_url="https://arxiv.org/")
+
+    assert (page.entries, page.total_results, page.stopped) == (2, 120, False)
+    first, second = page.papers
+    assert (first.id, first.version, second.id, second.version) == ("2405.00002", 3, "2405.00001", 1)
+    assert first.title == "Scaling 2405.00002v3"
+    assert first.url == "https://arxiv.org/abs/2405.00002"
+    assert first.authors == ("Ada Lovelace", "Alan Turing")
+    assert first.abstract == "First line second line."
+    assert (first.update_date, first.category, first.comments) == ("2024-05-03", "cs.CL", "12 pages")
+
+
+def test_parse_feed_filters_dates_and_categories():
+    page = parse_feed(feed(entry("2405.00004", updated="2024-05-09"),
+                           entry("2405.00003", category="cs.CV"),
+                           entry("2405.00002"),
+                           entry("2405.00001", updated="2024-04-30")),
+                      date_from="2024-05-01", date_to="2024-05-07", categories=["cs.CL"])
+
+    assert [paper.id for paper in page.papers] == ["2405.00002"]
+    assert page.entries == 4
+
+
+def test_parse_feed_stops_at_submitted_from():
+    page = parse_feed(feed(entry("2405.00003", published="2024-05-03"),
+                           entry("2405.00002", published="2024-04-28"),
+                           entry("2405.00001", published="2024-04-27")),
+                      submitted_from="2024-05-01")
+
+    assert [paper.id for paper in page.papers] == ["2405.00003"]
+    assert (page.entries, page.stopped, page.last_published) == (2, True, "2024-04-28")
@@ -0,0 +1,33 @@
+from batching import PAPER_OVERHEAD_TOKENS, batch_utilization, pack_batches, paper_tokens
+
+
+def paper(paper_id, tokens):
+    """A paper taking `tokens` tokens when characters are counted as tokens."""
+    return {"id": paper_id, "title": "", "abstract": "x" * (tokens - PAPER_OVERHEAD_TOKENS - 2)}
+
+
+def ids(batches):
+    return [[p["id"] for p in batch] for batch in batches]
+
+
+def test_paper_tokens_counts_text_and_overhead():
+    assert paper_tokens(paper("a", 50), count_tokens=len) == 50
+    assert paper_tokens({"title": "abcd", "abstract": "efgh", "comments": None}) == 3 + PAPER_OVERHEAD_TOKENS
+
+
+def test_pack_batches_first_fit_decreasing():
+    papers = [paper("a", 30), paper("b", 70), paper("c", 50), paper("d", 50), paper("e", 30)]
+
+    batches = pack_batches(papers, max_tokens=100, count_tokens=len)
+
+    assert ids(batches) == [["b", "a"], ["c", "d"], ["e"]]
+    assert [b["tokens"] for b in batch_utilization(batches, 100, count_tokens=len)] == [100, 100, 30]
+
+
+def test_pack_batches_caps_papers_and_isolates_oversized():
+    papers = [paper("big", 150), paper("a", 25), paper("b", 25), paper("c", 25)]
+
+    batches = pack_batches(papers, max_tokens=100, count_tokens=len, max_papers=2)
+
+    assert ids(batches) == [["big"], ["a", "b"], ["c"]]
+    assert pack_batches([], max_tokens=100) == []
@@ -0,0 +1,41 @@
+from dedup import NEW, REVISED, SEEN, Deduplicator, similarity, title_shingles, title_signature
+
+
+def paper(paper_id, title, version=1):
+    return {"id": paper_id, "title": title, "version": version}
+
+
+def test_title_signature_estimates_jaccard_similarity():
+    title = "Scaling Laws for Mixture of Experts Language Models"
+
+    assert title_shingles("Scaling laws, revisited!") == ["scaling laws", "laws revisited"]
+    assert title_signature(title) == title_signature(title.upper() + ".")
+    assert similarity(title_signature(title), title_signature(title)) == 1.0
+    assert similarity(title_signature(title), title_signature("Graph Neural Networks for Molecules")) < 0.2
+
+
+def test_status_by_id_version_and_near_duplicate_title():
+    dedup = Deduplicator(path=None)
+    dedup.add(paper("2405.00001", "Scaling Laws for Mixture of Experts Language Models", version=2))
+
+    assert dedup.status(paper("2405.00001", "Anything", version=2)) == (SEEN, None)
+    assert dedup.status(paper("2405.00001", "Anything", version=3)) == (REVISED, None)
+    assert dedup.status(paper("2405.09999", "Scaling laws for mixture of experts language models")) == (
+        SEEN, "2405.00001"
+    )
+    assert dedup.status(paper("2405.09999", "Graph Neural Networks for Molecules")) == (NEW, None)
+
+
+def test_mark_collapses_topics_and_remembers_on_save(tmp_path):
+    path = str(tmp_path / "seen.json")
+    dedup = Deduplicator(path)
+    results = [("LLM", [paper("2405.00001", "Agents That Plan")]),
+               ("Agents", [paper("2405.00001", "Agents That Plan"), paper("2405.00002", "Tool Use at Scale")])]
+
+    marked = list(dedup.mark(results))
+
+    assert [(topic, [(p["id"], p["status"]) for p in papers]) for topic, papers in marked] == [
+        ("LLM", [("2405.00001", NEW)]), ("Agents", [("2405.00002", NEW)])
+    ]
+    dedup.save()
+    assert list(Deduplicator(path).mark(results, new_only=True)) == [("LLM", []), ("Agents", [])]
@@ -0,0 +1,83 @@
+import json
+import os
+
+from exporters import JsonlStreamWriter, checkpoint_file
+
+
+def paper(number):
+    return {"id": f"2405.{number:05d}", "title": f"Paper {number}"}
+
+
+def read_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+def test_checkpoint_records_last_id_and_offset(tmp_path):
+    output = str(tmp_path / "papers.jsonl")
+    with JsonlStreamWriter(output, checkpoint_every=2) as writer:
+        for offset, number in enumerate([9, 8, 7]):
+            writer.write("LLM", paper(number), offset)
+
+    with open(checkpoint_file(output), encoding='utf-8') as f:
+        state = json.load(f)
+    assert state["size"] == os.path.getsize(output)
+    assert state["topics"] == {"LLM": {"count": 3, "last_id": "2405.00007", "offset": 2}}
+
+
+def test_resume_truncates_to_checkpoint_and_restarts_fetch(tmp_path):
+    output = str(tmp_path / "papers.jsonl")
+    writer = JsonlStreamWriter(output, checkpoint_every=2)
+    for offset, number in enumerate([9, 8, 7]):
+        writer.write("LLM", paper(number), offset)
+    # Crash: the third paper was never fsynced and a partial line follows
+    writer._file.write('{"topic":"LLM","id":')
+    writer._file.close()
+
+    with JsonlStreamWriter(output, checkpoint_every=2, resume=True) as resumed:
+        assert resumed.resume_points() == {"LLM": 1}
+        # The restarted fetch repeats the last written paper first
+        written = [resumed.write("LLM", paper(number), offset)
+                   for offset, number in [(1, 8), (2, 7), (3, 6)]]
+
+    assert written == [False, True, True]
+    assert read_ids(output) == ["2405.00009", "2405.00008", "2405.00007", "2405.00006"]
+
+
+def test_resume_skips_newer_papers_replayed_from_page_start(tmp_path):
+    output = str(tmp_path / "papers.jsonl")
+    with JsonlStreamWriter(output) as writer:
+        writer.write("LLM", paper(9), 0)
+        writer.write("LLM", paper(8), 0)
+
+    with JsonlStreamWriter(output, resume=True) as resumed:
+        # A paper submitted since shifted results; the old last id is gone
+        written = [resumed.write("LLM", paper(number), 0) for number in [10, 9, 7]]
+        assert resumed.write("GNN", paper(12), 0)
+
+    assert written == [False, False, True]
+    assert read_ids(output) == ["2405.00009", "2405.00008", "2405.00007", "2405.00012"]
+
+
+def test_resume_without_checkpoint_scans_output(tmp_path):
+    output = str(tmp_path / "papers.jsonl")
+    with JsonlStreamWriter(output) as writer:
+        writer.write("LLM", paper(9))
+    os.remove(checkpoint_file(output))
+
+    with JsonlStreamWriter(output, resume=True) as resumed:
+        assert resumed.counts == {"LLM": 1}
+        assert resumed.resume_points() == {}
+        assert not resumed.write("LLM", paper(9))
+        assert resumed.write("LLM", paper(8))
+
+
+def test_fresh_output_discards_stale_checkpoint(tmp_path):
+    output = str(tmp_path / "papers.jsonl")
+    with JsonlStreamWriter(output) as writer:
+        writer.write("LLM", paper(9), 4)
+
+    JsonlStreamWriter(output).close()
+
+    with JsonlStreamWriter(output, resume=True) as resumed:
+        assert resumed.counts == {} and resumed.resume_points() == {}
@@ -0,0 +1,28 @@
+from metrics import Metrics
+
+
+def test_limited_label_maps_unknown_values_to_other():
+    metrics = Metrics(enabled=True)
+    metrics.limit_label("topic", ["LLM", "GNN"])
+
+    for topic in ["LLM", "GNN", "free text 1", "free text 2", "LLM"]:
+        metrics.inc("papers_kept", 2, topic=topic)
+        metrics.observe("topic", 0.1, topic=topic)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {
+        'papers_kept{topic="GNN"}': 2,
+        'papers_kept{topic="LLM"}': 4,
+        'papers_kept{topic="other"}': 4,
+    }
+    assert snapshot["spans"]['topic{topic="other"}']["count"] == 2
+    assert len(snapshot["spans"]) == 3
+
+
+def test_unlimited_labels_are_kept():
+    metrics = Metrics(enabled=True)
+    metrics.limit_label("topic", ["LLM"])
+
+    metrics.inc("searches", mode="live")
+
+    assert metrics.snapshot()["counters"] == {'searches{mode="live"}': 1}
@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+from paper_store import PaperStore, sync_store
+
+
+class FakeFetcher:
+    """Fetcher returning canned papers per query, raising for the queries in `broken`."""
+
+    def __init__(self, papers, broken=()):
+        self.papers = papers
+        self.broken = set(broken)
+
+    def get_papers(self, topic, query, **kwargs):
+        if query in self.broken:
+            raise ConnectionError("connection reset by peer")
+        return self.papers.get(query, [])
+
+
+def make_paper(paper_id, day):
+    return {"id": paper_id, "version": 1, "title": paper_id, "url": f"https://arxiv.org/abs/{paper_id}",
+            "update_date": day.isoformat(), "first_author": "A", "authors": "A", "category": "cs.CL",
+            "abstract": "", "comments": ""}
+
+
+def test_sync_store_skips_sync_state_of_failed_topics(tmp_path):
+    store = PaperStore(str(tmp_path / "papers.db"))
+    today = date(2024, 5, 10)
+    queries = {"LLM": 'all:"llm"', "GNN": 'all:"gnn"'}
+    fetcher = FakeFetcher({'all:"llm"': [make_paper("2405.00001", today)]}, broken={'all:"gnn"'})
+
+    counts = sync_store(store, queries, fetcher=fetcher, date_to=today, days=7)
+
+    assert counts == {"LLM": 1}
+    assert store.covers('all:"llm"', today - timedelta(days=7), today)
+    assert store.get_sync_state('all:"gnn"') is None
+    assert not store.covers('all:"gnn"', today - timedelta(days=7), today)
+
+
+def test_sync_store_retries_failed_topic_from_previous_state(tmp_path):
+    store = PaperStore(str(tmp_path / "papers.db"))
+    first = date(2024, 5, 10)
+    queries = {"GNN": 'all:"gnn"'}
+    sync_store(store, queries, fetcher=FakeFetcher({}), date_to=first, days=7)
+
+    later = first + timedelta(days=3)
+    sync_store(store, queries, fetcher=FakeFetcher({}, broken={'all:"gnn"'}), date_to=later)
+
+    assert store.get_sync_state('all:"gnn"')["synced_to"] == first
+    assert not store.covers('all:"gnn"', first, later)
@@ -0,0 +1,26 @@
+import sqlite3
+
+import pytest
+
+from search_index import to_match_expression
+
+
+def test_to_match_expression_quotes_terms_and_keeps_operators():
+    assert to_match_expression('"large language model" OR GPT-4') == '"large language model" OR "GPT-4"'
+    assert to_match_expression('(llm AND agent) ANDNOT survey') == '( "llm" AND "agent" ) NOT "survey"'
+    assert to_match_expression('') == ''
+
+
+def test_to_match_expression_runs_in_fts5():
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute("CREATE VIRTUAL TABLE papers USING fts5(title)")
+    except sqlite3.OperationalError:
+        pytest.skip("SQLite built without FTS5")
+    db.executemany("INSERT INTO papers(title) VALUES (?)",
+                   [("Fine-tuning GPT-4 agents",), ("A survey of LLM agents",), ("Graph networks",)])
+
+    rows = db.execute("SELECT title FROM papers WHERE papers MATCH ? ORDER BY rowid",
+                      (to_match_expression('Fine-tuning OR (llm ANDNOT survey) OR graph'),)).fetchall()
+
+    assert rows == [("Fine-tuning GPT-4 agents",), ("Graph networks",)]
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from semantic import EmbeddingCache, SemanticScorer
+
+KEYWORDS = {"LLM": ["large language model", "LLM"], "GNN": ["graph neural network", "GNN"]}
+
+
+def make_paper(paper_id, title, abstract=""):
+    return {"id": paper_id, "version": 1, "title": title, "abstract": abstract}
+
+
+PAPERS = {
+    "LLM": [make_paper("1", "Graph neural networks for molecules"),
+            make_paper("2", "Scaling large language models")],
+    "GNN": [make_paper("1", "Graph neural networks for molecules"),
+            make_paper("3", "Message passing on graphs", "A graph neural network (GNN) study.")],
+}
+
+
+def test_rank_all_matches_per_topic_rank(tmp_path):
+    scorer = SemanticScorer(KEYWORDS, cache_dir=str(tmp_path))
+
+    ranked = scorer.rank_all(PAPERS)
+
+    assert [p["id"] for p in ranked["LLM"]] == ["2", "1"]
+    for topic, papers in PAPERS.items():
+        assert scorer.rank(topic, papers) == ranked[topic]
+
+
+def test_rank_all_writes_embedding_cache_once(tmp_path, monkeypatch):
+    saves = []
+    original = EmbeddingCache._save
+    monkeypatch.setattr(EmbeddingCache, "_save", lambda self: saves.append(1) or original(self))
+    scorer = SemanticScorer(KEYWORDS, cache_dir=str(tmp_path))
+
+    scorer.rank_all(PAPERS)
+
+    assert len(saves) == 1
+    assert len(scorer.cache) == 3
+
+
+def test_rank_without_save_writes_on_flush(tmp_path):
+    scorer = SemanticScorer(KEYWORDS, cache_dir=str(tmp_path))
+
+    for topic, papers in PAPERS.items():
+        scorer.rank(topic, papers, save=False)
+    assert not os.path.exists(scorer.cache.file)
+
+    scorer.cache.flush()
+    assert len(EmbeddingCache(scorer.vectorizer, str(tmp_path))) == 3
+
+
+def test_unknown_topic_scores_zero(tmp_path):
+    scorer = SemanticScorer(KEYWORDS, cache_dir=str(tmp_path))
+
+    assert [p["score"] for p in scorer.rank("Other", PAPERS["LLM"])] == [0.0, 0.0]
@@ -0,0 +1,57 @@
+import json
+
+from summarizer import MockBackend, Summarizer, SummaryCache
+
+
+def make_paper(paper_id):
+    return {"id": paper_id, "title": f"Paper {paper_id}", "abstract": f"Abstract of {paper_id}. More text."}
+
+
+class ScriptedBackend:
+    """Backend answering with the next scripted reply, recording the ids asked about."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.asked = []
+
+    def __call__(self, batch_request):
+        text = batch_request["body"]["messages"][-1]["content"]
+        self.asked.append([line[4:] for line in text.splitlines() if line.startswith("ID: ")])
+        reply = self.replies.pop(0)
+        return reply if isinstance(reply, str) else json.dumps({"summaries": reply})
+
+
+def test_mock_backend_summarizes_every_paper(tmp_path):
+    summarizer = Summarizer(backend=MockBackend(), cache=SummaryCache(str(tmp_path / "s.db")))
+
+    summaries = summarizer.summarize([[make_paper("1"), make_paper("2")]])
+
+    assert summaries == {"1": "Abstract of 1.", "2": "Abstract of 2."}
+
+
+def test_missing_papers_are_asked_again():
+    backend = ScriptedBackend([{"id": "1", "summary": "one"}], [{"id": "2", "summary": "two"}])
+    summarizer = Summarizer(backend=backend, backoff_seconds=0)
+
+    summaries = summarizer.summarize([[make_paper("1"), make_paper("2")]])
+
+    assert summaries == {"1": "one", "2": "two"}
+    assert backend.asked == [["1", "2"], ["2"]]
+
+
+def test_unparsable_answers_are_retried_then_logged(caplog):
+    backend = ScriptedBackend("Sorry, I cannot help.", '{"summaries": []}')
+    summarizer = Summarizer(backend=backend, retries=1, backoff_seconds=0)
+
+    assert summarizer.summarize([[make_paper("1")]]) == {}
+    assert len(backend.asked) == 2
+    assert "left 1 papers unsummarized" in caplog.text
+
+
+def test_summaries_of_other_papers_are_not_cached(tmp_path):
+    cache = SummaryCache(str(tmp_path / "s.db"))
+    backend = ScriptedBackend([{"id": "1", "summary": "one"}, {"id": "99", "summary": "made up"}])
+    summarizer = Summarizer(backend=backend, cache=cache, backoff_seconds=0)
+
+    assert summarizer.summarize([[make_paper("1")]]) == {"1": "one"}
+    assert cache.get_many(["1", "99"]) == {"1": "one"}